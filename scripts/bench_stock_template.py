@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""Benchmark suite for stock analysis deck generation.
+
+Times and memory-profiles every slide builder, the add_table and
+add_bullet_textbox helpers, and whole-deck build and save, on synthetic data
+at small, typical and extreme sizes (templates/sample_data.py).
+
+Usage:
+    python scripts/bench_stock_template.py                          # Run suite, compare to baseline
+    python scripts/bench_stock_template.py --json results.json      # Also save results
+    python scripts/bench_stock_template.py --save-baseline          # Replace the stored baseline
+    python scripts/bench_stock_template.py --compare                # Engine A/B reports instead
+
+Exits 1 when any case is slower (or uses more memory) than the stored
+baseline by more than --tolerance, so regressions show up in review.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import stock_analysis_slides as t
+from templates.deck_schema import validate
+from templates.sample_data import SIZES, generate_deck_data
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+NOISE_FLOOR_MS = 0.5
+
+
+# =============================================================================
+# CASES
+# =============================================================================
+
+def _new_slide():
+    deck = t.StockAnalysisDeck()
+    return deck.prs.slides.add_slide(deck.prs.slide_layouts[6])
+
+
+def iter_cases():
+    """Yield (name, setup, run) triples; only run(setup()) is measured."""
+    for size in SIZES:
+        d = generate_deck_data(size)
+        for builder, slide_args in t.DECK_SLIDES:
+            args = slide_args(d)
+            if args is None:
+                continue
+            yield (f"{builder.__name__}[{size}]", lambda: t.StockAnalysisDeck().prs,
+                   lambda prs, b=builder, a=args: b(prs, *a))
+        yield f"build_deck[{size}]", lambda: None, lambda _, d=d: t.build_deck(d)
+        yield f"deck_schema.validate[{size}]", lambda d=d: d, validate
+        yield (f"StockAnalysisDeck.save[{size}]", lambda d=d: t.build_deck(d),
+               lambda deck: deck.save(io.BytesIO()))
+
+    headers = ["Metric", "FY2025", "FY2024", "FY2023", "FY2022"]
+    for n in (10, 100, 1000):
+        rows = [[f"Line item {i}", "$10.0B", "$9.0B", "$8.0B", "$7.0B"] for i in range(n)]
+        yield (f"add_table[{n} rows]", _new_slide,
+               lambda slide, rows=rows: t.add_table(slide, t.Inches(0.8), t.Inches(1.8), t.Inches(11.7),
+                                                    t.Inches(3.5), headers, rows))
+    from templates.table_layout import paginate, row_heights
+    rows = [[f"Line item {i % 50}", f"${i % 97}.0B", "$9.0B", "$8.0B", "$7.0B"] for i in range(10_000)]
+    widths = [t.Inches(3.5)] + [t.Inches(2.05)] * 4
+    yield ("table_layout.paginate[10k rows]", lambda: rows,
+           lambda rows: paginate(row_heights(headers, rows, widths), t.Inches(3.7)))
+    for n in (5, 50, 500):
+        bullets = [f"Bullet point number {i}" for i in range(n)]
+        yield (f"add_bullet_textbox[{n} bullets]", _new_slide,
+               lambda slide, bullets=bullets: t.add_bullet_textbox(slide, t.Inches(0.8), t.Inches(1.6),
+                                                                   t.Inches(11.5), t.Inches(5.0), bullets))
+
+
+    from templates.dcf import dcf_fair_values
+    import numpy as np
+    axes = (np.linspace(0.0, 0.15, 100), np.linspace(0.07, 0.13, 100), np.linspace(0.01, 0.03, 10))
+    yield ("dcf_fair_values[100x100x10 grid]", lambda: axes,
+           lambda a: dcf_fair_values(2.5e9, a[1], a[0], a[2], 1.0e9, 170e6, grid=True))
+
+    from templates.monte_carlo import distribution_inputs, simulate
+    model = {"revenue": 12e9, "price": 150.0, "shares": 170e6, "net_debt": 1.0e9,
+             "growth": {"dist": "normal", "mean": 0.06, "sd": 0.03},
+             "margin": {"dist": "triangular", "low": 0.12, "mode": 0.18, "high": 0.24},
+             "wacc": {"dist": "uniform", "low": 0.08, "high": 0.11}}
+    yield "monte_carlo.simulate[200k paths]", lambda: model, lambda m: simulate(paths=200_000, **m)
+    dist = distribution_inputs(simulate(paths=20_000, **model), model["price"])
+    yield ("build_valuation_distribution", lambda: t.StockAnalysisDeck().prs,
+           lambda prs: t.build_valuation_distribution(prs, dist["distribution_rows"],
+                                                      dist["distribution_histogram"],
+                                                      dist["distribution_note"]))
+    from templates.deck_spec import load_plan
+    from create_ttwo_deck import SPEC_PATH, TTWO
+    yield ("deck_spec.build[analysis-deck]", lambda: load_plan(SPEC_PATH, cache_dir=None),
+           lambda plan: plan.build(TTWO))
+    from templates.excel_export import export_workbook
+    decks = [generate_deck_data("typical", f"T{i:02d}") for i in range(10)]
+    yield ("excel_export.export_workbook[10 typical decks]", lambda: decks,
+           lambda decks: export_workbook(decks, os.path.join(tempfile.gettempdir(), "bench-export.xlsx")))
+    from templates.deck_merge import merge_decks
+    merge_dir = tempfile.mkdtemp(prefix="bench-merge-")
+    paths = []
+    for d in decks:
+        paths.append(os.path.join(merge_dir, f"2026-02-17-{d['ticker'].lower()}-analysis.pptx"))
+        t.build_deck(d).prs.save(paths[-1])
+    yield ("deck_merge.merge_decks[10 typical decks]", lambda: paths,
+           lambda paths: merge_decks(paths, os.path.join(merge_dir, "book.pptx")))
+    years = ["FY2025", "FY2024", "FY2023", "FY2022"]
+    series = {"Revenue": [10.0, 9.0, 8.0, 7.0], "Net Income": [2.0, 1.8, 1.5, 1.2],
+              "Net Margin (%)": [20.0, 20.0, 18.8, 17.1]}
+    yield ("build_income_chart[combo]", lambda: t.StockAnalysisDeck().prs,
+           lambda prs: t.build_income_chart(prs, years, series, ["Net Margin (%)"]))
+
+
+def measure(setup, run, repeat):
+    """Return (median ms, min ms, tracemalloc peak KB) for run(setup())."""
+    run(setup())  # warm up
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        times.append((time.perf_counter() - start) * 1000)
+
+    # Memory is measured separately: tracemalloc slows everything down
+    state = setup()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times), min(times), peak / 1024
+
+
+def run_suite(repeat, pattern=None):
+    results = {}
+    print(f"{'Case':<46}{'median ms':>11}{'min ms':>10}{'peak KB':>10}")
+    for name, setup, run in iter_cases():
+        if pattern and pattern not in name:
+            continue
+        median_ms, min_ms, peak_kb = measure(setup, run, repeat)
+        results[name] = {"median_ms": round(median_ms, 3), "min_ms": round(min_ms, 3),
+                         "peak_kb": round(peak_kb, 1)}
+        print(f"{name:<46}{median_ms:>11.2f}{min_ms:>10.2f}{peak_kb:>10.0f}")
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Print cases that regressed beyond tolerance; return how many did."""
+    regressions = 0
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        slower = (current["median_ms"] > base["median_ms"] * (1 + tolerance)
+                  and current["median_ms"] - base["median_ms"] > NOISE_FLOOR_MS)
+        bigger = current["peak_kb"] > base["peak_kb"] * (1 + tolerance) and current["peak_kb"] - base["peak_kb"] > 64
+        if slower or bigger:
+            regressions += 1
+            print(f"REGRESSION: {name}: {base['median_ms']:.2f} -> {current['median_ms']:.2f} ms, "
+                  f"{base['peak_kb']:.0f} -> {current['peak_kb']:.0f} KB")
+    print(f"{regressions} regression(s) vs baseline (tolerance {tolerance:.0%})")
+    return regressions
+
+
+# =============================================================================
+# ENGINE A/B REPORTS (--compare)
+# =============================================================================
+
+def time_decks(n):
+    """Return mean seconds to build one typical deck (excluding save)."""
+    d = generate_deck_data("typical")
+    t.build_deck(d)  # warm up imports and prototype cache
+    start = time.perf_counter()
+    for _ in range(n):
+        t.build_deck(d)
+    return (time.perf_counter() - start) / n
+
+
+def bench_prototypes(n):
+    t.use_prototypes(False)
+    direct = time_decks(n)
+    t.use_prototypes()
+    try:
+        cloned = time_decks(n)
+    finally:
+        t.use_prototypes(False)
+    print(f"{'Mode':<22}{'ms/deck':>10}")
+    print(f"{'per-property setters':<22}{direct * 1000:>10.1f}")
+    print(f"{'prototype cloning':<22}{cloned * 1000:>10.1f}")
+    print(f"Speedup: {direct / cloned:.2f}x")
+
+
+def bench_base_presentation(n):
+    """Report cold-start vs warm-start cost of creating an empty deck."""
+    import tempfile
+
+    def cold():
+        t._base = None
+        start = time.perf_counter()
+        t.StockAnalysisDeck()
+        return time.perf_counter() - start
+
+    def warm():
+        start = time.perf_counter()
+        for _ in range(n):
+            t.StockAnalysisDeck()
+        return (time.perf_counter() - start) / n
+
+    start = time.perf_counter()
+    for _ in range(n):
+        prs = t.Presentation()
+        prs.slide_width, prs.slide_height = t.SLIDE_WIDTH, t.SLIDE_HEIGHT
+    uncached = (time.perf_counter() - start) / n
+
+    cold_default = cold()
+    warm_default = warm()
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, "base.pptx")
+        t.save_base_snapshot(snapshot)
+        os.environ["STOCK_DECK_BASE_SNAPSHOT"] = snapshot
+        try:
+            cold_snapshot = cold()
+        finally:
+            del os.environ["STOCK_DECK_BASE_SNAPSHOT"]
+            t._base = None
+
+    print(f"{'Deck construction':<34}{'ms':>8}")
+    print(f"{'Presentation() + resize':<34}{uncached * 1000:>8.2f}")
+    print(f"{'cold start (bundled template)':<34}{cold_default * 1000:>8.2f}")
+    print(f"{'cold start (on-disk snapshot)':<34}{cold_snapshot * 1000:>8.2f}")
+    print(f"{'warm start (cached base clone)':<34}{warm_default * 1000:>8.2f}")
+
+
+def bench_tables(repeat):
+    """Time add_table against the per-cell reference for 10 to 1000 rows."""
+    headers = ["Metric", "FY2025", "FY2024", "FY2023", "FY2022"]
+    print(f"{'Rows':>6}{'per-cell ms':>14}{'direct-XML ms':>16}{'speedup':>10}")
+    for n in (10, 50, 100, 500, 1000):
+        rows = [[f"Line item {i}", "$10.0B", "$9.0B", "$8.0B", "$7.0B"] for i in range(n)]
+        times = []
+        for add in (t._add_table_by_cell, t.add_table):
+            deck = t.StockAnalysisDeck()
+            slide = deck.prs.slides.add_slide(deck.prs.slide_layouts[6])
+            start = time.perf_counter()
+            for _ in range(repeat):
+                add(slide, t.Inches(0.8), t.Inches(1.8), t.Inches(11.7), t.Inches(3.5), headers, rows)
+            times.append((time.perf_counter() - start) / repeat)
+        print(f"{n:>6}{times[0] * 1000:>14.1f}{times[1] * 1000:>16.1f}{times[0] / times[1]:>9.1f}x")
+
+
+def bench_columnar(tickers=3000, metrics=40):
+    """Peak memory and time for a peer slide from a large universe: JSON lists vs CSV source."""
+    import csv
+    import tempfile
+    from templates.columnar import TableSource
+
+    names = [f"T{i:04d}" for i in range(tickers)]
+    header = ["Metric"] + names
+    rows = [[f"Metric {m}"] + [f"{(m * 7 + i) % 50 + 5.5:.1f}x" for i in range(tickers)]
+            for m in range(metrics)]
+    wanted = names[:5]
+
+    def from_json(path):
+        with open(path) as f:
+            universe = json.load(f)
+        index = [universe["header"].index(c) for c in wanted]
+        return [[row[0]] + [row[i] for i in index] for row in universe["rows"]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, csv_path = os.path.join(tmp, "peers.json"), os.path.join(tmp, "peers.csv")
+        with open(json_path, "w") as f:
+            json.dump({"header": header, "rows": rows}, f)
+        with open(csv_path, "w", newline="") as f:
+            csv.writer(f).writerows([header] + rows)
+        del rows
+
+        print(f"Peer slide, {tickers} tickers x {metrics} metrics")
+        print(f"{'Source':<18}{'ms':>8}{'peak KB':>10}")
+        for label, load in (("JSON nested lists", lambda: from_json(json_path)),
+                            ("CSV TableSource", lambda: TableSource(csv_path, wanted))):
+            tracemalloc.start()
+            start = time.perf_counter()
+            t.build_peer_comparison(t.StockAnalysisDeck().prs, wanted[0], wanted[1:], load())
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{label:<18}{elapsed * 1000:>8.1f}{peak / 1024:>10.0f}")
+
+
+def bench_charts(n, charts=12):
+    """Build time and file size of a chart-heavy deck: python-pptx add_chart vs templated charts."""
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+    from templates.charts import TrendChartData, add_chart
+
+    categories = ["FY2022", "FY2023", "FY2024", "FY2025"]
+
+    def stock(slide, i):
+        data = CategoryChartData("#,##0.0")
+        data.categories = categories
+        data.add_series("Revenue", [7.0 + i, 8.0, 9.0, 10.0])
+        data.add_series("Net Income", [1.2, 1.5, 1.8, 2.0 + i])
+        slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, t.Inches(0.8), t.Inches(1.6),
+                               t.Inches(11.7), t.Inches(5.0), data)
+
+    def templated(slide, i):
+        data = TrendChartData("#,##0.0")
+        data.categories = categories
+        data.add_series("Revenue", [7.0 + i, 8.0, 9.0, 10.0])
+        data.add_series("Net Income", [1.2, 1.5, 1.8, 2.0 + i])
+        add_chart(slide.shapes, XL_CHART_TYPE.COLUMN_CLUSTERED, t.Inches(0.8), t.Inches(1.6),
+                  t.Inches(11.7), t.Inches(5.0), data)
+
+    print(f"{charts} chart slides per deck")
+    print(f"{'Engine':<22}{'build ms':>10}{'save ms':>10}{'bytes':>10}")
+    for label, add in (("python-pptx add_chart", stock), ("templated workbook", templated)):
+        build = save = 0.0
+        for _ in range(n):
+            start = time.perf_counter()
+            prs = t.StockAnalysisDeck().prs
+            for i in range(charts):
+                add(prs.slides.add_slide(prs.slide_layouts[6]), i)
+            build += time.perf_counter() - start
+            buf = io.BytesIO()
+            start = time.perf_counter()
+            prs.save(buf)
+            save += time.perf_counter() - start
+        print(f"{label:<22}{build / n * 1000:>10.1f}{save / n * 1000:>10.1f}{len(buf.getvalue()):>10}")
+
+
+def _coverage_deck(streaming, slides, path):
+    """Build a deck of about `slides` slides; return (seconds, start RSS MB, peak RSS MB)."""
+    import contextlib
+    import resource
+
+    d = t.expand_deck_data(generate_deck_data("typical"))
+    builders = [(builder, slide_args(d)) for builder, slide_args in t.DECK_SLIDES
+                if slide_args(d) is not None]
+    t.StockAnalysisDeck()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    deck = t.StreamingDeck(path) if streaming else t.StockAnalysisDeck()
+    built = i = 0
+    while built < slides:
+        builder, args = builders[i % len(builders)]
+        before = len(deck.prs.slides)
+        builder(deck.prs, *args)
+        built += len(deck.prs.slides) - before
+        deck.flush()
+        i += 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        deck.save(path)
+    return time.perf_counter() - start, rss, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_streaming(sizes=(10, 100, 1000)):
+    """Peak RSS of building and saving large decks: in-memory StockAnalysisDeck vs StreamingDeck.
+
+    Each measurement runs in a fresh process so peak RSS is its own.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"{'Slides':>7}{'Deck':>12}{'seconds':>10}{'start MB':>10}{'peak MB':>9}{'growth MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for slides in sizes:
+            for label, streaming in (("in-memory", False), ("streaming", True)):
+                with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    seconds, start, peak = pool.submit(_coverage_deck, streaming, slides,
+                                                       os.path.join(tmp, "deck.pptx")).result()
+                print(f"{slides:>7}{label:>12}{seconds:>10.2f}{start:>10.0f}{peak:>9.0f}{peak - start:>11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stock analysis deck generation")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (median reported)")
+    parser.add_argument("-k", dest="pattern", help="Only run cases whose name contains this")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with these results")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown/memory growth before a case is a regression")
+    parser.add_argument("--compare", action="store_true",
+                        help="Run the engine A/B reports (prototypes, base snapshot, table engine, "
+                             "columnar sources, charts, streaming decks) instead")
+    parser.add_argument("--decks", type=int, default=20, help="Decks per --compare measurement")
+    parser.add_argument("--table-repeat", type=int, default=3, help="Tables per --compare row-count measurement")
+    args = parser.parse_args()
+
+    if args.compare:
+        bench_base_presentation(args.decks)
+        print()
+        bench_prototypes(args.decks)
+        print()
+        bench_tables(args.table_repeat)
+        print()
+        bench_columnar()
+        print()
+        bench_charts(args.decks)
+        print()
+        bench_streaming()
+        return
+
+    results = run_suite(args.repeat, args.pattern)
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "repeat": args.repeat, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved: {args.json}")
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline: {args.baseline}")
+        return
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        print()
+        sys.exit(1 if compare_to_baseline(results, baseline, args.tolerance) else 0)
+
+
+if __name__ == "__main__":
+    main()
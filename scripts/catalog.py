@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Output Catalog
+
+Indexes the output/ tree in a SQLite database (output/.catalog.sqlite) so
+listing, searching and cleaning up research output does not have to walk
+and ls every query folder. Markdown and text reports are full-text indexed
+with FTS5.
+
+The index updates incrementally on every run: a file whose size and mtime
+are unchanged is skipped, a changed one is re-hashed, and only files whose
+content hash differs are re-read into the full-text index.
+
+Usage:
+    python scripts/catalog.py list                             # Everything, like list-output.sh
+    python scripts/catalog.py list stock --ticker TTWO --since 2026-06-01
+    python scripts/catalog.py list --search "EV/EBITDA"        # Folders whose reports mention it
+    python scripts/catalog.py list --json
+    python scripts/catalog.py clean 30                         # Remove folders untouched for 30+ days
+    python scripts/catalog.py clean 7 --dry-run
+    python scripts/catalog.py update                           # Just refresh the index
+
+list-output.sh and clean-output.sh delegate here.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
+DB_NAME = ".catalog.sqlite"
+TYPES = ("general", "stock")
+TEXT_EXTENSIONS = {".md", ".txt"}
+
+# Query folders are named YYYY-MM-DD-<slug>; stock slugs are the ticker
+_FOLDER = re.compile(r"^(\d{4}-\d{2}-\d{2})-(.+)$")
+_TITLE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    date TEXT,
+    slug TEXT NOT NULL,
+    ticker TEXT,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS folders_type_date ON folders (type, date);
+CREATE INDEX IF NOT EXISTS folders_ticker_date ON folders (ticker, date);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_folder ON files (folder);
+-- rowid = files.id
+CREATE VIRTUAL TABLE IF NOT EXISTS reports USING fts5(title, body);
+"""
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def fts_query(text):
+    """Quote each word of free text as an FTS5 phrase, so "EV/EBITDA" or "P/E" match literally."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+class Catalog:
+    """SQLite index of the query folders and files under an output directory."""
+
+    def __init__(self, output_dir=DEFAULT_OUTPUT_DIR, db_path=None):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.db = sqlite3.connect(db_path or os.path.join(output_dir, DB_NAME))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # =========================================================================
+    # INDEXING
+    # =========================================================================
+
+    def _scan(self):
+        """Yield (folder, type, dir_mtime_ns, [(relative path, name, stat)]) for every query folder."""
+        for kind in TYPES:
+            type_dir = os.path.join(self.output_dir, kind)
+            if not os.path.isdir(type_dir):
+                continue
+            for entry in os.scandir(type_dir):
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                folder = f"{kind}/{entry.name}"
+                files = []
+                for root, dirs, names in os.walk(entry.path):
+                    dirs[:] = [d for d in dirs if not d.startswith(".")]
+                    for name in names:
+                        if name.startswith("."):
+                            continue
+                        path = os.path.join(root, name)
+                        try:
+                            st = os.stat(path)
+                        except FileNotFoundError:  # deleted mid-scan, or a broken symlink
+                            continue
+                        rel = os.path.relpath(path, self.output_dir).replace(os.sep, "/")
+                        files.append((rel, name, st))
+                yield folder, kind, entry.stat().st_mtime_ns, files
+
+    def _index_text(self, file_id, rel, name):
+        self.db.execute("DELETE FROM reports WHERE rowid = ?", (file_id,))
+        if os.path.splitext(name)[1].lower() not in TEXT_EXTENSIONS:
+            return
+        with open(os.path.join(self.output_dir, rel), encoding="utf-8", errors="replace") as f:
+            body = f.read()
+        title = _TITLE.search(body)
+        self.db.execute("INSERT INTO reports (rowid, title, body) VALUES (?, ?, ?)",
+                        (file_id, title.group(1).strip() if title else name, body))
+
+    def update(self):
+        """Bring the index in line with the output tree.
+
+        Returns counts of added, changed, removed and unchanged files.
+        """
+        stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        known = {row["path"]: row for row in self.db.execute("SELECT id, path, size, mtime_ns, sha256 FROM files")}
+        known_folders = {row[0] for row in self.db.execute("SELECT path FROM folders")}
+        seen, seen_folders = set(), set()
+        with self.db:
+            for folder, kind, dir_mtime_ns, files in self._scan():
+                seen_folders.add(folder)
+                m = _FOLDER.match(folder.split("/", 1)[1])
+                date, slug = (m.group(1), m.group(2)) if m else (None, folder.split("/", 1)[1])
+                ticker = slug.upper() if kind == "stock" else None
+                newest = max([dir_mtime_ns] + [st.st_mtime_ns for _, _, st in files])
+                self.db.execute("INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?, ?, ?)",
+                                (folder, kind, date, slug, ticker, newest))
+                for rel, name, st in files:
+                    seen.add(rel)
+                    old = known.get(rel)
+                    if old is not None and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                        stats["unchanged"] += 1
+                        continue
+                    sha = _sha256(os.path.join(self.output_dir, rel))
+                    if old is None:
+                        file_id = self.db.execute(
+                            "INSERT INTO files (path, folder, name, size, mtime_ns, sha256) VALUES (?, ?, ?, ?, ?, ?)",
+                            (rel, folder, name, st.st_size, st.st_mtime_ns, sha)).lastrowid
+                    else:
+                        file_id = old["id"]
+                        self.db.execute("UPDATE files SET size = ?, mtime_ns = ?, sha256 = ? WHERE id = ?",
+                                        (st.st_size, st.st_mtime_ns, sha, file_id))
+                        if old["sha256"] == sha:
+                            stats["unchanged"] += 1  # touched, same content
+                            continue
+                    self._index_text(file_id, rel, name)
+                    stats["added" if old is None else "changed"] += 1
+
+            for rel in known.keys() - seen:
+                self.db.execute("DELETE FROM files WHERE id = ?", (known[rel]["id"],))
+                self.db.execute("DELETE FROM reports WHERE rowid = ?", (known[rel]["id"],))
+                stats["removed"] += 1
+            for folder in known_folders - seen_folders:
+                self.db.execute("DELETE FROM folders WHERE path = ?", (folder,))
+        return stats
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def query(self, kind=None, ticker=None, since=None, until=None, text=None):
+        """Folders matching every given filter, newest first within each type.
+
+        Each result is a dict with path, type, date, ticker, files (name,
+        size, mtime_ns; newest first) and, for a text search, matches as
+        (file name, snippet) pairs.
+        """
+        where, params = [], []
+        for clause, value in (("type = ?", kind), ("ticker = ?", ticker and ticker.upper()),
+                              ("date >= ?", since), ("date <= ?", until)):
+            if value:
+                where.append(clause)
+                params.append(value)
+        matches = {}
+        if text:
+            where.append("path IN (SELECT files.folder FROM reports JOIN files ON files.id = reports.rowid "
+                         "WHERE reports MATCH ?)")
+            params.append(fts_query(text))
+        selected = "SELECT * FROM folders"
+        if where:
+            selected += " WHERE " + " AND ".join(where)
+        if text:
+            # Snippets only for documents in folders that pass the other filters
+            for row in self.db.execute(
+                    "SELECT files.folder, files.name, snippet(reports, 1, '[', ']', '...', 12) AS snip "
+                    "FROM reports JOIN files ON files.id = reports.rowid "
+                    f"WHERE reports MATCH ? AND files.folder IN (SELECT path FROM ({selected})) ORDER BY rank",
+                    [params[-1]] + params):
+                matches.setdefault(row["folder"], []).append((row["name"], row["snip"]))
+
+        files = {}
+        for row in self.db.execute(f"SELECT folder, name, size, mtime_ns FROM files WHERE folder IN "
+                                   f"(SELECT path FROM ({selected})) ORDER BY mtime_ns DESC, name", params):
+            files.setdefault(row["folder"], []).append((row["name"], row["size"], row["mtime_ns"]))
+        return [{"path": row["path"], "type": row["type"], "date": row["date"], "ticker": row["ticker"],
+                 "mtime_ns": row["mtime_ns"], "files": files.get(row["path"], []),
+                 "matches": matches.get(row["path"], [])}
+                for row in self.db.execute(selected + " ORDER BY type, date DESC, slug", params)]
+
+    def expired(self, days, now=None):
+        """Folders whose newest file (or the folder itself) is older than days."""
+        cutoff = int(((now if now is not None else time.time()) - days * 86400) * 1e9)
+        return [row[0] for row in self.db.execute(
+            "SELECT path FROM folders WHERE mtime_ns < ? ORDER BY path", (cutoff,))]
+
+    def remove(self, folder):
+        """Delete a query folder from disk and from the index.
+
+        Returns False, leaving the index as it is, if the folder could not be deleted.
+        """
+        path = os.path.join(self.output_dir, folder)
+        shutil.rmtree(path, ignore_errors=True)
+        if os.path.lexists(path):
+            return False
+        with self.db:
+            self.db.execute("DELETE FROM reports WHERE rowid IN (SELECT id FROM files WHERE folder = ?)",
+                            (folder,))
+            self.db.execute("DELETE FROM files WHERE folder = ?", (folder,))
+            self.db.execute("DELETE FROM folders WHERE path = ?", (folder,))
+        return True
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def print_listing(results, kinds):
+    """Print folders grouped by type in the list-output.sh layout."""
+    by_type = {}
+    for r in results:
+        by_type.setdefault(r["type"], []).append(r)
+    for kind in kinds:
+        print(f"=== {kind} ===")
+        if not by_type.get(kind):
+            print("  (no output)")
+        for r in by_type.get(kind, []):
+            print(f"  {r['path'].split('/', 1)[1]}/")
+            for name, _, _ in r["files"]:
+                print(f"    {name}")
+            for name, snip in r["matches"]:
+                print(f"      {name}: {' '.join(snip.split())}")
+        if len(kinds) > 1:
+            print()
+
+
+def main():
+    """CLI entry point — list, search and clean the output tree through the catalog."""
+    parser = argparse.ArgumentParser(description="Indexed catalog of research output")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Output tree to index")
+    parser.add_argument("--no-update", action="store_true", help="Query the index without refreshing it")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = commands.add_parser("list", help="List query folders and their files")
+    list_cmd.add_argument("type", nargs="?", choices=TYPES, help="Only this output type")
+    list_cmd.add_argument("--ticker", help="Only stock folders for this ticker")
+    list_cmd.add_argument("--since", help="Only folders dated on or after YYYY-MM-DD")
+    list_cmd.add_argument("--until", help="Only folders dated on or before YYYY-MM-DD")
+    list_cmd.add_argument("--search", help="Only folders whose reports contain these words")
+    list_cmd.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    clean_cmd = commands.add_parser("clean", help="Remove query folders not modified for N days")
+    clean_cmd.add_argument("days", nargs="?", type=int, default=30)
+    clean_cmd.add_argument("--dry-run", action="store_true", help="Only print what would be removed")
+
+    commands.add_parser("update", help="Refresh the index and print what changed")
+    args = parser.parse_args()
+
+    catalog = Catalog(args.output_dir)
+    try:
+        stats = None if args.no_update else catalog.update()
+        if args.command == "update":
+            print(", ".join(f"{k} {v}" for k, v in stats.items()))
+        elif args.command == "list":
+            results = catalog.query(args.type, args.ticker, args.since, args.until, args.search)
+            if args.json:
+                print(json.dumps(results, indent=2))
+            else:
+                print_listing(results, [args.type] if args.type else list(TYPES))
+        else:
+            print(f"Cleaning output query folders older than {args.days} days...")
+            for folder in catalog.expired(args.days):
+                print(os.path.join(args.output_dir, folder))
+                if not args.dry_run and not catalog.remove(folder):
+                    print(f"  could not delete {folder}", file=sys.stderr)
+            print("Done.")
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
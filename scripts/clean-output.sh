@@ -1,12 +1,9 @@
 #!/bin/bash
 # Clean output query folders older than N days (default: 30)
-# Removes entire query folders, not individual files
-# Usage: ./scripts/clean-output.sh [days]
+# Removes entire query folders, not individual files; a folder's age is the
+# newest modification of anything in it, as recorded by scripts/catalog.py
+# Usage: ./scripts/clean-output.sh [days] [--dry-run]
 
 BASE_DIR="$(cd "$(dirname "$0")/.." && pwd)"
-OUTPUT_DIR="$BASE_DIR/output"
-DAYS="${1:-30}"
 
-echo "Cleaning output query folders older than $DAYS days..."
-find "$OUTPUT_DIR" -mindepth 2 -maxdepth 2 -type d -mtime +"$DAYS" -print -exec rm -rf {} +
-echo "Done."
+exec python3 "$BASE_DIR/scripts/catalog.py" clean "${1:-30}" "${@:2}"
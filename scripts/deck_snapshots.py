@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Structural snapshot tests for generated decks.
+
+Every slide is reduced to a hash of its canonical XML: attributes and
+namespaces in C14N order, shape ids and the numbers python-pptx appends to
+shape names dropped, and relationship ids replaced by the hash of the part
+they point at. Charts and their embedded workbooks are hashed the same way
+(workbook timestamps dropped), so a changed chart changes its slide's hash
+while renumbered parts or a different save time do not.
+
+Golden hashes live in scripts/deck_snapshots.json, keyed by fixture and by
+the builder that produced each slide. The fixtures are synthetic decks from
+templates/sample_data.py at every size, half of them with trend charts.
+Slides are hashed straight from the in-memory presentation, so a check costs
+little more than building the fixture decks.
+
+Usage:
+    python scripts/deck_snapshots.py                    # Check every fixture against the golden hashes
+    python scripts/deck_snapshots.py -k extreme         # Only fixtures whose name contains "extreme"
+    python scripts/deck_snapshots.py --update           # Accept the current output as golden
+    python scripts/deck_snapshots.py --dump /tmp/after  # Also write canonical XML of changed slides
+    python scripts/deck_snapshots.py --file deck.pptx   # Print slide hashes of a saved deck
+
+Dump a run before and after a change and `diff -r` the two directories to
+see what changed inside the reported slides.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+
+from templates import stock_analysis_slides as t
+from templates.deck_merge import PackageSource, ZipSource, R_NS
+from templates.sample_data import SIZES, generate_deck_data
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "deck_snapshots.json")
+FIXTURE_COUNTS = {"small": 60, "typical": 60, "extreme": 6}
+DIGEST_CHARS = 16
+
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+DCTERMS_NS = "http://purl.org/dc/terms/"
+A16_NS = "http://schemas.microsoft.com/office/drawing/2014/main"
+# Parts shared by every slide; hashed by content only, without following their relationships
+_SHARED_TYPES = ("/slideLayout", "/slideMaster", "/theme", "/notesMaster")
+_SHAPE_NAME_NUMBER = re.compile(r" \d+$")
+_relationship_attributes = etree.XPath("//@r:*", namespaces={"r": R_NS})
+
+
+# =============================================================================
+# CANONICAL FORM
+# =============================================================================
+
+def canonical_xml(data, rel_digests=None):
+    """C14N bytes of an XML part with volatile ids removed.
+
+    rel_digests maps relationship ids to the digests of their targets; r:id
+    style attributes are replaced by those digests.
+    """
+    root = etree.fromstring(data)
+    for element in root.iter(f"{{{P_NS}}}cNvPr"):
+        element.attrib.pop("id", None)
+        if "name" in element.attrib:
+            element.set("name", _SHAPE_NAME_NUMBER.sub("", element.get("name")))
+    for element in list(root.iter(f"{{{A16_NS}}}creationId", f"{{{DCTERMS_NS}}}created",
+                                  f"{{{DCTERMS_NS}}}modified")):
+        element.getparent().remove(element)
+    if rel_digests:
+        for value in _relationship_attributes(root):
+            if value in rel_digests:
+                value.getparent().set(value.attrname, rel_digests[value])
+    return etree.tostring(root, method="c14n")
+
+
+def canonical_package(data):
+    """Canonical bytes of an embedded OPC package such as a chart workbook."""
+    out = []
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        for name in sorted(z.namelist()):
+            member = z.read(name)
+            if name.endswith((".xml", ".rels")):
+                member = canonical_xml(member)
+            out.append(name.encode() + b"\0" + member)
+    return b"\0\0".join(out)
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:DIGEST_CHARS]
+
+
+def canonical_part(src, part, memo):
+    """Canonical bytes of part, with the parts it relates to folded in by digest."""
+    data = src.read(part)
+    content_type = src.content_type(part) or ""
+    if data[:2] == b"PK":
+        return canonical_package(data)
+    if not content_type.endswith("xml"):
+        return data
+    rels = {}
+    related = []
+    for rel, target in src.related(part):
+        rel_type = rel.get("Type").rsplit("/", 1)[-1]
+        if not src.has(target):
+            continue
+        rels[rel.get("Id")] = digest = part_digest(src, target, memo,
+                                                   follow=not rel.get("Type").endswith(_SHARED_TYPES))
+        related.append(f"{rel_type}:{digest}")
+    body = canonical_xml(data, rels)
+    return body + b"\0" + "\n".join(sorted(related)).encode()
+
+
+def part_digest(src, part, memo, follow=True):
+    key = (part, follow)
+    if key not in memo:
+        if follow:
+            memo[key] = _digest(canonical_part(src, part, memo))
+        else:
+            memo[key] = _digest(canonical_xml(src.read(part)))
+    return memo[key]
+
+
+def slide_digests(src):
+    """Digest of every slide of a ZipSource or PackageSource, in deck order."""
+    memo = {}
+    return [part_digest(src, slide, memo) for slide in src.slides]
+
+
+def file_snapshot(path):
+    """{"slide N": digest} for a saved .pptx, read straight from the zip."""
+    src = ZipSource(path)
+    try:
+        return {f"slide {i}": digest for i, digest in enumerate(slide_digests(src), 1)}
+    finally:
+        src.close()
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def fixture_names(pattern=None):
+    names = [f"{size}-{seed:02d}" for size in SIZES for seed in range(FIXTURE_COUNTS[size])]
+    return [name for name in names if not pattern or pattern in name]
+
+
+def fixture_data(name):
+    """Deck data for a fixture name such as "typical-07"; odd seeds add trend charts."""
+    size, seed = name.rsplit("-", 1)
+    seed = int(seed)
+    d = generate_deck_data(size, ticker=f"FX{seed:02d}", seed=seed)
+    if seed % 2:
+        values = [[float(v.strip("$B")) for v in row[1:]] for row in d["income_rows"][:3]]
+        d["income_chart"] = {"series": {row[0]: v for row, v in zip(d["income_rows"], values)},
+                             "lines": [d["income_rows"][2][0]] if len(values) > 2 else []}
+        d["balance_chart"] = {"series": {d["balance_rows"][0][0]: values[0]},
+                              "lines": [d["balance_rows"][0][0]]}
+    return d
+
+
+class _RecordingDeck(t.StockAnalysisDeck):
+    """Notes the slide count after each builder (build_deck calls flush() after each one)."""
+
+    def __init__(self):
+        super().__init__()
+        self.marks = []
+
+    def flush(self):
+        self.marks.append(len(self.prs.slides))
+
+
+def deck_slides(d):
+    """Build a deck; return (prs, [(key, slide index)]) with keys named after builders."""
+    deck = t.build_deck(d, deck=_RecordingDeck())
+    expanded = t.expand_deck_data(d)
+    builders = [builder.__name__ for builder, slide_args in t.DECK_SLIDES
+                if slide_args(expanded) is not None]
+    keys, start = [], 0
+    for name, stop in zip(builders, deck.marks):
+        pages = stop - start
+        keys.extend((name if pages == 1 else f"{name}[{page}/{pages}]", start + page - 1)
+                    for page in range(1, pages + 1))
+        start = stop
+    return deck.prs, keys
+
+
+def snapshot(name, dump_dir=None, only=None):
+    """{key: digest} for a fixture. With dump_dir, also write the canonical XML of the keys in only."""
+    prs, keys = deck_slides(fixture_data(name))
+    src = PackageSource(prs)
+    memo = {}
+    result = {}
+    for key, index in keys:
+        slide = src.slides[index]
+        result[key] = part_digest(src, slide, memo)
+        if dump_dir and only is not None and key in only:
+            path = os.path.join(dump_dir, name, key.replace("/", "-") + ".xml")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(canonical_part(src, slide, memo))
+    return result
+
+
+def _snapshot_job(args):
+    name, dump_dir, golden = args
+    current = snapshot(name)
+    if dump_dir and golden is not None and current != golden:
+        changed = {key for key in set(current) | set(golden) if current.get(key) != golden.get(key)}
+        snapshot(name, dump_dir, changed)
+    return name, current
+
+
+def run_snapshots(names, golden=None, dump_dir=None, workers=1):
+    """Yield (fixture, {key: digest}) for each fixture name, across worker processes if workers > 1."""
+    jobs = [(name, dump_dir, (golden or {}).get(name)) for name in names]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            yield from pool.map(_snapshot_job, jobs, chunksize=4)
+    else:
+        yield from map(_snapshot_job, jobs)
+
+
+def compare(golden, current):
+    """Lines describing every slide whose digest differs from golden, for one fixture."""
+    lines = []
+    for key in sorted(set(golden) | set(current)):
+        if key not in current:
+            lines.append(f"  - {key}: no longer produced")
+        elif key not in golden:
+            lines.append(f"  + {key}: new slide")
+        elif golden[key] != current[key]:
+            lines.append(f"  ~ {key}: {golden[key]} -> {current[key]}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check generated decks against golden slide hashes")
+    parser.add_argument("-k", dest="pattern", help="Only fixtures whose name contains this")
+    parser.add_argument("--update", action="store_true", help="Write the current hashes as the golden file")
+    parser.add_argument("--golden", default=GOLDEN_PATH, help="Golden hash file")
+    parser.add_argument("--dump", metavar="DIR", help="Write canonical XML of changed slides under DIR")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--file", nargs="+", help="Print slide hashes of saved .pptx files and exit")
+    args = parser.parse_args()
+
+    if args.file:
+        for path in args.file:
+            for key, digest in file_snapshot(path).items():
+                print(f"{path}  {key:<10} {digest}")
+        return
+
+    golden = {}
+    if os.path.exists(args.golden):
+        with open(args.golden) as f:
+            golden = json.load(f)
+    names = fixture_names(args.pattern)
+
+    start = time.perf_counter()
+    results, changed = {}, 0
+    for name, current in run_snapshots(names, None if args.update else golden, args.dump, args.workers):
+        results[name] = current
+        lines = compare(golden.get(name, {}), current)
+        if lines and not args.update:
+            changed += 1
+            print(name)
+            print("\n".join(lines))
+    elapsed = time.perf_counter() - start
+    slides = sum(len(r) for r in results.values())
+
+    if args.update:
+        golden.update(results)
+        if not args.pattern:
+            golden = results
+        with open(args.golden, "w") as f:
+            json.dump(golden, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"Saved: {args.golden} ({len(results)} fixtures, {slides} slides) in {elapsed:.1f}s")
+        return
+    print(f"{len(names) - changed}/{len(names)} fixtures match ({slides} slides) in {elapsed:.1f}s")
+    sys.exit(1 if changed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Test the SQLite catalog of the output tree."""
+
+import sys
+import os
+import subprocess
+import shutil
+import tempfile
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import catalog as catalog_module
+from catalog import Catalog
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def write(path, text, mtime=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+        os.utime(os.path.dirname(path), (mtime, mtime))
+
+
+def make_tree(out):
+    old = time.time() - 90 * 86400
+    write(os.path.join(out, "stock", "2026-03-02-ttwo", "2026-03-02-ttwo.md"),
+          "# TTWO Analysis\nTrades at 18x EV/EBITDA versus peers.\n", old)
+    write(os.path.join(out, "stock", "2026-07-15-ttwo", "2026-07-15-ttwo.md"), "# TTWO Update\nGTA VI slip.\n")
+    write(os.path.join(out, "stock", "2026-07-15-ttwo", "2026-07-15-ttwo-analysis.pptx"), "pptx")
+    write(os.path.join(out, "stock", "2026-08-01-ea", "2026-08-01-ea.md"), "# EA\nEV/EBITDA of 14x.\n")
+    write(os.path.join(out, "general", "2026-06-10-ai-agents", "2026-06-10-ai-agents.md"),
+          "# AI Agents\nNo valuation here.\n")
+
+
+def test_index_and_query():
+    with tempfile.TemporaryDirectory() as out:
+        make_tree(out)
+        catalog = Catalog(out)
+        try:
+            assert catalog.update() == {"added": 5, "changed": 0, "removed": 0, "unchanged": 0}
+            assert catalog.update() == {"added": 0, "changed": 0, "removed": 0, "unchanged": 5}
+
+            ttwo = catalog.query(ticker="ttwo", since="2026-06-01")
+            assert [r["path"] for r in ttwo] == ["stock/2026-07-15-ttwo"]
+            assert {name for name, _, _ in ttwo[0]["files"]} == {"2026-07-15-ttwo.md",
+                                                                  "2026-07-15-ttwo-analysis.pptx"}
+            hits = catalog.query(text="EV/EBITDA")
+            assert [r["path"] for r in hits] == ["stock/2026-08-01-ea", "stock/2026-03-02-ttwo"]
+            assert "18x [EV/EBITDA] versus" in hits[1]["matches"][0][1]
+            assert catalog.query(kind="general", text="EV/EBITDA") == []
+
+            # Edits are re-indexed, deletions dropped
+            write(os.path.join(out, "general", "2026-06-10-ai-agents", "2026-06-10-ai-agents.md"),
+                  "# AI Agents\nAgent startups at 40x EV/EBITDA.\n")
+            os.remove(os.path.join(out, "stock", "2026-07-15-ttwo", "2026-07-15-ttwo-analysis.pptx"))
+            assert catalog.update() == {"added": 0, "changed": 1, "removed": 1, "unchanged": 3}
+            assert [r["path"] for r in catalog.query(kind="general", text="EV/EBITDA")] == [
+                "general/2026-06-10-ai-agents"]
+
+            # Broken symlinks are skipped; a folder that could not be deleted stays indexed
+            os.symlink(os.path.join(out, "gone.md"), os.path.join(out, "stock", "2026-08-01-ea", "link.md"))
+            assert catalog.update() == {"added": 0, "changed": 0, "removed": 0, "unchanged": 4}
+            rmtree, catalog_module.shutil.rmtree = shutil.rmtree, lambda path, ignore_errors=False: None
+            try:
+                assert catalog.remove("stock/2026-08-01-ea") is False
+            finally:
+                catalog_module.shutil.rmtree = rmtree
+            assert [r["path"] for r in catalog.query(ticker="ea")] == ["stock/2026-08-01-ea"]
+            assert catalog.remove("stock/2026-08-01-ea") is True
+            assert catalog.query(ticker="ea") == []
+        finally:
+            catalog.close()
+    print("PASS: Incremental index answers type/ticker/date/text queries")
+
+
+def test_shell_scripts_delegate():
+    with tempfile.TemporaryDirectory() as out:
+        make_tree(out)
+        run = lambda *args: subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, "catalog.py"),
+                                            "--output-dir", out, *args],
+                                           capture_output=True, text=True, check=True).stdout
+        listing = run("list", "stock", "--ticker", "TTWO")
+        lines = listing.splitlines()
+        assert lines[:2] == ["=== stock ===", "  2026-07-15-ttwo/"]
+        assert sorted(lines[2:4]) == ["    2026-07-15-ttwo-analysis.pptx", "    2026-07-15-ttwo.md"]
+        cleaned = run("clean", "30")
+        assert os.path.join(out, "stock/2026-03-02-ttwo") in cleaned
+        assert not os.path.exists(os.path.join(out, "stock", "2026-03-02-ttwo"))
+        assert os.path.exists(os.path.join(out, "stock", "2026-07-15-ttwo"))
+        assert "2026-03-02-ttwo" not in run("list")
+    print("PASS: list and clean run from the catalog")
+
+
+if __name__ == "__main__":
+    test_index_and_query()
+    test_shell_scripts_delegate()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Test typed table cells: formatting, slide tables and Excel export from raw numbers."""
+
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from lxml import etree
+
+from templates import stock_analysis_slides as t
+from templates.cells import CellTable, Column, number_format
+from templates.excel_export import export_workbook, parse_cell
+from test_excel_export import read_sheets
+from templates.sample_data import generate_deck_data
+
+
+def text_sample_data(ticker):
+    """Small generated deck with one-row tables of known values."""
+    d = generate_deck_data("small", ticker)
+    d.update({
+        "valuation_metrics": [["Forward P/E", "20.0x", "In line with peers"]],
+        "income_years": ["FY2025", "FY2024"],
+        "income_rows": [["Revenue", "$10.0B", "$9.0B"]],
+        "balance_years": ["FY2025", "FY2024"],
+        "balance_rows": [["Cash", "$5.0B", "$4.0B"]],
+        "peers": ["PEER1"],
+        "peer_rows": [["Market Cap", "$50B", "$40B"]],
+        "valuation_rows": [["DCF", "$120.00", "+20%", "100%"]],
+        "sensitivity_scenarios": ["Base"],
+        "sensitivity_waccs": ["WACC 10%"],
+        "sensitivity_matrix": [["$120"]],
+    })
+    return d
+
+
+def typed_sample_data(ticker):
+    """text_sample_data() with every table given as a CellTable of raw numbers."""
+    d = text_sample_data(ticker)
+    d["valuation_metrics"] = CellTable(["Forward P/E"], [Column([20.0], "multiple"),
+                                                         Column(["In line with peers"], "text")])
+    d["income_rows"] = CellTable.from_rows([["Revenue", 10e9, 9e9]], ["currency"])
+    d["balance_rows"] = CellTable.from_rows([["Cash", 5e9, 4e9]], ["currency"])
+    d["peer_rows"] = CellTable.from_rows([["Market Cap", 50e9, 40e9]], [("currency", 0)])
+    d["valuation_rows"] = CellTable(["DCF"], [Column([120.0], "per_share"), Column([0.2], "delta"),
+                                              Column([1.0], "percent", decimals=0)])
+    d["sensitivity_matrix"] = CellTable(["Base"], [Column([120.0], "per_share", decimals=0)])
+    return d
+
+
+def test_formats():
+    table = CellTable.from_rows([
+        ["Revenue", 391.035e9, 950e6, -1.25e9, None],
+        ["Margin", 0.2531, 0.2, np.nan, 0.0],
+        ["EPS", 6.42, 1234.5, -0.5, 6.42],
+        ["P/E", 28.5, 1250.0, None, 9.0],
+        ["Upside", 0.12, -0.05, 0.0, 0.12],
+    ], ["currency", "percent", "per_share", "multiple", "delta"])
+    assert table.rows() == [
+        ["Revenue", "$391.0B", "$950.0M", "($1.2B)", "—"],
+        ["Margin", "25.3%", "20.0%", "—", "0.0%"],
+        ["EPS", "$6.42", "$1,234.50", "($0.50)", "$6.42"],
+        ["P/E", "28.5x", "1,250.0x", "—", "9.0x"],
+        ["Upside", "+12%", "-5%", "+0%", "+12%"],
+    ]
+    # Excel formats render the same text the slides show
+    for text_row, typed_row in zip(table, table.typed_rows()):
+        for text, cell in zip(text_row[1:], typed_row[1:]):
+            if cell is None:
+                assert text == "—"
+                continue
+            value, fmt = parse_cell(text)
+            # parse_cell only keeps the explicit sign format for "+" strings
+            assert fmt == cell[1] or text.startswith("-") and cell[1].startswith("+"), (text, cell)
+            assert abs(value - cell[0]) <= abs(cell[0]) * 0.05, (text, cell)
+    assert number_format("currency", 1, "B").format_array([250e6, 3e9]) == ["$0.2B", "$3.0B"]
+    assert number_format("percent") is number_format("percent", 1)
+    assert number_format("delta").excel.split(";")[2] == "+0%"  # zero shows as "+0%", as on the slide
+    assert table.series(["Revenue"], scale=1e9) == {"Revenue": [391.035, 0.95, -1.25, None]}
+    print("PASS: Cell kinds format like the hand-written strings and match their Excel formats")
+
+
+def test_builders_accept_cell_tables():
+    def slide_xml(d):
+        return [etree.tostring(s._element) for s in t.build_deck(d).prs.slides]
+
+    assert slide_xml(typed_sample_data("AAA")) == slide_xml(text_sample_data("AAA"))
+    print("PASS: Slides built from CellTables match slides built from strings")
+
+
+def test_excel_from_cell_tables():
+    with tempfile.TemporaryDirectory() as tmp:
+        plain, typed = os.path.join(tmp, "plain.xlsx"), os.path.join(tmp, "typed.xlsx")
+        export_workbook([text_sample_data("AAA")], plain)
+        export_workbook([typed_sample_data("AAA")], typed)
+        assert read_sheets(typed) == read_sheets(plain)
+    print("PASS: CellTables export to the same numeric Excel cells")
+
+
+if __name__ == "__main__":
+    test_formats()
+    test_builders_accept_cell_tables()
+    test_excel_from_cell_tables()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test native trend chart slides and their templated embedded workbooks."""
+
+import sys
+import os
+import io
+import zipfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.oxml.ns import qn
+
+from templates import stock_analysis_slides as t
+from templates.charts import TrendChartData, _combo_xml
+from templates.deck_schema import validate
+from templates.sample_data import generate_deck_data
+
+SHEET_NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def sheet_cells(chart):
+    """{cell ref: text} from a chart's embedded workbook."""
+    with zipfile.ZipFile(io.BytesIO(chart.part.chart_workbook.xlsx_part.blob)) as z:
+        sheet = etree.fromstring(z.read("xl/worksheets/sheet1.xml"))
+    return {c.get("r"): "".join(c.itertext()) for c in sheet.iterfind(".//x:c", SHEET_NS)}
+
+
+def test_chart_slides():
+    d = generate_deck_data("small", "AAA")
+    d["income_chart"] = {"series": {"Revenue ($B)": [10.0, 9.0, 8.0], "Net Income ($B)": [2.0, 1.8, 1.6],
+                                    "Net Margin (%)": [20.0, 20.0, 20.0]},
+                         "lines": ["Net Margin (%)"]}
+    d["balance_chart"] = {"series": {"Cash": [5.0, None, 4.0], "Debt": [2.0, 2.5, 3.0]}, "lines": ["Cash", "Debt"]}
+    assert validate(d) == []
+    assert validate(dict(d, balance_chart={"series": {"Cash": [5.0]}, "lines": ["Debt"]})) == [
+        "$.balance_chart.series.Cash: expected 3 values (balance_years), got 1",
+        "$.balance_chart.lines: 'Debt' is not a series"]
+
+    buf = io.BytesIO()
+    t.build_deck(d).save(buf)
+    prs = t.Presentation(io.BytesIO(buf.getvalue()))
+    assert len(prs.slides) == 13
+    income = [s for s in prs.slides[4].shapes if s.has_chart][0].chart
+    balance = [s for s in prs.slides[6].shapes if s.has_chart][0].chart
+
+    assert [(type(p).__name__, [s.name for s in p.series]) for p in income.plots] == [
+        ("BarPlot", ["Revenue ($B)", "Net Income ($B)"]), ("LinePlot", ["Net Margin (%)"])]
+    assert list(income.plots[0].categories) == ["FY2023", "FY2024", "FY2025"]
+    assert income.plots[0].series[0].values == (8.0, 9.0, 10.0)
+    cells = sheet_cells(income)
+    assert cells["A2"] == "FY2023" and cells["B1"] == "Revenue ($B)" and cells["B4"] == "10.0"
+    assert cells["D1"] == "Net Margin (%)" and cells["D2"] == "20.0"
+
+    assert [type(p).__name__ for p in balance.plots] == ["LinePlot"]
+    assert "B3" not in sheet_cells(balance)  # the missing FY2024 cash value stays blank
+    print("PASS: Combo and line trend charts with templated workbooks")
+
+
+def test_combo_without_gridlines():
+    data = TrendChartData()
+    data.categories = ["FY2024", "FY2025"]
+    data.add_series("Revenue", [9.0, 10.0])
+    data.add_series("Margin", [20.0, 20.0])
+    line = etree.fromstring(data.xml_bytes(XL_CHART_TYPE.LINE_MARKERS))
+    for gridlines in line.iter(qn("c:majorGridlines")):
+        gridlines.getparent().remove(gridlines)
+    combo = etree.fromstring(_combo_xml(data.xml_bytes(XL_CHART_TYPE.COLUMN_CLUSTERED),
+                                        etree.tostring(line), [1]))
+    assert len(combo.findall(f".//{qn('c:valAx')}")) == 2
+    print("PASS: Combo chart built from a line chart without gridlines")
+
+
+def test_many_charts_get_unique_parts():
+    prs = t.StockAnalysisDeck().prs
+    for i in range(12):
+        t.build_income_chart(prs, ["FY2025", "FY2024"], {"Revenue": [float(i), 1.0]})
+    buf = io.BytesIO()
+    prs.save(buf)
+    with zipfile.ZipFile(io.BytesIO(buf.getvalue())) as z:
+        names = z.namelist()
+    assert len([n for n in names if n.startswith("ppt/charts/chart")]) == 12
+    assert len([n for n in names if n.startswith("ppt/embeddings/")]) == 12
+    reopened = t.Presentation(io.BytesIO(buf.getvalue()))
+    values = [[s for s in slide.shapes if s.has_chart][0].chart.plots[0].series[0].values[1]
+              for slide in reopened.slides]
+    assert values == [float(i) for i in range(12)]
+    print("PASS: 12 charts numbered without collisions")
+
+
+if __name__ == "__main__":
+    test_chart_slides()
+    test_combo_without_gridlines()
+    test_many_charts_get_unique_parts()
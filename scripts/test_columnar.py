@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Test building the table slides from columnar CSV/Parquet sources."""
+
+import sys
+import os
+import csv
+import tempfile
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import stock_analysis_slides as t
+from templates.columnar import TableSource
+from templates.deck_schema import validate
+from templates.sample_data import generate_deck_data
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def table_cells(slide):
+    table = [s for s in slide.shapes if s.has_table][0].table
+    return [[c.text for c in row.cells] for row in table.rows]
+
+
+def test_csv_sources():
+    with tempfile.TemporaryDirectory() as tmp:
+        income = os.path.join(tmp, "income.csv")
+        write_csv(income, ["Line Item", "FY2023", "FY2024", "FY2025", "FY2026E"],
+                  [["Revenue", 8, 9, 10, 11], ["Net Income", 1.5, 1.8, "", 2.2], ["EPS", 1.2]])
+        universe = os.path.join(tmp, "peers.csv")
+        tickers = [f"T{i:03d}" for i in range(300)]
+        write_csv(universe, ["Metric"] + tickers,
+                  [[m] + [f"{m[:2]}-{tk}" for tk in tickers] for m in ("Market Cap", "Forward P/E", "EV/EBITDA")])
+
+        d = generate_deck_data("small", "T007")
+        d["peers"] = ["T100", "T200"]
+        d["income_rows"] = {"source": income, "format": "${:.1f}B"}
+        d["peer_rows"] = {"source": universe, "rows": ["EV/EBITDA", "Market Cap"]}
+        assert validate(d) == []
+        assert validate(dict(d, balance_rows={"source": os.path.join(tmp, "nope.csv")})) == [
+            f"$.balance_rows.source: no such file {os.path.join(tmp, 'nope.csv')!r}"]
+        # Spec keys and types, and the columns the slide reads, are checked before rendering
+        assert validate(dict(d, income_rows={"source": income, "colums": ["FY2025"], "limit": "5",
+                                             "format": "{:.1q}"})) == [
+            "$.income_rows.colums: unknown key; expected one of source, label, columns, rows, limit, format",
+            "$.income_rows.limit: expected positive integer, got '5'",
+            "$.income_rows.format: bad format pattern '{:.1q}': Unknown format code 'q' for object of type 'float'",
+        ]
+        assert validate(dict(d, income_rows={"source": income, "rows": "Revenue",
+                                             "format": {"FY2025": "dollars"}})) == [
+            "$.income_rows.rows: expected list of strings",
+            "$.income_rows.format: FY2025: bad format pattern 'dollars': no {} field",
+        ]
+        assert validate(dict(d, income_rows={"source": income}, income_years=["FY2025", "FY2030"])) == [
+            f"$.income_rows: {income!r} has no column(s) 'FY2030'"]
+        assert validate(dict(d, balance_rows={"source": income, "label": "Metric",
+                                              "columns": ["FY2025"], "format": "currency"})) == [
+            f"$.balance_rows: {income!r} has no column(s) 'Metric'"]
+
+        prs = t.build_deck(d).prs
+        assert table_cells(prs.slides[3]) == [["Line Item", "FY2025", "FY2024", "FY2023"],
+                                              ["Revenue", "$10.0B", "$9.0B", "$8.0B"],
+                                              ["Net Income", "", "$1.8B", "$1.5B"],
+                                              ["EPS", "", "", "$1.2B"]]  # a short CSV row is padded
+        assert table_cells(prs.slides[5]) == [["Metric", "T007", "T100", "T200"],
+                                              ["EV/EBITDA", "EV-T007", "EV-T100", "EV-T200"],
+                                              ["Market Cap", "Ma-T007", "Ma-T100", "Ma-T200"]]
+
+        try:
+            list(TableSource(universe, columns=["T999"]))
+            assert False, "Expected KeyError for a missing column"
+        except KeyError as e:
+            assert "'T999'" in str(e)
+        try:
+            list(TableSource(universe, rows=["Market Cap", "EV/EBIDTA"]))
+            assert False, "Expected KeyError for a missing row"
+        except KeyError as e:
+            assert "'EV/EBIDTA'" in str(e)
+    print("PASS: Income and peer slides read only the needed CSV columns and rows")
+
+
+def test_parquet_source():
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "balance.parquet")
+        pq.write_table(pa.table({"Metric": ["Cash", "Debt"], "FY2025": [5.0, 2.0],
+                                 "FY2024": [4.0, None], "Other": [0, 0]}), path)
+        rows = list(TableSource(path, ["FY2025", "FY2024"], format="${:.1f}B"))
+        assert rows == [["Cash", "$5.0B", "$4.0B"], ["Debt", "$2.0B", ""]]
+
+        arrow = os.path.join(tmp, "balance.arrow")
+        table = pq.read_table(path)
+        with pa.ipc.new_file(arrow, table.schema) as writer:
+            writer.write_table(table)
+        assert list(TableSource(arrow, ["FY2025"], rows=["Debt"], format="${:.1f}B")) == [["Debt", "$2.0B"]]
+        assert TableSource(arrow, ["FY2026"]).missing_columns() == ["FY2026"]
+    print("PASS: Parquet and Arrow sources projected to the requested columns")
+
+
+if __name__ == "__main__":
+    test_csv_sources()
+    test_parquet_source()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test the vectorized peer comps engine and its deck keys."""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from templates import stock_analysis_slides as t
+from templates.comps import Universe, comps, comps_inputs, load_universe
+from templates.deck_schema import validate
+from templates.sample_data import generate_deck_data, generate_universe, write_universe
+
+
+def small_universe():
+    """A target, four software peers of different likeness, a giant and a bank."""
+    rows = [
+        # ticker, sector,    price, mcap,  eps,  ebitda, net_debt, book, revenue, growth
+        ("TGT", "Software", 50.0, 10e9, 2.0, 1.0e9, 1.0e9, 4e9, 4.0e9, 0.10),
+        ("NEAR", "Software", 40.0, 12e9, 2.0, 1.2e9, 0.0, 6e9, 4.8e9, 0.11),
+        ("CLOSE", "Software", 30.0, 8e9, 1.5, 0.8e9, 0.5e9, 2e9, 3.2e9, 0.09),
+        ("FAR", "Software", 20.0, 9e9, 0.5, 0.3e9, 0.0, 3e9, 5.0e9, -0.05),
+        ("LOSS", "Software", 10.0, 11e9, -1.0, 0.5e9, 0.0, 5e9, 4.0e9, 0.10),
+        ("GIANT", "Software", 100.0, 900e9, 4.0, 40e9, 0.0, 100e9, 150e9, 0.10),
+        ("BANK", "Financials", 50.0, 10e9, 2.0, 1.0e9, 1.0e9, 4e9, 4.0e9, 0.10),
+    ]
+    names = ("ticker", "sector", "price", "market_cap", "eps", "ebitda", "net_debt",
+             "book_value", "revenue", "revenue_growth")
+    return Universe.from_columns(dict(zip(names, zip(*rows))))
+
+
+def test_peers_and_implied_values():
+    u = small_universe()
+    peers = u.tickers[u.peers("TGT", peers=3)].tolist()
+    assert peers == ["NEAR", "CLOSE", "LOSS"]  # same sector and size band, nearest first
+    assert "GIANT" in u.tickers[u.peers("TGT", peers=5)].tolist()  # band widened to the sector
+    assert u.peers("BANK").tolist() == []
+
+    r = comps(u, "TGT", peers=3)
+    # P/E: NEAR 20x, CLOSE 20x, LOSS negative (excluded); EV/EBITDA 10x, 10.625x, 22x; P/B 2x, 4x, 2.2x
+    assert np.isclose(r["medians"]["P/E"], 20.0)
+    assert np.isclose(r["medians"]["EV/EBITDA"], 10.625)
+    assert np.isclose(r["medians"]["P/B"], 2.2)
+    shares = 10e9 / 50.0
+    assert np.isclose(r["implied"]["P/E"], 40.0)
+    assert np.isclose(r["implied"]["EV/EBITDA"], (10.625 * 1e9 - 1e9) / shares)
+    assert np.isclose(r["implied"]["P/B"], 2.2 * 4e9 / shares)
+    assert np.isclose(r["fair_value"], np.mean(list(r["implied"].values())))
+    assert np.isnan(comps(u, "BANK")["fair_value"])
+
+    inputs = comps_inputs(r, u, price=50.0, weight="40%")
+    assert inputs["peers"] == peers
+    assert inputs["peer_rows"][0] == ["Market Cap", "$10.0B", "$12.0B", "$8.0B", "$11.0B"]
+    assert inputs["peer_rows"][1] == ["P/E", "25.0x", "20.0x", "20.0x", "—"]
+    assert inputs["comps_row"] == ["Comps", f"${r['fair_value']:.2f}",
+                                   f"{(r['fair_value'] / 50 - 1) * 100:+.0f}%", "40%"]
+    print("PASS: Peers picked by sector, size band and distance; medians applied per multiple")
+
+
+def test_deck_from_comps_block():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "universe.csv")
+        with open(path, "w", newline="") as f:
+            write_universe(generate_universe(500, seed=2), f)
+        d = generate_deck_data("small", "AAA")
+        del d["peers"], d["peer_rows"]
+        d["valuation_rows"][1] = ["Comps", "$1.00", "-99%", "50%"]
+        d["comps"] = {"universe": path, "ticker": "C00007", "peers": 3, "weight": "30%"}
+        assert validate(d) == []
+        assert validate(dict(d, comps={})) == ["$.comps.universe: required key missing"]
+        assert validate(dict(d, comps={"universe": "x.csv", "n_peers": 4, "band": 1})) == [
+            "$.comps.universe: no such file 'x.csv'",
+            "$.comps.n_peers: unknown key; expected one of universe, peers, band, weight, ticker",
+            "$.comps.band: must be greater than 1, got 1",
+        ]
+        try:
+            t.expand_deck_data(dict(d, comps={"universe": path, "n_peers": 4}))
+            assert False, "unknown comps key accepted"
+        except ValueError as e:
+            assert "n_peers" in str(e)
+        filled = t.expand_deck_data(d)
+        assert len(filled["peers"]) == 3
+        assert [len(row) for row in filled["peer_rows"]] == [5] * 6
+        assert [row[0] for row in filled["valuation_rows"]] == ["DCF", "Comps", "Weighted Avg"]
+        assert filled["valuation_rows"][1][1] != "$1.00" and filled["valuation_rows"][1][3] == "30%"
+        assert validate(filled) == []
+        assert len(t.build_deck(d).prs.slides) == 11
+
+        npz = os.path.join(tmp, "universe.npz")
+        load_universe(path).save(npz)
+        assert load_universe(npz).tickers.tolist() == load_universe(path).tickers.tolist()
+    print("PASS: Deck peers, peer table and Comps row filled from a universe file")
+
+
+def test_milliseconds_per_ticker():
+    u = Universe.from_columns(generate_universe(5000, seed=1))
+    tickers = u.tickers[:500].tolist()
+    start = time.perf_counter()
+    for ticker in tickers:
+        r = comps(u, ticker)
+        comps_inputs(r, u)
+        assert len(r["peers"]) == 4 and ticker not in r["peers"]
+        assert {u.sector(p) for p in r["peers"]} == {u.sector(ticker)}
+    per_ticker = (time.perf_counter() - start) / len(tickers)
+    assert per_ticker < 0.01, per_ticker
+    print(f"PASS: Comps over 5,000 companies in {per_ticker * 1000:.2f} ms per ticker")
+
+
+if __name__ == "__main__":
+    test_peers_and_implied_values()
+    test_deck_from_comps_block()
+    test_milliseconds_per_ticker()
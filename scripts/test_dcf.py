@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Test the vectorized DCF engine against a loop implementation."""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from templates import dcf
+from templates import stock_analysis_slides as t
+from templates.sample_data import generate_deck_data
+
+
+def dcf_loop(fcf, wacc, growth, terminal_growth, net_debt, shares, years=5):
+    """Step-by-step DCF as written in skills/valuation.md."""
+    pv = 0.0
+    cash = fcf
+    for year in range(1, years + 1):
+        cash *= 1 + growth
+        pv += cash / (1 + wacc) ** year
+    terminal = cash * (1 + terminal_growth) / (wacc - terminal_growth)
+    pv += terminal / (1 + wacc) ** years
+    return (pv - net_debt) / shares
+
+
+def test_matches_loop():
+    growths = [0.0, 0.05, 0.10]
+    waccs = [0.05, 0.08, 0.12]
+    tgs = [0.02, 0.03]
+    cube = dcf.dcf_fair_values(2.5e9, waccs, growths, tgs, 1.0e9, 170e6, grid=True)
+    assert cube.shape == (3, 3, 2)
+    for i, g in enumerate(growths):
+        for j, w in enumerate(waccs):
+            for k, tg in enumerate(tgs):
+                expected = dcf_loop(2.5e9, w, g, tg, 1.0e9, 170e6)
+                assert np.isclose(cube[i, j, k], expected), (g, w, tg)
+    assert np.isnan(dcf.dcf_fair_values(1e9, 0.02, 0.05, 0.03, 0, 1e6))
+    print("PASS: Vectorized DCF matches the step-by-step loop")
+
+
+def test_deck_from_dcf_block():
+    d = generate_deck_data("small", "AAA")
+    for key in ("sensitivity_scenarios", "sensitivity_waccs", "sensitivity_matrix"):
+        del d[key]
+    d["dcf"] = {"fcf": [2.0e9, 2.5e9, 3.0e9], "waccs": [0.08, 0.10, 0.12],
+                "growth": 0.05, "terminal_growth": 0.025, "net_debt": 1.0e9, "shares": 170e6}
+    filled = dcf.apply_dcf(d)
+    assert filled["sensitivity_waccs"] == ["WACC 8%", "WACC 10%", "WACC 12%"]
+    assert len(filled["sensitivity_matrix"]) == 3 and filled["sensitivity_matrix"][0][0].startswith("$")
+    assert len(t.build_deck(d).prs.slides) == 11
+    print("PASS: Deck sensitivity slide built from a dcf block")
+
+
+if __name__ == "__main__":
+    test_matches_loop()
+    test_deck_from_dcf_block()
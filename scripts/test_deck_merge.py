@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test zip-level merging of decks into a sector book."""
+
+import sys
+import os
+import tempfile
+import zipfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+from pptx import Presentation
+
+from templates.deck_merge import P14_NS, merge_decks
+from templates.stock_analysis_slides import build_deck
+from templates.sample_data import generate_deck_data
+
+
+def slide_texts(slide):
+    return [shape.text_frame.text for shape in slide.shapes
+            if shape.has_text_frame and shape.text_frame.text]
+
+
+def build_sources(tmp, tickers):
+    paths = []
+    for ticker in tickers:
+        d = generate_deck_data("small", ticker)
+        if ticker == "BBB":
+            d["income_chart"] = {"series": {"Revenue ($B)": [10.0, 9.0, 8.0]}}
+        path = os.path.join(tmp, f"2026-02-17-{ticker.lower()}-analysis.pptx")
+        build_deck(d).prs.save(path)
+        paths.append(path)
+    return paths
+
+
+def test_sector_book():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_sources(tmp, ["AAA", "BBB", "AAA"])
+        counts = [len(Presentation(p).slides) for p in paths]
+        title_texts = slide_texts(Presentation(paths[0]).slides[0])
+        book = os.path.join(tmp, "book.pptx")
+        stats = merge_decks(paths, book, title="Test Sector")
+        prs = Presentation(book)
+        with zipfile.ZipFile(book) as z:
+            names = z.namelist()
+            pres = etree.fromstring(z.read("ppt/presentation.xml"))
+
+    # Contents, then a divider and the deck for each source
+    assert stats["decks"] == 3 and stats["masters"] == 1
+    assert len(prs.slides) == 1 + sum(counts) + 3 == stats["slides"]
+    contents = prs.slides[0]
+    assert "Test Sector" in slide_texts(contents)
+    table = [s for s in contents.shapes if s.has_table][0].table
+    assert [table.cell(r, 0).text for r in range(1, 4)] == ["AAA", "BBB", "AAA"]
+    assert [table.cell(r, 3).text for r in range(1, 4)] == ["2", str(3 + counts[0]), str(4 + sum(counts[:2]))]
+    assert slide_texts(prs.slides[1])[:2] == ["AAA", "Investment Analysis: Aaa Holdings Inc. (AAA)"]
+    assert slide_texts(prs.slides[2]) == title_texts
+
+    # One master and layout set, unique part names, the chart and its workbook intact
+    assert len(prs.slide_masters) == 1 and len(prs.slide_layouts) == 11
+    assert len(names) == len(set(names))
+    charts = [s for slide in prs.slides for s in slide.shapes if s.has_chart]
+    assert len(charts) == 1 and list(charts[0].chart.plots[0].categories) == ["FY2023", "FY2024", "FY2025"]
+    assert charts[0].chart.part.chart_workbook.xlsx_part is not None
+
+    sections = pres.findall(f".//{{{P14_NS}}}section")
+    assert [s.get("name") for s in sections] == ["Contents", "AAA", "BBB", "AAA"]
+    assert len(sections[2].findall(f".//{{{P14_NS}}}sldId")) == 1 + counts[1]
+    print("PASS: Decks merged into one book with contents, dividers and sections")
+
+
+def test_foreign_master():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_sources(tmp, ["AAA"])
+        other = Presentation()
+        other.slide_master.element.cSld.set("name", "Other")
+        slide = other.slides.add_slide(other.slide_layouts[1])
+        slide.shapes.title.text = "Foreign"
+        paths.append(os.path.join(tmp, "foreign.pptx"))
+        other.save(paths[-1])
+        book = os.path.join(tmp, "book.pptx")
+        stats = merge_decks(paths, book, toc=False, dividers=False)
+        prs = Presentation(book)
+
+    assert stats["masters"] == 2
+    assert [len(m.slide_layouts) for m in prs.slide_masters] == [11, 11]
+    last = prs.slides[len(prs.slides) - 1]
+    assert last.slide_layout.slide_master.element.cSld.get("name") == "Other"
+    assert last.slide_layout.name == "Title and Content" and slide_texts(last) == ["Foreign"]
+    ids = [int(e.get("id")) for m in prs.slide_masters for e in m.element.iter()
+           if e.tag.endswith("}sldLayoutId")]
+    ids += [int(e.get("id")) for e in prs.part._element.iter() if e.tag.endswith("}sldMasterId")]
+    assert len(ids) == len(set(ids))
+    print("PASS: A deck with a different master brings its own master and layouts")
+
+
+if __name__ == "__main__":
+    test_sector_book()
+    test_foreign_master()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Test deck data validation and the batch pre-flight check."""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.deck_schema import validate
+from templates.sample_data import generate_deck_data
+from templates.stock_analysis_batch import validate_jobs
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_errors_have_paths():
+    for size in ("small", "typical", "extreme"):
+        assert validate(generate_deck_data(size)) == []
+    assert validate(generate_deck_data("small", "AAA")) == []
+
+    d = generate_deck_data("small", "AAA")
+    d["income_rows"].append(["Net Income", "$2.0B"])
+    d["peer_rows"][0][2] = None
+    d["price"] = 0
+    d["target"] = "130"
+    del d["catalysts"]
+    del d["sensitivity_matrix"]
+    assert validate(d) == [
+        "$.price: must be greater than 0, got 0",
+        "$.target: expected number, got str",
+        "$.income_rows[3]: expected 4 cells (Line Item + income_years), got 2",
+        "$.peer_rows[0][2]: expected string or number, got null",
+        "$.sensitivity_matrix: required key missing",
+        "$.catalysts: required key missing",
+    ], validate(d)
+
+    # A dcf block stands in for the sensitivity keys
+    d = generate_deck_data("small", "AAA")
+    for key in ("sensitivity_scenarios", "sensitivity_waccs", "sensitivity_matrix"):
+        del d[key]
+    dcf = {"fcf": [2.0e9, 2.5e9], "waccs": [0.08, 0.10], "shares": 170e6}
+    assert validate(d) and validate(dict(d, dcf=dcf)) == []
+    assert validate(dict(d, dcf={})) == [
+        "$.dcf.fcf: required key missing",
+        "$.dcf.waccs: required key missing",
+        "$.dcf.shares: required key missing",
+    ]
+    assert validate(dict(d, dcf=dict(dcf, wacc=0.1, shares="170M", scenario_labels=["Base"]))) == [
+        "$.dcf.shares: expected number, got str",
+        "$.dcf.wacc: unknown key; expected one of fcf, waccs, shares, scenario_labels, "
+        "growth, terminal_growth, net_debt, years",
+        "$.dcf.scenario_labels: expected 2 entries (fcf), got 1",
+    ]
+    monte_carlo = {"revenue": 12e9, "shares": 170e6, "growth": 0.06, "wacc": 0.09,
+                   "margin": {"dist": "triangular", "low": 0.1, "mode": 0.2, "hgih": 0.3},
+                   "paths": 1.5e5}
+    assert validate(dict(generate_deck_data("small", "AAA"), monte_carlo=monte_carlo)) == [
+        "$.monte_carlo.margin: triangular needs number 'high'",
+        "$.monte_carlo.paths: expected positive integer, got 150000.0",
+    ]
+    assert validate([]) == ["$: expected object, got list"]
+    print("PASS: Validation reports every error with its JSON path")
+
+
+def test_validate_before_render():
+    with tempfile.TemporaryDirectory() as tmp:
+        good, bad = os.path.join(tmp, "good.json"), os.path.join(tmp, "bad.json")
+        with open(good, "w") as f:
+            json.dump(generate_deck_data("small", "AAA"), f)
+        with open(bad, "w") as f:
+            json.dump(dict(generate_deck_data("small", "BBB"), income_years=[]), f)
+
+        valid, failures = validate_jobs([(good, good, None, None), (bad, bad, None, None)])
+        assert [job[0] for job in valid] == [good] and valid[0][2]["ticker"] == "AAA"
+        assert failures[0][0] == bad and "$.income_years: must not be empty" in failures[0][3]
+
+        cli = [sys.executable, os.path.join(PROJECT_ROOT, "templates", "stock_analysis_slides.py"),
+               "--validate-only", "--data"]
+        assert subprocess.run(cli + [good], capture_output=True).returncode == 0
+        result = subprocess.run(cli + [bad], capture_output=True, text=True)
+        assert result.returncode == 1 and "$.income_years" in result.stderr
+        assert sorted(os.listdir(tmp)) == ["bad.json", "good.json"]
+    print("PASS: Invalid decks are rejected before rendering")
+
+
+if __name__ == "__main__":
+    test_errors_have_paths()
+    test_validate_before_render()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Test canonical slide hashing and check fixture decks against the golden hashes."""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import deck_snapshots as ds
+
+SLIDE = ('<p:sld xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+         'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+         'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+         '<p:cSld><p:spTree><p:sp><p:nvSpPr><p:cNvPr id="{id}" name="TextBox {id}"/></p:nvSpPr>'
+         '<p:txBody><a:p><a:r><a:rPr {attrs}/><a:t>{text}</a:t></a:r></a:p></p:txBody></p:sp>'
+         '<p:graphicFrame><a:graphic><a:graphicData><c:chart xmlns:c="urn:c" r:id="{rid}"/>'
+         '</a:graphicData></a:graphic></p:graphicFrame></p:spTree></p:cSld></p:sld>')
+
+
+def test_canonical_form():
+    def canonical(id_=2, rid="rId2", text="Revenue", attrs='lang="en-US" sz="1800"'):
+        xml = SLIDE.format(id=id_, rid=rid, text=text, attrs=attrs).encode()
+        return ds.canonical_xml(xml, {rid: "chart-digest"})
+
+    base = canonical()
+    assert canonical(id_=7, rid="rId9") == base
+    assert canonical(attrs='sz="1800" lang="en-US"') == base
+    assert canonical(text="Net Income") != base
+    assert canonical(attrs='lang="en-US" sz="2000"') != base
+    assert b'r:id="chart-digest"' in base and b"TextBox" in base and b"TextBox 2" not in base
+    print("PASS: Shape ids, relationship ids and attribute order do not change the canonical form")
+
+
+def test_saved_deck_matches_memory():
+    prs, keys = ds.deck_slides(ds.fixture_data("small-01"))
+    expected = [ds.snapshot("small-01")[key] for key, _ in keys]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "deck.pptx")
+        prs.save(path)
+        saved = list(ds.file_snapshot(path).values())
+    assert saved == expected
+    assert any(key == "build_income_chart" for key, _ in keys)
+    print("PASS: Saved decks hash the same as in-memory decks, charts included")
+
+
+def test_golden_fixtures():
+    with open(ds.GOLDEN_PATH) as f:
+        golden = json.load(f)
+    assert set(golden) == set(ds.fixture_names())
+    for name in ("small-00", "small-01", "typical-01", "extreme-01"):
+        lines = ds.compare(golden[name], ds.snapshot(name))
+        assert not lines, f"{name} changed:\n" + "\n".join(lines)
+    print("PASS: Fixture decks match the golden slide hashes")
+
+
+if __name__ == "__main__":
+    test_canonical_form()
+    test_saved_deck_matches_memory()
+    test_golden_fixtures()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test compiling declarative deck specs into build plans."""
+
+import sys
+import os
+import copy
+import io
+import pickle
+import tempfile
+import zipfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from templates import deck_spec
+from templates.deck_spec import compile_spec, load_plan
+from create_ttwo_deck import SPEC_PATH, TTWO
+
+
+def deck_parts(deck):
+    """{part name: bytes} of a saved deck; zip timestamps are left out, as two saves may differ."""
+    buf = io.BytesIO()
+    deck.save(buf)
+    with zipfile.ZipFile(buf) as z:
+        return {name: z.read(name) for name in z.namelist()}
+
+
+def slide_titles(prs):
+    return [next((s.text_frame.text for s in slide.shapes if s.has_text_frame and s.text_frame.text), "")
+            for slide in prs.slides]
+
+
+def test_ttwo_from_spec():
+    plan = load_plan(SPEC_PATH, cache_dir=None)
+    prs = plan.build(TTWO).prs
+    assert len(prs.slides) == 11
+    titles = slide_titles(prs)
+    assert titles[3] == "Income Statement (FY2023–FY2025)" and titles[5] == "Competitive Position"
+    peers = [s for s in prs.slides[5].shapes if s.has_table][0].table
+    assert [c.text for c in peers.rows[0].cells] == ["Metric", "TTWO", "EA", "NTES", "UBSFY"]
+    assert "RECOMMENDATION: BUY" in [s.text_frame.text for s in prs.slides[10].shapes if s.has_text_frame]
+
+    # The same plan serves other payloads: a long income statement paginates, a missing note is skipped
+    other = copy.deepcopy(TTWO)
+    other.update(ticker="EA", income_title="Income Statement", income_note=None,
+                 income_rows=[[f"Line {i}", "$1.0B", "$1.0B", "$1.0B"] for i in range(40)])
+    prs = plan.build(other).prs
+    titles = slide_titles(prs)
+    pages = titles.index("Balance Sheet & Cash Flow") - 3
+    assert pages > 1 and titles[3:3 + pages] == ["Income Statement"] + ["Income Statement (cont.)"] * (pages - 1)
+    texts = [s.text_frame.text for slide in prs.slides for s in slide.shapes if s.has_text_frame]
+    assert not any(text.startswith("Note: Net losses") for text in texts)
+
+    # A pickled plan builds the same parts
+    assert deck_parts(pickle.loads(pickle.dumps(plan)).build(TTWO)) == deck_parts(plan.build(TTWO))
+    print("PASS: TTWO deck built from the analysis-deck spec, plan reused for another payload")
+
+
+def test_spec_errors():
+    spec = {"slides": [{"background": "NAVY", "components": [
+        {"type": "text", "box": [1, 2, 3], "text": "x"},
+        {"type": "sparkline", "box": [0, 0, 1, 1]},
+        {"type": "text", "box": [0, 0, 1, 1], "align": "justify"}]}]}
+    try:
+        compile_spec(spec)
+        assert False, "Expected ValueError"
+    except ValueError as e:
+        assert str(e).splitlines()[1:] == [
+            "  slides[0].components[0].box: expected [left, top, width, height] in inches",
+            "  slides[0].components[1].type: unknown component type 'sparkline'",
+            "  slides[0].components[2].align: expected one of left, center, right, got 'justify'",
+            "  slides[0].background: unknown colour 'NAVY'"]
+    print("PASS: Spec errors are reported together with their paths")
+
+
+def test_missing_format_fields():
+    plan = compile_spec({"slides": [
+        {"when": "{income_years[9]}", "components": []},
+        {"title": "About {company} ({exchange})", "components": [
+            {"type": "text", "box": [0, 0, 1, 1], "text": "Listed on {exchange}"},
+            {"type": "text", "box": [0, 1, 1, 1], "text": "{company}", "when": "{exchange}"}]}]})
+    prs = plan.build({"company": "Take-Two", "income_years": ["FY2025"]}).prs
+    assert len(prs.slides) == 1
+    assert [s.text_frame.text for s in prs.slides[0].shapes if s.has_text_frame] == [""]
+    print("PASS: Missing format fields resolve to None like missing paths")
+
+
+def test_plan_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        deck_spec._plans.clear()
+        first = load_plan(SPEC_PATH, cache_dir=tmp)
+        assert load_plan(SPEC_PATH, cache_dir=tmp) is first
+        cached = os.listdir(tmp)
+        assert len(cached) == 1 and cached[0].endswith(".pickle")
+
+        deck_spec._plans.clear()  # a new process: the plan comes from disk
+        second = load_plan(SPEC_PATH, cache_dir=tmp)
+        assert second is not first and second.slides == first.slides
+
+        path = os.path.join(tmp, cached[0])
+        with open(path, "r+b") as f:
+            f.truncate(100)
+        deck_spec._plans.clear()  # a truncated plan is recompiled and rewritten
+        assert load_plan(SPEC_PATH, cache_dir=tmp).slides == first.slides
+        deck_spec._plans.clear()
+        with open(path, "rb") as f:
+            assert pickle.load(f).slides == first.slides
+        deck_spec._plans.clear()
+    print("PASS: Compiled plans are reused in memory and across runs")
+
+
+if __name__ == "__main__":
+    test_ttwo_from_spec()
+    test_spec_errors()
+    test_missing_format_fields()
+    test_plan_cache()
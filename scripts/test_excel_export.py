@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Test the streaming Excel export of deck data."""
+
+import sys
+import os
+import csv
+import re
+import tempfile
+import zipfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+
+from templates import excel_export
+from templates.excel_export import export_workbook, parse_cell
+from templates.sample_data import generate_deck_data
+
+NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def read_sheets(path):
+    """{sheet name: {cell ref: (value text, formula or None)}}; sheets are numbered in creation order."""
+    with zipfile.ZipFile(path) as z:
+        names = [s.get("name") for s in etree.fromstring(z.read("xl/workbook.xml")).iterfind(".//x:sheet", NS)]
+        sheets = {}
+        for i, name in enumerate(names, 1):
+            root = etree.fromstring(z.read(f"xl/worksheets/sheet{i}.xml"))
+            sheets[name] = {c.get("r"): ("".join(t.text or "" for t in c.iterfind(".//x:t", NS))
+                                         or c.findtext("x:v", None, NS),
+                                         c.findtext("x:f", None, NS))
+                            for c in root.iterfind(".//x:c", NS)}
+    return sheets
+
+
+def test_parse_cell():
+    assert parse_cell("$391.0B") == (391e9, '"$"#,##0.0,,,"B";("$"#,##0.0,,,"B")')
+    assert parse_cell("($451M)") == (-451e6, '"$"#,##0,,"M";("$"#,##0,,"M")')
+    assert parse_cell("-$1.2B") == (-1.2e9, '"$"#,##0.0,,,"B"')
+    assert parse_cell("28.5x") == (28.5, '#,##0.0"x"')
+    assert parse_cell("+12%") == (0.12, "+0%;-0%;+0%")
+    assert parse_cell("$1,234.50") == (1234.5, '"$"#,##0.00;("$"#,##0.00)')
+    assert parse_cell("($5") == ("($5", None)
+    assert parse_cell("—") == (None, None)
+    assert parse_cell("Buy") == ("Buy", None)
+    print("PASS: Display strings parse to numbers with matching formats")
+
+
+def test_batch_export():
+    with tempfile.TemporaryDirectory() as tmp:
+        income = os.path.join(tmp, "income.csv")
+        with open(income, "w", newline="") as f:
+            csv.writer(f).writerows([["Line Item", "FY2025", "FY2024"], ["Revenue", "$10.0B", "$8.0B"]])
+        a, b = generate_deck_data("small", "AAA"), generate_deck_data("small", "BBB")
+        b["income_years"], b["income_rows"] = ["FY2025", "FY2024"], {"source": income}
+        path = os.path.join(tmp, "coverage.xlsx")
+        counts = export_workbook(iter([a, b]), path)
+        assert counts["Summary"] == 2 and counts["Income"] == 11
+        sheets = read_sheets(path)
+
+        summary = sheets["Summary"]
+        assert summary["A3"][0] == "BBB" and float(summary["E3"][0]) == b["price"]
+        assert summary["G3"][1] == "F3/E3-1"
+        assert abs(float(summary["G3"][0]) - (b["target"] / b["price"] - 1)) < 1e-9
+
+        income_sheet = sheets["Income"]
+        assert [income_sheet[f"{c}11"][0] for c in "ABC"] == ["BBB", "Revenue", "FY2025"]
+        assert float(income_sheet["D11"][0]) == 10e9
+        assert income_sheet["E11"] == ("0.25", 'IFERROR(D11/D12-1,"")')
+        assert "E12" not in income_sheet  # the oldest year has no YoY
+
+        upside = sheets["Valuation"]["D2"]
+        assert re.fullmatch(r"C2/'Summary'!\$E\$2-1", upside[1])
+    print("PASS: Two tickers exported to long-format sheets with numbers and formulas")
+
+
+def test_sheet_rollover():
+    limit = excel_export.MAX_ROWS
+    excel_export.MAX_ROWS = 6
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "small.xlsx")
+            d = generate_deck_data("small", "AAA")
+            d["income_years"] = ["FY2025", "FY2024"]
+            d["income_rows"] = [["Revenue", "$10.0B", "$9.0B"], ["Net Income", "$2.0B", "$1.8B"],
+                                ["EPS", "$6.00", "$5.50"]]
+            export_workbook([d], path)
+            sheets = read_sheets(path)
+    finally:
+        excel_export.MAX_ROWS = limit
+    # Two line items (4 rows) fit under the header; the third starts a new sheet
+    assert sheets["Income"]["B5"][0] == "Net Income" and "A6" not in sheets["Income"]
+    assert sheets["Income (2)"]["B2"][0] == "EPS"
+    assert sheets["Income (2)"]["E2"][1] == 'IFERROR(D2/D3-1,"")'
+    print("PASS: Full sheets continue on a numbered sheet without splitting a line item")
+
+
+if __name__ == "__main__":
+    test_parse_cell()
+    test_batch_export()
+    test_sheet_rollover()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Test the on-disk market data cache: TTLs, LRU eviction, coalescing and backends."""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import market_data
+from templates.market_data import (DAY, FixtureBackend, HttpBackend, MarketData,
+                                   make_server)
+
+
+class CountingBackend:
+    """Synthetic responses; counts calls and can be slowed down or made to fail."""
+
+    def __init__(self, delay=0):
+        self.calls = 0
+        self.delay = delay
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def fetch(self, endpoint, ticker, params):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("backend down")
+        return {"endpoint": endpoint, "ticker": ticker, "params": params, "rows": list(range(50))}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_per_data_class():
+    backend, clock = CountingBackend(), Clock()
+    with tempfile.TemporaryDirectory() as tmp:
+        md = MarketData(backend, tmp, clock=clock)
+        info = md.get("get_stock_info", "aapl")
+        info["rows"].clear()  # callers get their own copy
+        assert md.get("get_stock_info", "AAPL")["rows"] == list(range(50))
+        md.get("get_financial_statement", "AAPL", period="annual", statement="income")
+        md.get("get_financial_statement", "AAPL", period="quarterly", statement="income")
+        md.get("edgar_filing", "AAPL", accession="0000320193-25-000079")
+        assert backend.calls == 4 and md.hits == 1
+
+        clock.now += 2 * DAY
+        md.get("get_stock_info", "AAPL")
+        md.get("get_financial_statement", "AAPL", period="annual", statement="income")
+        assert backend.calls == 5, "Only the quote should have expired"
+
+        clock.now += 365 * DAY
+        reopened = MarketData(backend, tmp, clock=clock)
+        reopened.get("edgar_filing", "AAPL", accession="0000320193-25-000079")
+        assert backend.calls == 5 and reopened.hits == 1, "Filings never expire"
+        assert reopened.prune() == 3
+        assert len(os.listdir(os.path.join(tmp, "locks"))) == 1
+    print("PASS: Entries expire by data class and survive across instances")
+
+
+def test_coalescing():
+    backend = CountingBackend(delay=0.2)
+    with tempfile.TemporaryDirectory() as tmp:
+        md = MarketData(backend, tmp)
+        results = md.get_many("get_stock_info", ["MSFT"] * 8 + ["GOOGL"] * 4)
+        assert set(results) == {"MSFT", "GOOGL"}
+        assert backend.calls == 2, backend.calls
+        stats = md.stats()
+        assert (stats["misses"], stats["coalesced"], stats["requests"]) == (2, 10, 12), stats
+    print("PASS: Concurrent identical requests share one backend call")
+
+
+def test_lru_and_stale():
+    backend, clock = CountingBackend(), Clock()
+    with tempfile.TemporaryDirectory() as tmp:
+        md = MarketData(backend, tmp, max_bytes=4000, clock=clock)
+        for i in range(40):
+            md.get("get_stock_info", f"T{i:02d}")
+        size = sum(e.stat().st_size for e in os.scandir(tmp) if e.is_file())
+        assert 0 < size <= 4000 and md.evictions > 0, (size, md.evictions)
+        entries = {e.name[:-5] for e in os.scandir(tmp) if e.name.endswith(".json")}
+        assert set(os.listdir(os.path.join(tmp, "locks"))) == entries  # evicted entries lose their lock
+
+        clock.now += DAY
+        backend.fail = True
+        assert md.get("get_stock_info", "T39")["ticker"] == "T39"
+        assert md.stale == 1
+        try:
+            md.get("get_stock_info", "T00")
+            raise AssertionError("Evicted entry should not be served")
+        except ConnectionError:
+            pass
+        assert md.clear() == len(entries)
+        assert os.listdir(tmp) == ["locks"] and os.listdir(os.path.join(tmp, "locks")) == []
+    print("PASS: Cache stays within its size limit and serves stale data on backend errors")
+
+
+def test_size_counts_replaced_entries():
+    backend, clock = CountingBackend(), Clock()
+    with tempfile.TemporaryDirectory() as tmp:
+        md = MarketData(backend, tmp, clock=clock)
+        md.get("get_stock_info", "AAPL")
+        for _ in range(10):
+            md.get("get_stock_info", "AAPL", refresh=True)
+        clock.now += DAY
+        md.get("get_stock_info", "AAPL")
+        md.get("get_stock_info", "MSFT")
+        size = sum(e.stat().st_size for e in os.scandir(tmp) if e.is_file())
+        assert md.stats()["bytes"] == size, (md.stats()["bytes"], size)
+        clock.now += DAY
+        assert md.prune() == 2 and md.stats()["bytes"] == 0
+    print("PASS: Refreshed and re-fetched entries are counted once, in bytes")
+
+
+def test_entry_evicted_while_read():
+    backend = CountingBackend()
+    with tempfile.TemporaryDirectory() as tmp:
+        MarketData(backend, tmp).get("get_stock_info", "AAPL")
+        md = MarketData(backend, tmp)
+
+        def evicted(path):
+            os.remove(path)
+            raise FileNotFoundError(path)
+
+        market_data.os.utime, utime = evicted, os.utime
+        try:
+            assert md.get("get_stock_info", "AAPL")["ticker"] == "AAPL"
+        finally:
+            market_data.os.utime = utime
+        assert backend.calls == 2 and md.misses == 1 and md.hits == 0
+    print("PASS: An entry evicted between read and touch counts as a miss")
+
+
+def test_fixtures_over_http():
+    live = CountingBackend()
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = os.path.join(tmp, "fixtures")
+        recorder = FixtureBackend(fixtures, record_from=live)
+        expected = recorder.fetch("get_financial_statement", "AAPL", {"period": "annual"})
+        assert os.path.exists(os.path.join(fixtures, "get_financial_statement", "AAPL-annual.json"))
+
+        server = make_server(FixtureBackend(fixtures), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            md = MarketData(HttpBackend(f"http://127.0.0.1:{server.server_address[1]}"),
+                            os.path.join(tmp, "cache"))
+            assert md.get("get_financial_statement", "aapl", period="annual") == expected
+            try:
+                md.get("get_financial_statement", "MSFT", period="annual")
+                raise AssertionError("Missing fixture should raise")
+            except LookupError:
+                pass
+        finally:
+            server.shutdown()
+            server.server_close()
+    assert live.calls == 1
+    print("PASS: Recorded fixtures served through the stand-in server")
+
+
+if __name__ == "__main__":
+    test_ttl_per_data_class()
+    test_coalescing()
+    test_lru_and_stale()
+    test_size_counts_replaced_entries()
+    test_entry_evicted_while_read()
+    test_fixtures_over_http()
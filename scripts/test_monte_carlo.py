@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test the chunked Monte Carlo valuation engine and its deck slide."""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from templates import monte_carlo as mc
+from templates import stock_analysis_slides as t
+from templates.dcf import dcf_fair_values
+from templates.sample_data import generate_deck_data
+
+MODEL = {"revenue": 12e9, "price": 150.0, "shares": 170e6, "net_debt": 1.0e9,
+         "growth": {"dist": "normal", "mean": 0.06, "sd": 0.03},
+         "margin": {"dist": "triangular", "low": 0.12, "mode": 0.18, "high": 0.24},
+         "wacc": {"dist": "uniform", "low": 0.08, "high": 0.11}}
+
+
+def test_percentiles_match_full_sample():
+    result = mc.simulate(paths=25_000, chunk=10_000, seed=7, **MODEL)
+    # Redraw every path in memory with the same child seeds
+    values = []
+    for seq, n in zip(np.random.SeedSequence(7).spawn(3), (10_000, 10_000, 5_000)):
+        rng = np.random.default_rng(seq)
+        margin = rng.triangular(0.12, 0.18, 0.24, n)
+        wacc = rng.uniform(0.08, 0.11, n)
+        growth = rng.normal(0.06, 0.03, n)
+        values.append(dcf_fair_values(12e9 * margin, wacc, growth, 0.025, 1.0e9, 170e6))
+    values = np.concatenate(values)
+
+    low, high = mc.HISTOGRAM_RANGE
+    bin_width = MODEL["price"] * (high - low) / mc.HISTOGRAM_BINS
+    for pct, value in result["percentiles"].items():
+        assert abs(value - np.percentile(values, pct)) < 2 * bin_width, pct
+    assert result["prob_upside"] == (values > MODEL["price"]).mean()
+    assert np.isclose(result["mean"], values.mean()) and np.isclose(result["std"], values.std())
+
+    parallel = mc.simulate(paths=25_000, chunk=10_000, seed=7, workers=2, **MODEL)
+    assert parallel["percentiles"] == result["percentiles"]
+    print("PASS: Streamed percentiles match the full sample, serial and parallel")
+
+
+def test_negative_fair_values():
+    # Debt above most paths' enterprise value: the low percentiles are negative
+    levered = dict(MODEL, net_debt=30e9)
+    result = mc.simulate(paths=20_000, seed=3, **levered)
+    rng = np.random.default_rng(np.random.SeedSequence(3).spawn(1)[0])
+    margin = rng.triangular(0.12, 0.18, 0.24, 20_000)
+    wacc = rng.uniform(0.08, 0.11, 20_000)
+    growth = rng.normal(0.06, 0.03, 20_000)
+    values = dcf_fair_values(12e9 * margin, wacc, growth, 0.025, 30e9, 170e6)
+    assert np.percentile(values, 5) < 0
+    low, high = mc.HISTOGRAM_RANGE
+    bin_width = MODEL["price"] * (high - low) / mc.HISTOGRAM_BINS
+    for pct, value in result["percentiles"].items():
+        assert abs(value - np.percentile(values, pct)) < 2 * bin_width, (pct, value)
+    bars = mc.distribution_inputs(result, MODEL["price"])["distribution_histogram"]
+    assert bars[0][0].startswith("($") and 0.9 < sum(share for _, share in bars) <= 1
+    print("PASS: Negative fair values are binned, not clamped to zero")
+
+
+def test_zero_width_distribution():
+    # Every path worth nothing: P5 == P95 == 0 leaves no range to scale by 20%
+    result = mc.simulate(paths=2_000, seed=1, **dict(MODEL, revenue=0.0, net_debt=0.0))
+    result["percentiles"] = {pct: 0.0 for pct in result["percentiles"]}
+    bars = mc.distribution_inputs(result, MODEL["price"])["distribution_histogram"]
+    assert len(bars) == 20 and 0.9 < sum(share for _, share in bars) <= 1
+    print("PASS: Degenerate percentile range still gets a histogram")
+
+
+def test_deck_from_monte_carlo_block():
+    d = generate_deck_data("small", "AAA")
+    d["monte_carlo"] = dict(MODEL, paths=20_000, weight="25%",
+                            terminal_growth={"dist": "uniform", "low": 0.02, "high": 0.03})
+    filled = mc.apply_monte_carlo(d)
+    assert [r[0] for r in filled["valuation_rows"][-3:]] == [
+        "Monte Carlo P10", "Monte Carlo Median", "Monte Carlo P90"]
+    assert filled["valuation_rows"][-2][3] == "25%"
+    assert len(filled["distribution_rows"]) == len(mc.PERCENTILES)
+    assert abs(sum(share for _, share in filled["distribution_histogram"]) - 1) < 0.05
+
+    prs = t.build_deck(d).prs
+    assert len(prs.slides) == 12
+    texts = [s.text_frame.text for s in prs.slides[7].shapes if s.has_text_frame]
+    assert "Valuation Distribution (Monte Carlo)" in texts
+    assert len(t.build_deck(generate_deck_data("small", "AAA")).prs.slides) == 11
+    print("PASS: Deck gains Monte Carlo rows and a distribution slide")
+
+
+if __name__ == "__main__":
+    test_percentiles_match_full_sample()
+    test_negative_fair_values()
+    test_zero_width_distribution()
+    test_deck_from_monte_carlo_block()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Test the render daemon over localhost HTTP."""
+
+import sys
+import os
+import io
+import json
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import render_server as rs
+from templates import stock_analysis_slides as t
+from templates.sample_data import generate_deck_data
+
+
+def test_render_server():
+    queue = rs.RenderQueue(workers=1, max_queue=0)
+    tmp = tempfile.TemporaryDirectory()
+    server = rs.make_server(queue, port=0, quiet=True, output_root=tmp.name)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base}/health") as r:
+            assert json.load(r)["status"] == "ok"
+
+        body = json.dumps(generate_deck_data("small", "AAA")).encode()
+        with urllib.request.urlopen(urllib.request.Request(f"{base}/render", data=body)) as r:
+            assert r.headers["Content-Type"] == rs.PPTX_CONTENT_TYPE
+            assert len(t.Presentation(io.BytesIO(r.read())).slides) == 11
+
+        try:
+            urllib.request.urlopen(urllib.request.Request(f"{base}/render", data=b"{bad"))
+            assert False, "Expected 400 for invalid JSON"
+        except urllib.error.HTTPError as e:
+            assert e.code == 400
+
+        bad = dict(generate_deck_data("small", "AAA"), price=0)
+        try:
+            urllib.request.urlopen(urllib.request.Request(f"{base}/render", data=json.dumps(bad).encode()))
+            assert False, "Expected 400 for invalid deck data"
+        except urllib.error.HTTPError as e:
+            assert e.code == 400 and json.load(e)["errors"] == ["$.price: must be greater than 0, got 0"]
+
+        request = urllib.request.Request(f"{base}/render?output=decks/AAA.pptx", data=body)
+        with urllib.request.urlopen(request) as r:
+            assert json.load(r)["output"] == os.path.join(os.path.realpath(tmp.name), "decks", "AAA.pptx")
+        for escape in ("../escape.pptx", "/tmp/escape.pptx", "decks/../../escape.pptx"):
+            try:
+                urllib.request.urlopen(urllib.request.Request(f"{base}/render?output={escape}", data=body))
+                assert False, f"Expected 400 for output={escape}"
+            except urllib.error.HTTPError as e:
+                assert e.code == 400
+        assert not os.path.exists(os.path.join(os.path.dirname(tmp.name), "escape.pptx"))
+
+        with urllib.request.urlopen(f"{base}/stats") as r:
+            stats = json.load(r)
+        assert stats["completed"] == 2 and stats["queue_depth"] == 0, stats
+        assert stats["latency_ms"]["p50"] is not None
+        print("PASS: Render daemon served a deck and reported stats")
+    finally:
+        server.shutdown()
+        server.server_close()
+        queue.shutdown()
+        tmp.cleanup()
+
+
+def test_queue_backpressure():
+    queue = rs.RenderQueue(workers=1, max_queue=0)
+    try:
+        queue._slots.acquire()  # simulate a busy worker
+        try:
+            queue.submit(generate_deck_data("small", "AAA"))
+            assert False, "Expected QueueFull"
+        except rs.QueueFull:
+            pass
+        finally:
+            queue._slots.release()
+        assert queue.stats()["rejected"] == 1
+        print("PASS: Full render queue rejects new work")
+    finally:
+        queue.shutdown()
+
+
+def test_worker_crash_recovery():
+    queue = rs.RenderQueue(workers=1, max_queue=0)
+    try:
+        crashed = queue._pool.submit(os._exit, 1)  # a worker dies mid-render
+        try:
+            crashed.result()
+        except rs.BrokenProcessPool:
+            pass
+        blob, slides = queue.submit(generate_deck_data("small", "AAA"))
+        assert slides == 11 and blob
+        assert queue.stats()["pool_restarts"] == 1
+        print("PASS: Render pool replaced after a worker crash")
+    finally:
+        queue.shutdown()
+
+
+def test_crash_with_two_requests_in_flight():
+    build_deck = rs.build_deck
+
+    def crashing_build_deck(d):
+        if d["ticker"] == "DIE":
+            time.sleep(0.2)
+            os._exit(1)  # a worker killed mid-render
+        time.sleep(0.5)  # still rendering when the other worker dies
+        return build_deck(d)
+
+    rs.build_deck = crashing_build_deck  # inherited by the forked workers
+    queue = rs.RenderQueue(workers=2, max_queue=0)
+    results = {}
+
+    def request(ticker):
+        try:
+            results[ticker] = queue.submit(generate_deck_data("small", ticker))[1]
+        except rs.BrokenProcessPool as e:
+            results[ticker] = e
+
+    try:
+        threads = [threading.Thread(target=request, args=(ticker,)) for ticker in ("AAA", "DIE")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results["AAA"] == 11, results
+        assert isinstance(results["DIE"], rs.BrokenProcessPool)
+        stats = queue.stats()
+        assert (stats["completed"], stats["failed"], stats["retried"]) == (1, 1, 2), stats
+        print("PASS: A worker crash fails only the request that caused it")
+    finally:
+        rs.build_deck = build_deck
+        queue.shutdown()
+
+
+if __name__ == "__main__":
+    test_render_server()
+    test_queue_backpressure()
+    test_worker_crash_recovery()
+    test_crash_with_two_requests_in_flight()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Test incremental deck rebuilds through the per-slide cache."""
+
+import sys
+import os
+import io
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+
+from templates import stock_analysis_slides as t
+from templates import slide_cache
+from templates.slide_cache import SlideCache
+from templates.sample_data import generate_deck_data
+
+
+def slide_xml(deck):
+    return [etree.tostring(s._element) for s in deck.prs.slides]
+
+
+def test_incremental_rebuild():
+    d = generate_deck_data("small", "AAA")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SlideCache(tmp)
+        t.build_deck(d, cache)
+        assert (cache.hits, cache.misses) == (0, 11)
+
+        d["catalysts"] = ["[Q4 2026] New catalyst"]
+        cache = SlideCache(tmp)
+        rebuilt = t.build_deck(d, cache)
+        assert (cache.hits, cache.misses) == (10, 1), (cache.hits, cache.misses)
+        assert slide_xml(rebuilt) == slide_xml(t.build_deck(d)), "Cached slides differ"
+    print("PASS: Only the changed slide was re-rendered")
+
+
+def test_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SlideCache(tmp, max_bytes=8000)
+        t.build_deck(generate_deck_data("small", "AAA"), cache)
+        size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+        assert 0 < size <= 8000, size
+    print("PASS: Slide cache stays within its size limit")
+
+
+def test_key_covers_imported_modules():
+    imported = set()
+    pending = ["templates.stock_analysis_slides"]
+    while pending:
+        name = pending.pop()
+        if name not in imported:
+            imported.add(name)
+            with open(slide_cache._module_path(name), "rb") as f:
+                pending.extend(slide_cache._project_imports(f.read()))
+    assert {"templates.table_layout", "templates.charts", "templates.cells"} <= imported, imported
+
+    # Editing an imported module (not the builder's own) changes every key
+    cache_key = slide_cache._module_fingerprint("templates.stock_analysis_slides")
+    real_open = open
+
+    def edited_open(path, mode="r", *args, **kwargs):
+        if not path.endswith("table_layout.py"):
+            return real_open(path, mode, *args, **kwargs)
+        with real_open(path, "rb") as f:
+            return io.BytesIO(f.read() + b"\n# edited\n")
+
+    saved = dict(slide_cache._fingerprints)
+    slide_cache._fingerprints.clear()
+    slide_cache.open = edited_open
+    try:
+        assert slide_cache._module_fingerprint("templates.stock_analysis_slides") != cache_key
+    finally:
+        del slide_cache.open
+        slide_cache._fingerprints.clear()
+        slide_cache._fingerprints.update(saved)
+    print("PASS: Cache keys cover the modules builders import")
+
+
+if __name__ == "__main__":
+    test_incremental_rebuild()
+    test_lru_eviction()
+    test_key_covers_imported_modules()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Test batch deck generation across a worker pool."""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import stock_analysis_batch as b
+from templates import stock_analysis_slides as t
+
+
+def sample_data(ticker):
+    return {
+        "ticker": ticker, "company": f"{ticker} Corp", "date": "2026-02-17",
+        "rating": "Buy", "price": 100.0, "target": 130.0,
+        "executive_summary": ["Bullet one", "Bullet two"],
+        "valuation_metrics": [["Forward P/E", "20.0x", "In line with peers"]],
+        "income_years": ["FY2025", "FY2024"],
+        "income_rows": [["Revenue", "$10.0B", "$9.0B"]],
+        "balance_years": ["FY2025", "FY2024"],
+        "balance_rows": [["Cash", "$5.0B", "$4.0B"]],
+        "peers": ["PEER1"],
+        "peer_rows": [["Market Cap", "$50B", "$40B"]],
+        "valuation_rows": [["DCF", "$120.00", "+20%", "100%"]],
+        "sensitivity_scenarios": ["Base"],
+        "sensitivity_waccs": ["WACC 10%"],
+        "sensitivity_matrix": [["$120"]],
+        "bull_case": ["Strong growth"],
+        "bear_case": ["Competition"],
+        "catalysts": ["[Q1 2026] Launch"],
+        "risk": "Medium", "consensus": "Buy", "rec_summary": "Compelling.",
+    }
+
+
+def test_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "data")
+        os.makedirs(data_dir)
+        for ticker in ("AAA", "BBB"):
+            with open(os.path.join(data_dir, f"{ticker}.json"), "w") as f:
+                json.dump(sample_data(ticker), f)
+        # Missing required key — must fail without stopping the batch
+        with open(os.path.join(data_dir, "bad.json"), "w") as f:
+            json.dump({"ticker": "BAD"}, f)
+
+        manifest = os.path.join(tmp, "manifest.jsonl")
+        with open(manifest, "w") as f:
+            f.write(json.dumps("data/AAA.json") + "\n")
+            f.write(json.dumps(sample_data("CCC")) + "\n")
+            f.write("{not json\n")
+            f.write("42\n")
+
+        out_dir = os.path.join(tmp, "out")
+        jobs = b.collect_jobs([data_dir, manifest])
+        assert len(jobs) == 7, f"Expected 7 jobs, got {len(jobs)}"
+
+        jobs, results = b.validate_jobs(jobs, out_dir)
+        results += b.run_batch(jobs, workers=2, output_dir=out_dir)
+        failed = {r[0]: r[3] for r in results if r[3]}
+        assert sorted(failed) == [os.path.join(data_dir, "bad.json"), f"{manifest}:1",
+                                  f"{manifest}:3", f"{manifest}:4"], failed
+        assert failed[f"{manifest}:1"].startswith("duplicate output path")  # AAA again
+        assert failed[f"{manifest}:3"].startswith("bad manifest line")
+        assert "got int" in failed[f"{manifest}:4"]
+
+        for ticker in ("aaa", "bbb", "ccc"):
+            path = os.path.join(out_dir, f"2026-02-17-{ticker}", f"2026-02-17-{ticker}-analysis.pptx")
+            assert os.path.exists(path), f"Missing {path}"
+            assert len(t.Presentation(path).slides) == 11
+        print("PASS: Batch built 3 decks and reported bad data, bad manifest lines and a duplicate")
+
+
+def test_worker_crash():
+    build_deck = b.build_deck
+
+    def crashing_build_deck(d):
+        if d["ticker"] == "DIE":
+            os._exit(1)  # a worker killed mid-render, as by the OOM killer
+        return build_deck(d)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = [(ticker, None, sample_data(ticker), None) for ticker in ("AAA", "DIE", "BBB", "CCC", "DDD")]
+        jobs, failures = b.validate_jobs(jobs, tmp)
+        assert failures == []
+        b.build_deck = crashing_build_deck  # inherited by the forked workers
+        try:
+            results = b.run_batch(jobs, workers=2, output_dir=tmp)
+        finally:
+            b.build_deck = build_deck
+        assert len(results) == 5
+        failed = {r[0]: r[3] for r in results if r[3]}
+        assert failed == {"DIE": "worker process died while rendering"}, failed
+        for ticker in ("aaa", "bbb", "ccc", "ddd"):
+            assert os.path.exists(os.path.join(tmp, f"2026-02-17-{ticker}", f"2026-02-17-{ticker}-analysis.pptx"))
+    print("PASS: A job that kills its worker fails alone; the other jobs are still rendered")
+
+
+if __name__ == "__main__":
+    test_batch()
+    test_worker_crash()
@@ -9,10 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from templates import stock_analysis_slides as t
 
-def test_template():
-    deck = t.StockAnalysisDeck()
-    prs = deck.prs
-
+def build_sample_slides(prs):
     # Slide 1: Title
     t.build_title_slide(prs, "TEST", "Test Corp", "2026-02-17", "Buy", 100.0, 130.0)
 
@@ -78,6 +75,11 @@ def test_template():
     t.build_recommendation(prs, "Buy", 100.0, 130.0, "Medium",
                            "Strong Buy ($135 median)", "Compelling risk/reward at current levels.")
 
+
+def test_template():
+    deck = t.StockAnalysisDeck()
+    build_sample_slides(deck.prs)
+
     output = "/tmp/test_stock_template.pptx"
     deck.save(output)
 
@@ -92,5 +94,134 @@ def test_template():
     print("PASS: All 11 slide builders work correctly")
     print("PASS: Template test complete")
 
+def test_prototypes_match():
+    """Prototype cloning must produce byte-identical slide XML."""
+    from lxml import etree
+
+    def slide_xml():
+        deck = t.StockAnalysisDeck()
+        build_sample_slides(deck.prs)
+        # Exercise the fallback paths: multi-line and empty text
+        slide = deck.prs.slides[1]
+        t.add_textbox(slide, t.Inches(1), t.Inches(1), t.Inches(2), t.Inches(1), "a\nb")
+        t.add_bullet_textbox(slide, t.Inches(1), t.Inches(1), t.Inches(2), t.Inches(1), [])
+        return [etree.tostring(s._element) for s in deck.prs.slides]
+
+    expected = slide_xml()
+    t.use_prototypes()
+    try:
+        first, second = slide_xml(), slide_xml()
+    finally:
+        t.use_prototypes(False)
+    assert first == expected, "Prototype render differs from per-property render"
+    assert second == expected, "Cloned prototypes differ from per-property render"
+    print("PASS: Prototype cloning matches per-property builders")
+
+
+def test_table_engine_matches():
+    """Direct-XML add_table must match the per-cell python-pptx reference."""
+    from lxml import etree
+
+    headers = ["Metric", "A & B", "<C>", ""]
+    rows = [["Revenue", "$10.0B", 9.5, "+5%"],
+            ["Multi\nline", "", "tab\there", "ok"],
+            ["Net Income", "$2.0B", "$1.8B", "$1.5B"],
+            ["Short row", "$1.0B"]]
+    for col_widths in (None, [t.Inches(3.0), t.Inches(2.0)]):
+        xml = []
+        for add in (t.add_table, t._add_table_by_cell):
+            deck = t.StockAnalysisDeck()
+            slide = deck.prs.slides.add_slide(deck.prs.slide_layouts[6])
+            add(slide, t.Inches(0.8), t.Inches(1.8), t.Inches(11.7), t.Inches(3.5),
+                headers, rows, col_widths=col_widths)
+            xml.append(etree.tostring(slide._element))
+        assert xml[0] == xml[1], f"Table XML differs (col_widths={col_widths})"
+        tbl = etree.fromstring(xml[0]).find(".//{*}tbl")
+        grid = len(tbl.findall("{*}tblGrid/{*}gridCol"))
+        assert [len(tr.findall("{*}tc")) for tr in tbl.findall("{*}tr")] == [grid] * (len(rows) + 1)
+
+    slide = t.StockAnalysisDeck().prs
+    slide = slide.slides.add_slide(slide.slide_layouts[6])
+    try:
+        t.add_table(slide, 0, 0, t.Inches(4), t.Inches(1), ["A", "B"], [["x", "y", "z"]])
+        assert False, "long row accepted"
+    except ValueError:
+        pass
+    print("PASS: Direct-XML table engine matches per-cell reference")
+
+
+def test_save_to_stream():
+    """save() accepts unseekable binary streams such as pipes and sockets."""
+    import io
+
+    class Unseekable(io.RawIOBase):
+        def __init__(self):
+            self.chunks = []
+
+        def writable(self):
+            return True
+
+        def write(self, b):
+            self.chunks.append(bytes(b))
+            return len(b)
+
+    deck = t.StockAnalysisDeck()
+    build_sample_slides(deck.prs)
+    stream = Unseekable()
+    deck.save(stream)
+    assert len(stream.chunks) > 1, "Expected the zip to be written incrementally"
+    prs = t.Presentation(io.BytesIO(b"".join(stream.chunks)))
+    assert len(prs.slides) == 11
+    print("PASS: Deck streamed to an unseekable stream")
+
+
+def test_base_snapshot_clone():
+    """Decks cloned from the cached base match a freshly parsed Presentation()."""
+    def parts(prs):
+        return {str(p.partname): p.blob for p in prs.part.package.iter_parts()}
+
+    fresh = t.Presentation()
+    fresh.slide_width = t.SLIDE_WIDTH
+    fresh.slide_height = t.SLIDE_HEIGHT
+    build_sample_slides(fresh)
+
+    first, second = t.StockAnalysisDeck(), t.StockAnalysisDeck()
+    build_sample_slides(first.prs)
+    assert len(second.prs.slides) == 0, "Cloned decks must not share slides"
+    assert parts(first.prs) == parts(fresh), "Cloned base differs from Presentation()"
+    print("PASS: Base snapshot clones match Presentation()")
+
+
+def test_streaming_deck():
+    """StreamingDeck writes slides out on flush() and produces the same slides."""
+    import tempfile
+    from lxml import etree
+
+    def build(deck):
+        t.build_title_slide(deck.prs, "TEST", "Test Corp", "2026-02-17", "Buy", 100.0, 130.0)
+        deck.flush()
+        build_sample_slides(deck.prs)
+
+    expected = t.StockAnalysisDeck()
+    build(expected)
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "streamed.pptx")
+        deck = t.StreamingDeck(output)
+        build(deck)
+        assert deck.slide_count == 1 and len(deck.prs.slides) == 11, "Flushed slides must leave prs"
+        deck.save()
+        prs = t.Presentation(output)
+    assert deck.slide_count == len(prs.slides) == 12
+    assert len(prs.slide_layouts) == 11
+    assert ([etree.tostring(s._element) for s in prs.slides]
+            == [etree.tostring(s._element) for s in expected.prs.slides])
+    print("PASS: Streamed deck matches the in-memory deck")
+
+
 if __name__ == "__main__":
     test_template()
+    test_prototypes_match()
+    test_table_engine_matches()
+    test_save_to_stream()
+    test_base_snapshot_clone()
+    test_streaming_deck()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Test table text measurement and pagination onto continuation slides."""
+
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+
+from templates import stock_analysis_slides as t
+from templates import table_layout as layout
+from templates.slide_cache import SlideCache
+
+
+def test_measurement():
+    assert layout.text_width("iii", 13) < layout.text_width("MMM", 13)
+    assert layout.text_width("Revenue", 14, True) > layout.text_width("Revenue", 14)
+    assert layout.text_width("2025", 14, True) == layout.text_width("2025", 14)
+    narrow = t.Inches(1.0)
+    assert layout.line_count("$10.0B", narrow, 13) == 1
+    assert layout.line_count("Operating income before interest and taxes", narrow, 13) > 2
+    assert layout.line_count("a\nb", narrow, 13) == 2
+    one = layout.row_height(["x"], [narrow], 13)
+    assert layout.row_height(["x", "a\nb\nc"], [narrow, narrow], 13) > 2 * one
+    print("PASS: Glyph-width measurement and wrapping")
+
+
+def test_income_statement_paginates():
+    years = ["FY2025", "FY2024", "FY2023"]
+    headers = ["Line Item"] + years
+
+    # A table that fits is written exactly as add_table writes it
+    rows = [["Revenue", "$10.0B", "$9.0B", "$8.0B"], ["Net Income", "$2.0B", "$1.8B", "$1.5B"]]
+    prs = t.StockAnalysisDeck().prs
+    t.build_income_statement(prs, years, rows, note="n")
+    expected = t.StockAnalysisDeck().prs
+    slide = expected.slides.add_slide(expected.slide_layouts[6])
+    t.add_background(slide)
+    t.add_title_bar(slide, "Income Statement (FY2023–FY2025)")
+    t.add_table(slide, t.Inches(0.8), t.Inches(1.8), t.Inches(11.7), t.Inches(3.5), headers, rows,
+                col_widths=[t.Inches(3.5)] + [t.Inches(8.2 / 3)] * 3)
+    t.add_textbox(slide, t.Inches(0.8), t.Inches(5.6), t.Inches(11.7), t.Inches(0.5),
+                  "Note: n", font_size=13, color=t.MEDIUM_GRAY)
+    assert len(prs.slides) == 1
+    assert etree.tostring(prs.slides[0]._element) == etree.tostring(slide._element)
+
+    rows = [[f"Line item {i}", "$10.0B", "$9.0B", "$8.0B"] for i in range(40)]
+    prs = t.StockAnalysisDeck().prs
+    t.build_income_statement(prs, years, rows, note="Forty lines.")
+    assert len(prs.slides) > 1
+    seen = []
+    for i, slide in enumerate(prs.slides):
+        title = slide.shapes[1].text_frame.text
+        assert title.endswith("(cont.)") == (i > 0), title
+        frame = [s for s in slide.shapes if s.has_table][0]
+        table = frame.table
+        assert [c.text for c in table.rows[0].cells] == headers
+        assert frame.top + frame.height <= t.Inches(5.5)
+        seen += [r.cells[0].text for r in list(table.rows)[1:]]
+        notes = [s for s in slide.shapes if s.has_text_frame and s.text_frame.text.startswith("Note:")]
+        assert len(notes) == (i == len(prs.slides) - 1)
+    assert seen == [r[0] for r in rows]
+
+    # Multi-slide builds bypass the slide cache rather than caching one page
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SlideCache(tmp)
+        for _ in range(2):
+            prs = t.StockAnalysisDeck().prs
+            cache.build_slide(prs, t.build_income_statement, (years, rows, "Forty lines."))
+            assert len(prs.slides) > 1
+        assert cache.hits == 0
+    print(f"PASS: 40-row income statement split over {len(prs.slides)} slides")
+
+
+if __name__ == "__main__":
+    test_measurement()
+    test_income_statement_paginates()
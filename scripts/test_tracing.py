@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Test opt-in per-slide tracing."""
+
+import sys
+import os
+import io
+import json
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import stock_analysis_slides as t
+from templates import tracing
+from templates.sample_data import generate_deck_data
+
+
+def test_tracing():
+    original = t.add_table
+    d = generate_deck_data("small")
+    tracer = tracing.enable(t)
+    try:
+        t.build_deck(d).save(io.BytesIO())
+    finally:
+        tracing.disable(t)
+    assert t.add_table is original and not hasattr(t.DECK_SLIDES[0][0], "__traced__")
+
+    names = {s["name"] for s in tracer.spans}
+    for builder, slide_args in t.DECK_SLIDES:
+        if slide_args(d) is None:
+            continue
+        assert builder.__name__ in names, f"Missing span for {builder.__name__}"
+    assert {"build_deck", "add_table", "StockAnalysisDeck.save"} <= names
+    root = [s for s in tracer.spans if s["name"] == "build_deck"][0]
+    assert root["depth"] == 0 and root["peak_kb"] > 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracer.write(os.path.join(tmp, "trace.json"))
+        with open(os.path.join(tmp, "trace.json")) as f:
+            events = json.load(f)["traceEvents"]
+        assert len(events) == len(tracer.spans) and events[0]["ph"] == "X"
+    print("PASS: Tracing recorded every builder and restored the module")
+
+
+def test_tracing_streaming_deck():
+    original = t.StreamingDeck.save, t.StreamingDeck.flush
+    tracer = tracing.enable(t)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            t.build_deck(generate_deck_data("small"), deck=t.StreamingDeck(os.path.join(tmp, "d.pptx"))).save()
+    finally:
+        tracing.disable(t)
+    assert (t.StreamingDeck.save, t.StreamingDeck.flush) == original
+    names = [s["name"] for s in tracer.spans]
+    assert "StreamingDeck.save" in names and names.count("StreamingDeck.flush") > 1, names
+    print("PASS: Streamed deck flushes and final save are traced")
+
+
+if __name__ == "__main__":
+    test_tracing()
+    test_tracing_streaming_deck()
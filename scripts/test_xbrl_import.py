@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Test the streaming SEC companyfacts import into deck financial rows."""
+
+import sys
+import os
+import io
+import json
+import tempfile
+import zipfile
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.xbrl_import import JsonStream, import_all, import_file, iter_sources
+
+
+def fact(val, fy, end, start=None, form="10-K", filed=None):
+    f = {"end": end, "val": val, "accn": f"0000-{fy}-{form}", "fy": fy, "fp": "FY",
+         "form": form, "filed": filed or f"{fy}-11-01"}
+    if start:
+        f["start"] = start
+    return f
+
+
+def duration(values):
+    """Annual facts for fiscal years ending Sept 30, each filing also restating the prior year."""
+    out = []
+    for fy, val in values.items():
+        out.append(fact(val, fy, f"{fy}-09-30", f"{fy - 1}-10-01"))
+        out.append(fact(val, fy + 1, f"{fy}-09-30", f"{fy - 1}-10-01"))  # comparative next year
+    return out
+
+
+def instant(values):
+    return [fact(val, fy, f"{fy}-09-30") for fy, val in values.items()]
+
+
+def companyfacts(cik=320193, name="Example Corp"):
+    years = (2021, 2022, 2023, 2024)
+    net_income = duration(dict(zip(years, [0.8e9, 0.9e9, 1.0e9, 1.2e9])))
+    net_income.append(fact(1.1e9, 2024, "2023-09-30", "2022-10-01", filed="2024-12-01"))  # restated
+    net_income.append(fact(0.3e9, 2024, "2024-09-30", "2024-07-01"))                      # a quarter
+    net_income.append(fact(9.9e9, 2024, "2024-06-30", "2023-07-01", form="10-Q"))
+    return {
+        "cik": cik,
+        "entityName": name,
+        "facts": {
+            "dei": {"EntityCommonStockSharesOutstanding": {
+                "label": "Shares", "units": {"shares": [{"end": "2024-10-15", "val": 1e9}]}}},
+            "us-gaap": {
+                "AccountsPayableCurrent": {"label": "AP", "description": "Not mapped é \"q\"",
+                                           "units": {"USD": instant(dict(zip(years, [1, 2, 3, 4])))}},
+                "Revenues": {"label": "Revenues", "units": {"USD": duration(dict(zip(years, [8e9, 9e9, 10e9, 12e9])))}},
+                "NetIncomeLoss": {"units": {"USD": net_income}},
+                "EarningsPerShareDiluted": {"units": {"USD/shares": duration(dict(zip(years, [0.8, 0.9, 1.1, 1.25])))}},
+                "Assets": {"units": {"USD": instant(dict(zip(years, [20e9, 21e9, 22e9, 25e9])))}},
+                "LiabilitiesAndStockholdersEquity": {"units": {"USD": instant(dict(zip(years, [20e9, 21e9, 22e9, 25e9])))}},
+                "StockholdersEquity": {"units": {"USD": instant(dict(zip(years, [8e9, 9e9, 10e9, 11e9])))}},
+                "LongTermDebtNoncurrent": {"units": {"USD": instant({2023: 4e9, 2024: 3.5e9})}},
+                "CommercialPaper": {"units": {"USD": instant({2024: 0.5e9})}},
+                "NetCashProvidedByUsedInOperatingActivities": {"units": {"USD": duration({2023: 2e9, 2024: 2.5e9})}},
+                "PaymentsToAcquirePropertyPlantAndEquipment": {"units": {"USD": duration({2023: 0.5e9, 2024: 0.6e9})}},
+            },
+        },
+    }
+
+
+def test_json_stream():
+    doc = companyfacts()
+    # Bare numbers whose "." or exponent may fall on a chunk boundary
+    numbers = ', "price": 6.08, "shares": 1e5, "debt": -2.5e10, "last": 1E+3}'
+    for text in (json.dumps(doc)[:-1] + numbers, json.dumps(doc, indent=2)[:-1] + numbers):
+        for chunk_size in (1, 2, 4, 7, 8, 64 * 1024):
+            stream = JsonStream(io.StringIO(text), chunk_size)
+            out = {}
+            for key in stream.members():
+                if key == "facts":
+                    out[key] = {}
+                    for taxonomy in stream.members():
+                        if taxonomy == "dei":
+                            stream.skip()
+                        else:
+                            out[key][taxonomy] = {c: stream.value() for c in stream.members()}
+                else:
+                    out[key] = stream.value()
+            expected = dict(doc, facts={"us-gaap": doc["facts"]["us-gaap"]},
+                            price=6.08, shares=1e5, debt=-2.5e10, last=1e3)
+            assert out == expected, chunk_size
+    print("PASS: Streamed members and values match json.loads at any chunk size")
+
+
+def test_deck_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "CIK0000320193.json")
+        with open(path, "w") as f:
+            json.dump(companyfacts(), f)
+        d = import_file(path)
+    assert (d["cik"], d["company"]) == (320193, "Example Corp")
+    assert d["income_years"] == ["FY2024", "FY2023", "FY2022"]
+    assert d["income_rows"] == [
+        ["Revenue", "$12.0B", "$10.0B", "$9.0B"],
+        ["Net Income", "$1.2B", "$1.1B", "$900.0M"],  # FY2023 restated by the later filing
+        ["EPS (Diluted)", "$1.25", "$1.10", "$0.90"],
+    ]
+    assert d["balance_years"] == ["FY2024", "FY2023", "FY2022"]
+    rows = {row[0]: row[1:] for row in d["balance_rows"]}
+    assert rows["Total Liabilities"] == ["$14.0B", "$12.0B", "$12.0B"]
+    assert rows["Total Debt"] == ["$4.0B", "$4.0B", "—"]
+    assert rows["Free Cash Flow"] == ["$1.9B", "$1.5B", "—"]
+    assert "Cash & Equivalents" not in rows
+    print("PASS: Annual us-gaap facts mapped to deck income and balance rows")
+
+
+def test_archive_in_parallel():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "companyfacts.zip")
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as z:
+            for cik in range(1, 7):
+                z.writestr(f"CIK{cik:010d}.json", json.dumps(companyfacts(cik, f"Company {cik}")))
+            z.writestr("CIK0000000098.json", json.dumps({"cik": 98, "entityName": "No GAAP",
+                                                        "facts": {"dei": {}}}))
+            z.writestr("CIK0000000099.json", '{"cik": 99, "facts": {"us-gaap": {')
+        results = {name: (result, error) for name, result, error
+                   in import_all(iter_sources([archive]), workers=2)}
+    assert len(results) == 8
+    assert results["CIK0000000098.json"] == ({}, None)
+    assert results["CIK0000000099.json"][1] is not None
+    imported = [r for r, _ in results.values() if r]
+    assert sorted(r["cik"] for r in imported) == list(range(1, 7))
+    assert all(r["income_rows"][0] == ["Revenue", "$12.0B", "$10.0B", "$9.0B"] for r in imported)
+    print("PASS: Bulk archive imported across worker processes; bad files reported")
+
+
+if __name__ == "__main__":
+    test_json_stream()
+    test_deck_rows()
+    test_archive_in_parallel()
@@ -0,0 +1,322 @@
+"""
+Typed Table Cells
+
+Slide tables take rows of display strings ("$10.0B", "20.0x", "+20%"). A
+CellTable holds the same table as raw numbers, one float64 array per column,
+with a cell kind per column or per row:
+
+    currency   $10.0B, $950.0M, ($1.2B)  dollars; T/B/M/K picked per cell unless unit is given
+    per_share  $193.00, ($0.50)          dollars
+    percent    18.5%                     a fraction (0.185)
+    delta      +20%                      a signed fraction (0.20)
+    multiple   20.0x
+    number     1.25
+    text       strings, passed through
+
+Every build_* table function accepts a CellTable wherever it takes rows.
+Cells are formatted a column at a time when the slide is built, with each
+distinct value formatted once; missing values (None or NaN) show as "—".
+The numbers stay available for charts (series()) and Excel: typed_rows()
+pairs each value with the matching Excel number format, and
+templates/excel_export.py writes those as numeric cells.
+
+Usage:
+    from templates.cells import CellTable, Column
+
+    income = CellTable.from_rows([
+        ["Revenue", 10.0e9, 9.0e9, 8.0e9],
+        ["Net Margin", 0.20, 0.19, 0.18],
+        ["EPS (Diluted)", 6.42, 5.90, 5.10],
+    ], ["currency", "percent", "per_share"])
+
+    valuation = CellTable(["DCF", "Comps"], [
+        Column([120.0, 140.0], "per_share"),
+        Column([0.20, 0.40], "delta"),
+        Column([0.5, 0.5], "percent", decimals=0),
+    ])
+
+    build_income_statement(prs, ["FY2025", "FY2024", "FY2023"], income)
+    build_income_chart(prs, years, income.series(["Revenue"], scale=1e9))
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+MISSING = "—"
+DEFAULT_DECIMALS = {"currency": 1, "per_share": 2, "percent": 1, "delta": 0,
+                    "multiple": 1, "number": 2, "text": 0}
+KINDS = tuple(DEFAULT_DECIMALS)
+# Currency units, largest first; thousands-separator commas after the digits
+# scale the displayed value in Excel as in templates/excel_export.py
+_UNITS = (("T", 1e12, ",,,,"), ("B", 1e9, ",,,"), ("M", 1e6, ",,"), ("K", 1e3, ","))
+_UNIT_NAMES = tuple(name for name, _, _ in _UNITS)
+_UNIT_SIZES = {name: size for name, size, _ in _UNITS}
+_UNIT_COMMAS = {name: commas for name, _, commas in _UNITS}
+
+
+# =============================================================================
+# NUMBER FORMATS
+# =============================================================================
+
+class NumberFormat:
+    """How one kind of cell is displayed; built through number_format() and shared."""
+
+    __slots__ = ("kind", "decimals", "unit", "excel", "_pattern", "_scale", "_dollar")
+
+    def __init__(self, kind, decimals, unit):
+        self.kind = kind
+        self.decimals = decimals
+        self.unit = unit
+        digits = "0." + "0" * decimals if decimals else "0"
+        self._dollar = kind in ("currency", "per_share")
+        self._scale = 100.0 if kind in ("percent", "delta") else 1.0
+        if kind == "text":
+            self._pattern, self.excel = None, None
+        elif kind == "percent":
+            self._pattern, self.excel = f"{{:.{decimals}f}}%", digits + "%"
+        elif kind == "delta":
+            self._pattern = f"{{:+.{decimals}f}}%"
+            self.excel = f"+{digits}%;-{digits}%;+{digits}%"
+        elif kind == "multiple":
+            self._pattern, self.excel = f"{{:,.{decimals}f}}x", f'#,##{digits}"x"'
+        elif kind == "number":
+            self._pattern, self.excel = f"{{:,.{decimals}f}}", "#,##" + digits
+        else:
+            # Dollar amounts are formatted on their magnitude, negatives in
+            # accounting parentheses: ($1.2B), not -$1.2B or $-1.2B
+            self._pattern, self.excel = f"${{:,.{decimals}f}}", '"$"#,##' + digits
+            if unit:
+                self._pattern += unit
+                self.excel += f'{_UNIT_COMMAS[unit]}"{unit}"'
+            self.excel = f"{self.excel};({self.excel})"
+
+    def __repr__(self):
+        unit = f", unit={self.unit!r}" if self.unit else ""
+        return f"number_format({self.kind!r}, {self.decimals}{unit})"
+
+    def _groups(self, values):
+        """Yield (mask, NumberFormat) splitting finite values by the unit they display in."""
+        if self.kind != "currency" or self.unit is not None:
+            yield None, self
+            return
+        magnitude = np.abs(values)
+        rest = np.ones(len(values), dtype=bool)
+        for name, size, _ in _UNITS:
+            mask = rest & (magnitude >= size)
+            if mask.any():
+                yield mask, number_format("currency", self.decimals, name)
+            rest &= ~mask
+        if rest.any():
+            yield rest, number_format("currency", self.decimals, "")
+
+    def format_array(self, values, missing=MISSING):
+        """Display strings for a 1-D sequence of numbers, each distinct value formatted once."""
+        if self.kind == "text":
+            return [missing if v is None else str(v) for v in values]
+        values = np.asarray(values, dtype=float)
+        out = [missing] * len(values)
+        finite = np.flatnonzero(np.isfinite(values))
+        if not len(finite):
+            return out
+        present = values[finite]
+        for mask, fmt in self._groups(present):
+            index = finite if mask is None else finite[mask]
+            group = present if mask is None else present[mask]
+            if fmt.unit:
+                group = group / _UNIT_SIZES[fmt.unit]
+            unique, inverse = np.unique(group * fmt._scale, return_inverse=True)
+            if fmt._dollar:
+                text = [f"({fmt._pattern.format(-v)})" if v < 0 else fmt._pattern.format(v)
+                        for v in unique.tolist()]
+            else:
+                text = [fmt._pattern.format(v) for v in unique.tolist()]
+            for i, t in zip(index.tolist(), inverse.ravel().tolist()):
+                out[i] = text[t]
+        return out
+
+    def format_value(self, value, missing=MISSING):
+        """Display string for one number."""
+        return self.format_array([value], missing)[0]
+
+    def excel_format(self, value):
+        """Excel number format rendering value as format_value() does."""
+        if self.kind == "currency" and self.unit is None:
+            for _, fmt in self._groups(np.array([value], dtype=float)):
+                return fmt.excel
+        return self.excel
+
+
+def number_format(kind, decimals=None, unit=None):
+    """The shared NumberFormat for a cell kind.
+
+    decimals defaults per kind (DEFAULT_DECIMALS). unit ("T", "B", "M", "K"
+    or "" for none) fixes the scale of a currency column instead of picking
+    it per cell.
+    """
+    if kind not in DEFAULT_DECIMALS:
+        raise ValueError(f"unknown cell kind {kind!r}; expected one of {', '.join(KINDS)}")
+    if unit is not None and (kind != "currency" or unit not in _UNIT_NAMES + ("",)):
+        raise ValueError(f"unit {unit!r} is only valid for currency ({', '.join(_UNIT_NAMES)} or '')")
+    return _number_format(kind, DEFAULT_DECIMALS[kind] if decimals is None else int(decimals), unit)
+
+
+@lru_cache(maxsize=None)
+def _number_format(kind, decimals, unit):
+    return NumberFormat(kind, decimals, unit)
+
+
+def _as_format(spec):
+    """A NumberFormat from a kind name, a (kind, decimals[, unit]) tuple or a NumberFormat."""
+    if isinstance(spec, NumberFormat):
+        return spec
+    if isinstance(spec, str):
+        return number_format(spec)
+    return number_format(*spec)
+
+
+def _as_array(values):
+    if isinstance(values, np.ndarray):
+        return np.asarray(values, dtype=float)
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+# =============================================================================
+# COLUMNS AND TABLES
+# =============================================================================
+
+class Column:
+    """One table column: numbers in a float64 array (strings for text) and their format.
+
+    Without a kind, the column takes the format of each row from its CellTable.
+    """
+
+    __slots__ = ("values", "format")
+
+    def __init__(self, values, kind=None, decimals=None, unit=None):
+        self.format = number_format(kind, decimals, unit) if kind is not None else None
+        if kind == "text":
+            self.values = [None if v is None else str(v) for v in values]
+        else:
+            self.values = _as_array(values)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class CellTable:
+    """Rows of a slide table: a label per row plus typed Columns.
+
+    Iterating yields [label, "display", ...] rows, so a CellTable can be
+    passed anywhere rows of strings are expected. row_formats gives a kind
+    (or (kind, decimals[, unit]) tuple) per row for columns without one,
+    e.g. a statement whose rows mix dollars, margins and per-share values.
+    """
+
+    def __init__(self, labels, columns, row_formats=None):
+        self.labels = [str(label) for label in labels]
+        self.columns = list(columns)
+        self.row_formats = ([_as_format(f) for f in row_formats]
+                            if row_formats is not None else None)
+        n = len(self.labels)
+        for j, column in enumerate(self.columns):
+            if len(column) != n:
+                raise ValueError(f"column {j + 1} has {len(column)} values for {n} rows")
+            if column.format is None and self.row_formats is None:
+                raise ValueError(f"column {j + 1} has no kind and the table has no row_formats")
+        if self.row_formats is not None and len(self.row_formats) != n:
+            raise ValueError(f"{len(self.row_formats)} row formats for {n} rows")
+        self._rows = None
+
+    @classmethod
+    def from_rows(cls, rows, row_formats):
+        """Table from [label, value, ...] rows with one kind per row; short rows are padded with missing cells."""
+        rows = list(rows)
+        width = max((len(row) for row in rows), default=1) - 1
+        values = np.full((width, len(rows)), np.nan)
+        for i, row in enumerate(rows):
+            values[:len(row) - 1, i] = [np.nan if v is None else v for v in row[1:]]
+        return cls([row[0] for row in rows], [Column(v) for v in values], row_formats)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def __repr__(self):
+        # Formatted content, so the slide cache key changes with what the slide shows
+        return f"CellTable({self.rows()!r})"
+
+    def _row_groups(self):
+        """[(NumberFormat, row indices)] for the rows sharing each format."""
+        groups = {}
+        for i, fmt in enumerate(self.row_formats):
+            groups.setdefault(fmt, []).append(i)
+        return [(fmt, np.array(index)) for fmt, index in groups.items()]
+
+    def format_column(self, j):
+        """Display strings of column j, formatted in bulk."""
+        column = self.columns[j]
+        if column.format is not None:
+            return column.format.format_array(column.values)
+        out = [None] * len(self.labels)
+        for fmt, index in self._row_groups():
+            values = (column.values[index] if fmt.kind != "text"
+                      else [column.values[i] for i in index])
+            for i, text in zip(index.tolist(), fmt.format_array(values)):
+                out[i] = text
+        return out
+
+    def _format_by_row(self, js):
+        """Display strings of columns js (all without a kind), one bulk call per row format."""
+        values = np.column_stack([self.columns[j].values for j in js])
+        text = np.empty(values.shape, dtype=object)
+        for fmt, index in self._row_groups():
+            block = values[index]
+            text[index] = np.reshape(fmt.format_array(block.ravel()), block.shape)
+        return text.T.tolist()
+
+    def rows(self):
+        """[label, "display", ...] rows (formatted once and kept)."""
+        if self._rows is None:
+            columns = [None] * len(self.columns)
+            by_row = []
+            for j, column in enumerate(self.columns):
+                if column.format is not None:
+                    columns[j] = column.format.format_array(column.values)
+                else:
+                    by_row.append(j)
+            if by_row and self.labels:
+                for j, text in zip(by_row, self._format_by_row(by_row)):
+                    columns[j] = text
+            self._rows = [list(row) for row in zip(self.labels, *columns)]
+        return self._rows
+
+    def typed_rows(self):
+        """[label, (value, excel number format), ...] rows; missing cells are None, text stays a string."""
+        out = []
+        for i, label in enumerate(self.labels):
+            row = [label]
+            for column in self.columns:
+                fmt = column.format or self.row_formats[i]
+                value = column.values[i]
+                if fmt.kind == "text":
+                    row.append(value)
+                elif np.isfinite(value):
+                    row.append((float(value), fmt.excel_format(value)))
+                else:
+                    row.append(None)
+            out.append(row)
+        return out
+
+    def series(self, labels=None, scale=1):
+        """{label: [value / scale, ...]} for chart series; missing values are None."""
+        wanted = self.labels if labels is None else labels
+        out = {}
+        for label in wanted:
+            i = self.labels.index(label)
+            values = [column.values[i] for column in self.columns
+                      if isinstance(column.values, np.ndarray)]
+            out[label] = [float(v) / scale if np.isfinite(v) else None for v in values]
+        return out
@@ -0,0 +1,205 @@
+"""
+Native Chart Data for Stock Analysis Decks
+
+Chart data objects for python-pptx's add_chart with two changes that matter
+for chart-heavy decks:
+
+- The embedded Excel workbook is written from a cached template. XlsxWriter
+  runs once per number format to produce the static parts (styles, theme,
+  workbook, content types); each chart then only generates its worksheet XML
+  and zips it with the cached parts, instead of building a whole workbook.
+- Column + line combo charts: series named in line_series are drawn as a
+  line on a secondary value axis over the clustered columns.
+
+add_chart() also numbers the chart and workbook parts from a per-package
+counter; python-pptx walks every part in the package to find the next free
+name, which makes each chart slower than the last in a chart-heavy deck.
+
+Usage:
+    from templates.charts import TrendChartData
+
+    chart_data = TrendChartData(number_format='#,##0.0', line_series={"Net Margin %"})
+    chart_data.categories = ["FY2023", "FY2024", "FY2025"]
+    chart_data.add_series("Revenue", [8.0, 9.0, 10.0])
+    chart_data.add_series("Net Margin %", [18.0, 20.0, 21.0])
+    add_chart(slide.shapes, XL_CHART_TYPE.COLUMN_CLUSTERED, x, y, cx, cy, chart_data)
+"""
+
+import io
+import re
+import weakref
+import zipfile
+from copy import deepcopy
+from xml.sax.saxutils import escape as xml_escape
+
+from lxml import etree
+from pptx.chart.data import CategoryChartData
+from pptx.chart.xlsx import CategoryWorkbookWriter
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml.ns import qn
+from pptx.parts.chart import ChartPart
+from pptx.parts.embeddedpackage import EmbeddedXlsxPart
+from pptx.util import lazyproperty
+
+_SHEET = "xl/worksheets/sheet1.xml"
+_SHARED_STRINGS = "xl/sharedStrings.xml"
+_EMPTY_SST = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+              '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+              'count="0" uniqueCount="0"/>')
+_SHEET_HEAD = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+               '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+               'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">')
+_SHEET_TAIL = ('<pageMargins left="0.7" right="0.7" top="0.75" bottom="0.75" header="0.3" footer="0.3"/>'
+               '</worksheet>')
+
+# Secondary axis ids for the line plot of a combo chart
+_LINE_AXIS_IDS = ("-2000000001", "-2000000002")
+
+_templates = {}
+_partname_counters = weakref.WeakKeyDictionary()
+
+
+def _workbook_template(number_format):
+    """Workbook template for a number format, built once via XlsxWriter.
+
+    Returns (parts, category_style, value_style): the zip entries as
+    [(ZipInfo, bytes)] and the cell style ids XlsxWriter gave the category
+    and value cells.
+    """
+    if number_format not in _templates:
+        sample = CategoryChartData(number_format)
+        sample.categories = ["x"]
+        sample.add_series("y", [1])
+        blob = CategoryWorkbookWriter(sample).xlsx_blob
+        with zipfile.ZipFile(io.BytesIO(blob)) as z:
+            parts = [(info, z.read(info)) for info in z.infolist()]
+        sheet = dict((info.filename, data) for info, data in parts)[_SHEET].decode()
+        styles = [re.search(f'<c r="{ref}" s="(\\d+)"', sheet).group(1) for ref in ("A2", "B2")]
+        _templates[number_format] = (parts, *styles)
+    return _templates[number_format]
+
+
+class _TemplateWorkbookWriter(CategoryWorkbookWriter):
+    """CategoryWorkbookWriter that fills a cached workbook template."""
+
+    @property
+    def xlsx_blob(self):
+        chart_data = self._chart_data
+        categories = chart_data.categories
+        if categories.depth != 1:
+            return super().xlsx_blob
+
+        parts, cat_style, value_style = _workbook_template(chart_data.number_format)
+        col = self._column_reference
+        last_col = col(1 + len(chart_data))
+        names = "".join(f'<c r="{col(2 + i)}1" t="inlineStr"><is><t>{xml_escape(s.name)}</t></is></c>'
+                        for i, s in enumerate(chart_data))
+        rows = [f'<row r="1">{names}</row>']
+        values = [s.values for s in chart_data]
+        for r, category in enumerate(categories, 2):
+            cells = [f'<c r="A{r}" s="{cat_style}" t="inlineStr"><is><t>{xml_escape(str(category.label))}</t></is></c>']
+            for i, series_values in enumerate(values):
+                v = series_values[r - 2] if r - 2 < len(series_values) else None
+                if v is not None:
+                    cells.append(f'<c r="{col(2 + i)}{r}" s="{value_style}"><v>{float(v)!r}</v></c>')
+            rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+        sheet = (f'{_SHEET_HEAD}<dimension ref="A1:{last_col}{len(categories) + 1}"/>'
+                 '<sheetViews><sheetView tabSelected="1" workbookViewId="0"/></sheetViews>'
+                 '<sheetFormatPr defaultRowHeight="15"/>'
+                 '<cols><col min="1" max="1" width="10.7109375" customWidth="1"/></cols>'
+                 f'<sheetData>{"".join(rows)}</sheetData>{_SHEET_TAIL}')
+
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as z:
+            for info, data in parts:
+                if info.filename == _SHEET:
+                    data = sheet
+                elif info.filename == _SHARED_STRINGS:
+                    data = _EMPTY_SST
+                z.writestr(info, data)
+        return out.getvalue()
+
+
+class TrendChartData(CategoryChartData):
+    """Category chart data with a templated workbook and optional line overlay series."""
+
+    def __init__(self, number_format="General", line_series=()):
+        super().__init__(number_format)
+        self.line_series = set(line_series)
+
+    @lazyproperty
+    def _workbook_writer(self):
+        return _TemplateWorkbookWriter(self)
+
+    def xml_bytes(self, chart_type):
+        columns = [s for s in self if s.name not in self.line_series]
+        if not self.line_series or not columns or len(columns) == len(self):
+            return super().xml_bytes(chart_type)
+        return _combo_xml(super().xml_bytes(XL_CHART_TYPE.COLUMN_CLUSTERED),
+                          super().xml_bytes(XL_CHART_TYPE.LINE_MARKERS),
+                          [s.index for s in self if s.name in self.line_series])
+
+
+def _combo_xml(bar_xml, line_xml, line_indices):
+    """Merge a bar chart and a line chart of the same series into one combo chart.
+
+    Series in line_indices move from the bars to a lineChart plotted against
+    a secondary category/value axis pair on the right.
+    """
+    bar, line = etree.fromstring(bar_xml), etree.fromstring(line_xml)
+    bar_plot_area, line_plot_area = bar.find(f".//{qn('c:plotArea')}"), line.find(f".//{qn('c:plotArea')}")
+    bar_chart, line_chart = bar_plot_area.find(qn("c:barChart")), line_plot_area.find(qn("c:lineChart"))
+
+    def index(ser):
+        return int(ser.find(qn("c:idx")).get("val"))
+
+    for ser in bar_chart.findall(qn("c:ser")):
+        if index(ser) in line_indices:
+            bar_chart.remove(ser)
+    for ser in line_chart.findall(qn("c:ser")):
+        if index(ser) not in line_indices:
+            line_chart.remove(ser)
+    for ax_id, new_id in zip(line_chart.findall(qn("c:axId")), _LINE_AXIS_IDS):
+        ax_id.set("val", new_id)
+    bar_chart.addnext(line_chart)
+
+    cat_ax = deepcopy(line_plot_area.find(qn("c:catAx")))
+    val_ax = deepcopy(line_plot_area.find(qn("c:valAx")))
+    for ax, (own, cross) in ((cat_ax, _LINE_AXIS_IDS), (val_ax, _LINE_AXIS_IDS[::-1])):
+        ax.find(qn("c:axId")).set("val", own)
+        ax.find(qn("c:crossAx")).set("val", cross)
+    cat_ax.find(qn("c:delete")).set("val", "1")
+    if (gridlines := val_ax.find(qn("c:majorGridlines"))) is not None:
+        val_ax.remove(gridlines)
+    val_ax.find(qn("c:axPos")).set("val", "r")
+    val_ax.find(qn("c:crosses")).set("val", "max")
+    last_axis = bar_plot_area.findall(qn("c:valAx"))[-1]
+    last_axis.addnext(cat_ax)
+    cat_ax.addnext(val_ax)
+    return etree.tostring(bar, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _next_partname(package, template):
+    """Next free partname for template, found by a package walk only the first time."""
+    counters = _partname_counters.setdefault(package, {})
+    if template not in counters:
+        prefix, suffix = template.split("%d")
+        counters[template] = int(package.next_partname(template)[len(prefix):-len(suffix)])
+    n = counters[template]
+    counters[template] = n + 1
+    return PackURI(template % n)
+
+
+def add_chart(shapes, chart_type, x, y, cx, cy, chart_data):
+    """SlideShapes.add_chart with counter-numbered chart and workbook parts; returns the frame."""
+    package = shapes.part.package
+    chart_part = ChartPart.load(_next_partname(package, ChartPart.partname_template), CT.DML_CHART,
+                                package, chart_data.xml_bytes(chart_type))
+    chart_part.chart_workbook.xlsx_part = EmbeddedXlsxPart(
+        _next_partname(package, EmbeddedXlsxPart.partname_template), EmbeddedXlsxPart.content_type,
+        package, chart_data.xlsx_blob)
+    rId = shapes.part.relate_to(chart_part, RT.CHART)
+    graphic_frame = shapes._add_chart_graphicFrame(rId, x, y, cx, cy)
+    return shapes._shape_factory(graphic_frame)
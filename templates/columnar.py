@@ -0,0 +1,231 @@
+"""
+Columnar Table Sources
+
+Lets the financial and peer tables come from CSV, Parquet or Arrow IPC
+(.arrow/.feather) files instead of nested lists in the deck JSON. A
+TableSource streams the file and keeps only the label column plus the
+columns the slide shows, so a 3,000-ticker peer universe costs no more memory
+than the handful of peers on the slide. Parquet and Arrow need pyarrow, which
+is imported only when such a file is read.
+
+In deck data, any of income_rows, balance_rows, peer_rows or
+valuation_metrics may be a source spec; paths are relative to the working
+directory:
+
+    "income_rows": {"source": "data/aapl-income.parquet", "format": "${:,.1f}B"},
+    "balance_rows": {"source": "data/aapl-balance.csv", "format": "currency"},
+    "peer_rows": {"source": "data/peer-universe.csv", "rows": ["Forward P/E", "EV/EBITDA"]}
+
+Spec keys:
+    source   file path (.csv, .parquet, .arrow, .feather)
+    label    label column (default: the file's first column)
+    columns  value columns (default: income_years / balance_years, the ticker
+             plus peers for peer_rows, every other column for valuation_metrics)
+    rows     only these labels, in this order; a label missing from the
+             file raises KeyError
+    limit    stop after this many rows
+    format   str.format pattern for numeric cells, a cell kind from
+             templates/cells.py ("currency", "percent", "multiple", ...),
+             or {column: pattern or kind}
+
+build_deck() resolves specs through resolve_sources(), and the builders
+iterate the sources directly.
+"""
+
+import csv
+import os
+
+TABLE_KEYS = ("valuation_metrics", "income_rows", "balance_rows", "peer_rows")
+_ARROW_BATCH_ROWS = 4096
+
+
+class TableSource:
+    """Iterable of [label, value, ...] rows read lazily from a columnar file."""
+
+    def __init__(self, path, columns=None, label=None, rows=None, limit=None, format=None):
+        self.path = path
+        self.columns = list(columns) if columns is not None else None
+        self.label = label
+        self.rows = list(rows) if rows is not None else None
+        self.limit = limit
+        self.format = format
+
+    def __repr__(self):
+        # Includes size and mtime so the slide cache key changes with the file
+        st = os.stat(self.path)
+        return (f"TableSource({self.path!r}, columns={self.columns!r}, label={self.label!r}, "
+                f"rows={self.rows!r}, limit={self.limit!r}, format={self.format!r}, "
+                f"size={st.st_size}, mtime_ns={st.st_mtime_ns})")
+
+    def __iter__(self):
+        ext = os.path.splitext(self.path)[1].lower()
+        if ext == ".csv":
+            columns, records = self._read_csv()
+        elif ext in (".parquet", ".arrow", ".feather", ".ipc"):
+            columns, records = self._read_arrow(ext)
+        else:
+            raise ValueError(f"{self.path}: unsupported table source type {ext!r}")
+        formatters = [self._formatter(c) for c in columns[1:]]
+        records = (
+            [str(record[0])] + [fmt(v) for fmt, v in zip(formatters, record[1:])]
+            for record in records
+        )
+        if self.rows is None:
+            for i, record in enumerate(records):
+                if self.limit is not None and i >= self.limit:
+                    return
+                yield record
+            return
+        # Keep only the requested labels, emitted in the requested order;
+        # stop reading once every one has been seen
+        wanted = {label: None for label in self.rows}
+        remaining = len(wanted)
+        for record in records:
+            if record[0] in wanted and wanted[record[0]] is None:
+                wanted[record[0]] = record
+                remaining -= 1
+                if not remaining:
+                    break
+        records.close()
+        missing = [label for label, record in wanted.items() if record is None]
+        if missing:
+            raise KeyError(f"{self.path}: no row(s) {', '.join(map(repr, missing))}")
+        yield from list(wanted.values())[:self.limit]
+
+    def _names(self, header):
+        """The label and value column names read from a file with this header."""
+        label = self.label if self.label is not None else header[0]
+        columns = self.columns if self.columns is not None else [c for c in header if c != label]
+        return [label] + columns
+
+    def _select(self, header):
+        """Indices of the label and value columns within header."""
+        names = self._names(header)
+        missing = [c for c in names if c not in header]
+        if missing:
+            raise KeyError(f"{self.path}: no column(s) {', '.join(map(repr, missing))}")
+        return names, [header.index(c) for c in names]
+
+    def header(self):
+        """Column names of the file, read without reading any rows."""
+        ext = os.path.splitext(self.path)[1].lower()
+        if ext == ".csv":
+            with open(self.path, newline="") as f:
+                header = next(csv.reader(f), None)
+            if header is None:
+                raise ValueError(f"{self.path}: empty CSV file")
+            return header
+        if ext not in (".parquet", ".arrow", ".feather", ".ipc"):
+            raise ValueError(f"{self.path}: unsupported table source type {ext!r}")
+        pa, pq = _pyarrow(ext)
+        if ext == ".parquet":
+            return pq.read_schema(self.path).names
+        with pa.memory_map(self.path) as source:
+            return pa.ipc.open_file(source).schema.names
+
+    def missing_columns(self):
+        """Label and value columns the file lacks; [] when the slide can be read from it."""
+        header = self.header()
+        return [c for c in self._names(header) if c not in header]
+
+    def _read_csv(self):
+        with open(self.path, newline="") as f:
+            header = next(csv.reader(f), None)
+        if header is None:
+            raise ValueError(f"{self.path}: empty CSV file")
+        names, indices = self._select(header)
+        width = max(indices) + 1
+
+        def records():
+            with open(self.path, newline="") as f:
+                reader = csv.reader(f)
+                next(reader)
+                for line in reader:
+                    if line:
+                        if len(line) < width:  # ragged row: missing trailing cells are empty
+                            line += [""] * (width - len(line))
+                        yield [line[i] for i in indices]
+        return names, records()
+
+    def _read_arrow(self, ext):
+        pa, pq = _pyarrow(ext)
+
+        # The Parquet file or memory map is closed once the records are read,
+        # abandoned, or found not to have the wanted columns
+        if ext == ".parquet":
+            source = pq.ParquetFile(self.path)
+        else:
+            source = pa.memory_map(self.path)
+        try:
+            if ext == ".parquet":
+                names, _ = self._select(source.schema_arrow.names)
+                batches = source.iter_batches(batch_size=_ARROW_BATCH_ROWS, columns=names)
+            else:
+                reader = pa.ipc.open_file(source)
+                names, _ = self._select(reader.schema.names)
+                batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except BaseException:
+            source.close()
+            raise
+
+        def records():
+            try:
+                for batch in batches:
+                    columns = [batch.column(batch.schema.get_field_index(c)).to_pylist() for c in names]
+                    yield from (list(record) for record in zip(*columns))
+            finally:
+                source.close()
+        return names, records()
+
+    def _formatter(self, column):
+        pattern = self.format.get(column) if isinstance(self.format, dict) else self.format
+        if pattern is None:
+            return lambda v: "" if v is None else str(v)
+        from templates.cells import KINDS, number_format
+        format_value = (number_format(pattern).format_value if pattern in KINDS
+                        else lambda v: pattern.format(v))
+
+        def fmt(v):
+            if v is None or v == "":
+                return ""
+            try:
+                return format_value(float(v))
+            except ValueError:
+                return str(v)
+        return fmt
+
+
+def _pyarrow(ext):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(f"reading {ext} table sources requires pyarrow (pip install pyarrow)")
+    return pa, pq
+
+
+def _default_columns(key, d):
+    if key == "income_rows":
+        return d["income_years"]
+    if key == "balance_rows":
+        return d["balance_years"]
+    if key == "peer_rows":
+        return [d["ticker"]] + d["peers"]
+    return None
+
+
+def table_source(key, spec, d):
+    """The TableSource for the source spec under key of deck data d."""
+    columns = spec["columns"] if "columns" in spec else _default_columns(key, d)
+    return TableSource(spec["source"], columns, spec.get("label"), spec.get("rows"),
+                       spec.get("limit"), spec.get("format"))
+
+
+def resolve_sources(d):
+    """Return a copy of deck data with table source specs replaced by TableSources."""
+    out = dict(d)
+    for key in TABLE_KEYS:
+        spec = d.get(key)
+        if isinstance(spec, dict):
+            out[key] = table_source(key, spec, d)
+    return out
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Vectorized Peer Comps Engine
+
+Comparable company analysis from skills/valuation.md over a universe of
+thousands of companies instead of a hand-picked peer list. The universe is
+held column by column in NumPy arrays; for a ticker, peers are picked from
+its sector within a market-cap band, nearest first on normalized
+fundamentals (size, revenue growth, EBITDA margin, ROE). The peer median
+P/E, EV/EBITDA and P/B are applied to the ticker's EPS, EBITDA and book
+value, and the implied values averaged into a comps fair value.
+
+Usage:
+    python templates/comps.py universe.csv AAPL MSFT --peers 4
+    python templates/comps.py universe.csv AAPL --json          # deck keys
+    python templates/comps.py universe.csv --all                # time every ticker
+    python templates/comps.py universe.csv --save universe.npz  # faster to load
+
+Or programmatically:
+    from templates.comps import comps, comps_inputs, load_universe
+
+    universe = load_universe("universe.csv")
+    result = comps(universe, "AAPL", peers=4)
+    d.update(comps_inputs(result, universe, price=d["price"]))
+
+A universe file has one row per company with the columns ticker, sector
+and FIELDS (market_cap, net_debt, ebitda, revenue and book_value in
+dollars, eps and price per share, revenue_growth as a fraction). CSV,
+Parquet and Arrow/Feather (with pyarrow) and .npz are read; a missing
+value is an empty cell. A deck data file can carry a "comps" block instead
+of hand-built peers; build_deck() fills peers, peer_rows and the Comps
+valuation row from it via apply_comps():
+
+    "comps": {"universe": "data/universe.csv", "peers": 4, "band": 3.0, "weight": "50%"}
+
+The deck's ticker is looked up unless the block names another ("ticker").
+
+templates/sample_data.py --universe N writes a synthetic universe.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from templates.cells import CellTable, Column, number_format
+
+FIELDS = ("price", "market_cap", "eps", "ebitda", "net_debt", "book_value",
+          "revenue", "revenue_growth")
+MULTIPLES = ("P/E", "EV/EBITDA", "P/B")
+# Peer table rows: (label, cell kind)
+PEER_ROWS = (("Market Cap", "currency"), ("P/E", "multiple"), ("EV/EBITDA", "multiple"),
+             ("P/B", "multiple"), ("Revenue Growth", "percent"), ("EBITDA Margin", "percent"))
+# Keys of a deck data "comps" block (checked by templates/deck_schema.py)
+BLOCK_KEYS = ("universe", "peers", "band", "weight", "ticker")
+DEFAULT_PEERS = 4
+DEFAULT_BAND = 3.0        # peers within 1/3x .. 3x the ticker's market cap
+BAND_DOUBLINGS = 3        # widen the band up to 8x before falling back to the whole sector
+_FEATURE_CLIP = 4.0       # z-score cap, so one outlier cannot dominate the distance
+
+
+# =============================================================================
+# UNIVERSE
+# =============================================================================
+
+def _standardize(features):
+    """Z-score each column over the universe; missing values sit at the mean."""
+    with np.errstate(invalid="ignore"):
+        mean = np.nanmean(np.where(np.isfinite(features), features, np.nan), axis=0)
+        sd = np.nanstd(np.where(np.isfinite(features), features, np.nan), axis=0)
+    sd[~(sd > 0)] = 1.0
+    z = (features - mean) / sd
+    z[~np.isfinite(z)] = 0.0
+    return np.clip(z, -_FEATURE_CLIP, _FEATURE_CLIP)
+
+
+class Universe:
+    """Fundamentals of many companies, one float64 array per field.
+
+    tickers: sequence of unique ticker strings
+    sectors: sector name per ticker
+    columns: {field: values} for every name in FIELDS (NaN for missing)
+    """
+
+    def __init__(self, tickers, sectors, columns):
+        self.tickers = np.asarray(tickers, dtype=str)
+        n = len(self.tickers)
+        missing = [name for name in FIELDS if name not in columns]
+        if missing:
+            raise ValueError(f"universe is missing columns: {', '.join(missing)}")
+        self.columns = {name: np.asarray(columns[name], dtype=float) for name in FIELDS}
+        for name, values in self.columns.items():
+            if values.shape != (n,):
+                raise ValueError(f"column {name} has {len(values)} values for {n} tickers")
+        self._index = {ticker: i for i, ticker in enumerate(self.tickers.tolist())}
+        if len(self._index) != n:
+            raise ValueError("universe tickers are not unique")
+        self.sector_names, self.sector_codes = np.unique(np.asarray(sectors, dtype=str),
+                                                         return_inverse=True)
+        self.sector_codes = self.sector_codes.ravel()
+        if len(self.sector_codes) != n:
+            raise ValueError(f"{len(self.sector_codes)} sectors for {n} tickers")
+
+        c = self.columns
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.shares = c["market_cap"] / c["price"]
+            ev = c["market_cap"] + c["net_debt"]
+            multiples = np.column_stack([c["price"] / c["eps"], ev / c["ebitda"],
+                                         c["market_cap"] / c["book_value"]])
+            features = np.column_stack([np.log10(c["market_cap"]), c["revenue_growth"],
+                                        c["ebitda"] / c["revenue"],
+                                        c["eps"] * self.shares / c["book_value"]])
+            self.log_cap = np.log(c["market_cap"])
+        # A negative or undefined multiple says nothing about value
+        multiples[~(np.isfinite(multiples) & (multiples > 0))] = np.nan
+        self.multiples = multiples
+        self.features = _standardize(features)
+        self._comparable = ~np.isnan(multiples).all(axis=1) & np.isfinite(self.log_cap)
+        # Row indices of each sector's members
+        order = np.argsort(self.sector_codes, kind="stable")
+        bounds = np.searchsorted(self.sector_codes[order], np.arange(len(self.sector_names) + 1))
+        self._members = [order[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self._index
+
+    def index(self, ticker):
+        """Row of a ticker; KeyError when it is not in the universe."""
+        try:
+            return self._index[ticker]
+        except KeyError:
+            raise KeyError(f"{ticker} is not in the comps universe") from None
+
+    def sector(self, ticker):
+        return str(self.sector_names[self.sector_codes[self.index(ticker)]])
+
+    def peers(self, ticker, peers=DEFAULT_PEERS, band=DEFAULT_BAND):
+        """Row indices of the ticker's nearest peers, nearest first.
+
+        Candidates are the other companies in its sector with at least one
+        usable multiple and a market cap within 1/band .. band of its own.
+        The band is doubled up to BAND_DOUBLINGS times while it holds fewer
+        than peers candidates, then the whole sector is used.
+        """
+        if band <= 1:
+            raise ValueError(f"band must be greater than 1, got {band}")
+        i = self.index(ticker)
+        members = self._members[self.sector_codes[i]]
+        members = members[(members != i) & self._comparable[members]]
+        pool = members
+        with np.errstate(invalid="ignore"):
+            gap = np.abs(self.log_cap[members] - self.log_cap[i])
+            for doubling in range(BAND_DOUBLINGS + 1):
+                in_band = members[gap <= np.log(band) + doubling * np.log(2)]
+                if len(in_band) >= peers:
+                    pool = in_band
+                    break
+        diff = self.features[pool] - self.features[i]
+        distance = np.einsum("ij,ij->i", diff, diff)
+        if len(pool) > peers:
+            nearest = np.argpartition(distance, peers)[:peers]
+            pool, distance = pool[nearest], distance[nearest]
+        return pool[np.lexsort((pool, distance))]
+
+    def save(self, path):
+        """Write the universe as .npz (fastest to load) or .csv."""
+        sectors = self.sector_names[self.sector_codes]
+        if path.endswith(".npz"):
+            np.savez(path, ticker=self.tickers, sector=sectors, **self.columns)
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("ticker", "sector") + FIELDS)
+            values = np.column_stack([self.columns[name] for name in FIELDS]).tolist()
+            for ticker, sector, row in zip(self.tickers.tolist(), sectors.tolist(), values):
+                writer.writerow([ticker, sector] + ["" if v != v else repr(v) for v in row])
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Universe from {"ticker": [...], "sector": [...], field: [...]}."""
+        return cls(columns["ticker"], columns["sector"], columns)
+
+
+def _float_column(values):
+    return np.array([float(v) if v not in ("", None) else np.nan for v in values], dtype=float)
+
+
+def _read_columns(path):
+    """{column: values} from a CSV, Parquet, Arrow/Feather or .npz universe file."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npz":
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    if ext in (".parquet", ".arrow", ".feather"):
+        try:
+            import pyarrow.feather as feather
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(f"reading {ext} universes requires pyarrow (pip install pyarrow)")
+        table = pq.read_table(path) if ext == ".parquet" else feather.read_table(path)
+        columns = {}
+        for name in table.column_names:
+            column = table.column(name)
+            if name in FIELDS:
+                columns[name] = column.to_numpy(zero_copy_only=False).astype(float)
+            else:
+                columns[name] = column.to_pylist()
+        return columns
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row]
+    values = list(zip(*rows)) if rows else [()] * len(header)
+    return {name: _float_column(column) if name in FIELDS else list(column)
+            for name, column in zip(header, values)}
+
+
+_LOADED = {}
+
+
+def load_universe(path):
+    """Universe from a file, kept in memory until the file changes."""
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _LOADED:
+        columns = _read_columns(path)
+        missing = [name for name in ("ticker", "sector") if name not in columns]
+        if missing:
+            raise ValueError(f"{path}: universe is missing columns: {', '.join(missing)}")
+        _LOADED.clear()
+        _LOADED[key] = Universe.from_columns(columns)
+    return _LOADED[key]
+
+
+# =============================================================================
+# COMPS
+# =============================================================================
+
+def _medians(values):
+    """Column medians ignoring NaN; NaN for a column with no values."""
+    if not len(values):
+        return np.full(values.shape[1], np.nan)
+    ordered = np.sort(values, axis=0)  # NaN sorts last
+    count = (~np.isnan(values)).sum(axis=0)
+    lo = np.take_along_axis(ordered, np.maximum(count - 1, 0)[None] // 2, axis=0)
+    hi = np.take_along_axis(ordered, count[None] // 2, axis=0)
+    return ((lo + hi) / 2)[0]
+
+
+def comps(universe, ticker, peers=DEFAULT_PEERS, band=DEFAULT_BAND):
+    """Peer medians and comps fair value for one ticker.
+
+    Returns {"ticker", "peers": [tickers], "medians": {multiple: value},
+    "implied": {multiple: per-share value}, "fair_value"}, with NaN where a
+    multiple cannot be applied (no peer value, or the ticker's EPS, EBITDA
+    or book value is not positive). fair_value averages the implied values;
+    "rows" holds the universe rows of the ticker and then its peers.
+    """
+    i = universe.index(ticker)
+    rows = universe.peers(ticker, peers, band)
+    medians = _medians(universe.multiples[rows])
+    c = universe.columns
+    metrics = np.array([c["eps"][i], c["ebitda"][i], c["book_value"][i]])
+    shares = universe.shares[i]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        implied = np.array([medians[0] * metrics[0],
+                            (medians[1] * metrics[1] - c["net_debt"][i]) / shares,
+                            medians[2] * metrics[2] / shares])
+    implied[~(metrics > 0) | ~np.isfinite(implied)] = np.nan
+    present = implied[~np.isnan(implied)]
+    return {
+        "ticker": ticker,
+        "rows": np.concatenate([[i], rows]),
+        "peers": universe.tickers[rows].tolist(),
+        "medians": dict(zip(MULTIPLES, medians.tolist())),
+        "implied": dict(zip(MULTIPLES, implied.tolist())),
+        "fair_value": float(present.mean()) if len(present) else float("nan"),
+    }
+
+
+def comps_inputs(result, universe, price=None, weight="50%"):
+    """Deck data keys from a comps() result: peers, peer_rows, comps_row, valuation_note.
+
+    price (default: the universe price) is the current price the comps fair
+    value is compared against; weight fills the Weight column.
+    """
+    rows = result["rows"]
+    c = universe.columns
+    with np.errstate(invalid="ignore", divide="ignore"):
+        table = np.vstack([c["market_cap"][rows], universe.multiples[rows].T,
+                           c["revenue_growth"][rows], c["ebitda"][rows] / c["revenue"][rows]])
+    peer_rows = CellTable([label for label, _ in PEER_ROWS], [Column(v) for v in table.T],
+                          [kind for _, kind in PEER_ROWS])
+    if price is None:
+        price = c["price"][rows[0]]
+    fair = result["fair_value"]
+    upside = fair / price - 1 if price else float("nan")
+    medians = [f"{number_format('multiple').format_value(result['medians'][m])} {m}"
+               for m in MULTIPLES]
+    return {
+        "peers": result["peers"],
+        "peer_rows": peer_rows.rows(),
+        "comps_row": ["Comps", number_format("per_share").format_value(fair),
+                      number_format("delta").format_value(upside), weight],
+        "valuation_note": f"Comps: peer medians of {', '.join(medians)} "
+                          f"({', '.join(result['peers']) or 'no peers'})",
+    }
+
+
+def apply_comps(d):
+    """Return a copy of deck data with peers, peer_rows and the Comps row from d["comps"]."""
+    spec = d["comps"]
+    unknown = sorted(set(spec) - set(BLOCK_KEYS))
+    if unknown:
+        raise ValueError(f"unknown comps keys: {', '.join(unknown)}; expected {', '.join(BLOCK_KEYS)}")
+    universe = load_universe(spec["universe"])
+    result = comps(universe, spec.get("ticker", d["ticker"]), spec.get("peers", DEFAULT_PEERS),
+                   spec.get("band", DEFAULT_BAND))
+    inputs = comps_inputs(result, universe, d["price"], spec.get("weight", "50%"))
+    out = dict(d)
+    out["peers"], out["peer_rows"] = inputs["peers"], inputs["peer_rows"]
+    rows = [list(row) for row in d.get("valuation_rows", [])]
+    for j, row in enumerate(rows):
+        if row and row[0] == "Comps":
+            rows[j] = inputs["comps_row"]
+            break
+    else:
+        rows.append(inputs["comps_row"])
+    out["valuation_rows"] = rows
+    if not d.get("valuation_note"):
+        out["valuation_note"] = inputs["valuation_note"]
+    return out
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Peer comps from a universe of company fundamentals")
+    parser.add_argument("universe", help="Universe file (.csv, .parquet, .arrow, .feather or .npz)")
+    parser.add_argument("tickers", nargs="*", help="Tickers to value")
+    parser.add_argument("--peers", type=int, default=DEFAULT_PEERS, help="Peers per ticker (default: 4)")
+    parser.add_argument("--band", type=float, default=DEFAULT_BAND,
+                        help="Market-cap band as a ratio either way (default: 3)")
+    parser.add_argument("--json", action="store_true", help="Print deck data keys as JSON")
+    parser.add_argument("--all", action="store_true", help="Value every ticker and report the time per ticker")
+    parser.add_argument("--save", help="Write the universe to this .npz or .csv path")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    universe = load_universe(args.universe)
+    print(f"Loaded {len(universe):,} companies in {len(universe.sector_names)} sectors "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms", file=sys.stderr)
+    if args.save:
+        universe.save(args.save)
+        print(f"Saved: {args.save}", file=sys.stderr)
+
+    if args.all:
+        start = time.perf_counter()
+        for ticker in universe.tickers.tolist():
+            comps_inputs(comps(universe, ticker, args.peers, args.band), universe)
+        elapsed = time.perf_counter() - start
+        print(f"Comps for {len(universe):,} tickers in {elapsed:.2f}s "
+              f"({elapsed / max(len(universe), 1) * 1000:.2f} ms per ticker)")
+
+    try:
+        results = [comps(universe, ticker, args.peers, args.band) for ticker in args.tickers]
+    except KeyError as e:
+        sys.exit(f"Error: {e.args[0]}")
+    if args.json:
+        print(json.dumps({r["ticker"]: comps_inputs(r, universe) for r in results}, indent=2))
+        return
+    per_share = number_format("per_share")
+    for r in results:
+        inputs = comps_inputs(r, universe)
+        print(f"{r['ticker']} ({universe.sector(r['ticker'])}): peers {', '.join(r['peers']) or 'none'}")
+        for m in MULTIPLES:
+            print(f"  {m:<10} median {number_format('multiple').format_value(r['medians'][m]):>8}"
+                  f"  implied {per_share.format_value(r['implied'][m]):>10}")
+        print(f"  Fair value {inputs['comps_row'][1]} ({inputs['comps_row'][2]} vs current)")
+
+
+if __name__ == "__main__":
+    main()
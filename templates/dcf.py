@@ -0,0 +1,107 @@
+"""
+Vectorized DCF Sensitivity Engine
+
+NumPy implementation of the DCF steps in skills/valuation.md: project FCF
+for N years, add a Gordon-growth terminal value, discount at WACC, subtract
+net debt and divide by shares outstanding. Every input broadcasts, so a full
+FCF x WACC x terminal-growth grid is computed in one pass with no Python loops.
+
+Usage:
+    from templates.dcf import dcf_fair_values, sensitivity_inputs
+
+    # 2-D: FCF scenario x WACC
+    grid = dcf_fair_values(fcf=[2.0e9, 2.5e9, 3.0e9], wacc=[0.08, 0.10, 0.12],
+                           growth=0.05, terminal_growth=0.025,
+                           net_debt=1.0e9, shares=170e6, grid=True)
+
+    # 3-D: growth x WACC x terminal growth
+    cube = dcf_fair_values(fcf=2.5e9, growth=np.linspace(0, 0.15, 31),
+                           wacc=np.linspace(0.07, 0.13, 25),
+                           terminal_growth=[0.02, 0.025, 0.03], ...)
+
+    d.update(sensitivity_inputs(["Bear", "Base", "Bull"], [0.08, 0.10, 0.12], grid))
+
+A deck data file can also carry a "dcf" block instead of a hand-built
+sensitivity matrix; build_deck() fills the slide from it via apply_dcf():
+
+    "dcf": {"fcf": [2.0e9, 2.5e9, 3.0e9], "scenario_labels": ["Bear", "Base", "Bull"],
+            "waccs": [0.08, 0.10, 0.12], "growth": 0.05, "terminal_growth": 0.025,
+            "net_debt": 1.0e9, "shares": 170e6, "years": 5}
+"""
+
+import numpy as np
+
+from templates.cells import number_format
+
+
+def dcf_fair_values(fcf, wacc, growth, terminal_growth, net_debt, shares, years=5, grid=False):
+    """Per-share DCF fair value, broadcast over all array inputs.
+
+    fcf: current annual free cash flow
+    wacc: discount rate, e.g. 0.10
+    growth: annual FCF growth over the projection years
+    terminal_growth: perpetual growth after the projection years
+    net_debt, shares: subtracted from / divide the enterprise value
+    grid: if True, the 1-D inputs fcf, growth, wacc and terminal_growth (in
+          that order) each get their own axis, skipping scalars, so e.g.
+          3 FCF values x 5 WACCs give a (3, 5) grid. Otherwise inputs
+          broadcast with normal NumPy rules.
+
+    Cells where wacc <= terminal_growth have no finite value and are NaN.
+    """
+    fcf, growth, wacc, terminal_growth = (np.asarray(x, dtype=float)
+                                          for x in (fcf, growth, wacc, terminal_growth))
+    if grid:
+        axes = [x for x in (fcf, growth, wacc, terminal_growth) if x.ndim]
+        if any(x.ndim > 1 for x in axes):
+            raise ValueError("grid=True takes scalar or 1-D inputs")
+        shaped = iter(np.ix_(*axes)) if axes else iter(())
+        fcf, growth, wacc, terminal_growth = (next(shaped) if x.ndim else x
+                                              for x in (fcf, growth, wacc, terminal_growth))
+
+    # Sum of fcf * q^t for t = 1..years with q = (1 + g) / (1 + w), in closed form
+    q = (1 + growth) / (1 + wacc)
+    q_n = q ** years
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(np.isclose(q, 1.0), float(years), q * (1 - q_n) / (1 - q))
+        pv_fcf = fcf * annuity
+        # Terminal value at year N, discounted back N years
+        pv_terminal = fcf * q_n * (1 + terminal_growth) / (wacc - terminal_growth)
+    pv_terminal = np.where(wacc > terminal_growth, pv_terminal, np.nan)
+    return (pv_fcf + pv_terminal - net_debt) / shares
+
+
+def format_price(values, decimals=0):
+    """Format an array of per-share values as "$1,234" strings ("n/a" for NaN)."""
+    fmt = number_format("per_share", decimals)
+    return [fmt.format_array(row, missing="n/a")
+            for row in np.atleast_2d(np.asarray(values, dtype=float))]
+
+
+def sensitivity_inputs(scenario_labels, waccs, grid, decimals=0):
+    """Deck data keys for build_sensitivity_analysis from a (scenario, WACC) grid."""
+    grid = np.asarray(grid)
+    if grid.shape != (len(scenario_labels), len(waccs)):
+        raise ValueError(f"grid shape {grid.shape} does not match "
+                         f"{len(scenario_labels)} scenarios x {len(waccs)} WACCs")
+    return {
+        "sensitivity_scenarios": list(scenario_labels),
+        "sensitivity_waccs": [f"WACC {w * 100:g}%" for w in waccs],
+        "sensitivity_matrix": format_price(grid, decimals),
+    }
+
+
+def apply_dcf(d):
+    """Return a copy of deck data with the sensitivity keys computed from d["dcf"]."""
+    spec = d["dcf"]
+    fcf = np.asarray(spec["fcf"], dtype=float)
+    labels = spec.get("scenario_labels") or [f"${v / 1e9:.1f}B FCF" for v in fcf]
+    grid = dcf_fair_values(fcf, spec["waccs"], spec.get("growth", 0.05),
+                           spec.get("terminal_growth", 0.025), spec.get("net_debt", 0.0),
+                           spec["shares"], spec.get("years", 5), grid=True)
+    out = dict(d)
+    out.update(sensitivity_inputs(labels, spec["waccs"], grid))
+    out.setdefault("sensitivity_note",
+                   f"{spec.get('years', 5)}-year FCF growth {spec.get('growth', 0.05) * 100:g}%, "
+                   f"terminal growth {spec.get('terminal_growth', 0.025) * 100:g}%")
+    return out
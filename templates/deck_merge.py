@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+Sector Books: Zip-Level Deck Merging
+
+Merges finished stock analysis decks into one sector book by copying OPC
+parts between the .pptx zip containers directly. No deck is ever loaded into
+python-pptx: slide XML is copied byte for byte and only relationship files
+and presentation.xml are rewritten.
+
+    - Slides, charts, embedded workbooks and other slide-owned parts are
+      renumbered (slide1.xml, chart1.xml, ...) as they are copied, and every
+      relationship target is rewritten to the new names.
+    - Slide masters are compared by the content of everything they relate to
+      (layouts, theme, images). Decks rendered from the same template share
+      one master and layout set; a deck with a different master brings its
+      own, with fresh master and layout ids.
+    - Media is stored once per distinct content hash.
+    - A contents slide lists every ticker with its page, and each ticker
+      starts with a divider slide and a PowerPoint section of its own.
+
+Sources are opened one at a time and every part is written to the output zip
+as soon as it is copied, so memory stays bounded by the largest part plus a
+small index, whether the book has five decks or five hundred. Speaker notes
+are not carried over.
+
+Usage:
+    python templates/deck_merge.py output/stock/*/*-analysis.pptx -o output/stock/gaming-book.pptx
+    python templates/deck_merge.py a.pptx b.pptx -o book.pptx --title "Gaming Sector" --no-toc
+
+Or programmatically:
+    from templates.deck_merge import merge_decks
+    merge_decks(["aapl.pptx", "msft.pptx"], "book.pptx", title="Mega Caps")
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import posixpath
+import re
+import sys
+import time
+import uuid
+import zipfile
+from xml.sax.saxutils import escape as xml_escape
+
+from lxml import etree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PR_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+P14_NS = "http://schemas.microsoft.com/office/powerpoint/2010/main"
+SECTION_EXT_URI = "{521415D9-36F7-43E2-AB2F-B90AF26B5E84}"
+
+RT_OFFICE_DOCUMENT = R_NS + "/officeDocument"
+RT_SLIDE = R_NS + "/slide"
+RT_SLIDE_LAYOUT = R_NS + "/slideLayout"
+RT_SLIDE_MASTER = R_NS + "/slideMaster"
+RT_NOTES_SLIDE = R_NS + "/notesSlide"
+
+FIRST_SLIDE_ID = 256
+FIRST_MASTER_ID = 2147483648
+_DECK_NAME = re.compile(r"^\d{4}-\d{2}-\d{2}-(.+?)-analysis\.pptx$", re.IGNORECASE)
+_NUMBERED = re.compile(r"^(.*?)(\d*)(\.[^./]*)?$")
+LABEL_PLACEHOLDER = "{{label}}"
+TITLE_PLACEHOLDER = "{{title}}"
+
+
+def _q(ns, tag):
+    return f"{{{ns}}}{tag}"
+
+
+def _rels_name(part):
+    """ppt/slides/slide1.xml -> ppt/slides/_rels/slide1.xml.rels"""
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, "_rels", name + ".rels")
+
+
+def _resolve(part, target):
+    """Absolute part name (no leading slash) of a relationship target."""
+    if target.startswith("/"):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part), target))
+
+
+def _relative(part, target):
+    return posixpath.relpath(target, posixpath.dirname(part) or ".")
+
+
+def _xml(root):
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def deck_label(path):
+    """Section label for a deck: the ticker of YYYY-MM-DD-<ticker>-analysis.pptx, else the file stem."""
+    name = os.path.basename(path)
+    match = _DECK_NAME.match(name)
+    return match.group(1).upper() if match else os.path.splitext(name)[0]
+
+
+# =============================================================================
+# SOURCE DECKS
+# =============================================================================
+
+class ZipSource:
+    """Read-only view of one .pptx zip: parts, relationships and content types."""
+
+    def __init__(self, file):
+        self.zip = zipfile.ZipFile(file)
+        types = etree.fromstring(self.zip.read("[Content_Types].xml"))
+        self.defaults = {e.get("Extension").lower(): e.get("ContentType")
+                         for e in types.iterfind(_q(CT_NS, "Default"))}
+        self.overrides = {e.get("PartName").lstrip("/"): e.get("ContentType")
+                          for e in types.iterfind(_q(CT_NS, "Override"))}
+        self.presentation = next(target for rel, target in self.related("")
+                                 if rel.get("Type") == RT_OFFICE_DOCUMENT)
+        pres_rels = {rel.get("Id"): target for rel, target in self.related(self.presentation)}
+        root = etree.fromstring(self.zip.read(self.presentation))
+        self.slides = [pres_rels[e.get(_q(R_NS, "id"))]
+                       for e in root.iterfind(f"{_q(P_NS, 'sldIdLst')}/{_q(P_NS, 'sldId')}")]
+        self.layout_map = {}
+        self.master_keys = {}
+
+    def read(self, part):
+        return self.zip.read(part)
+
+    def has(self, part):
+        return part in self.zip.NameToInfo
+
+    def rels(self, part):
+        """Parsed relationships of part ("" for the package), or None."""
+        try:
+            return etree.fromstring(self.zip.read(_rels_name(part) if part else "_rels/.rels"))
+        except KeyError:
+            return None
+
+    def related(self, part):
+        """Yield (relationship element, target part) for part's internal relationships."""
+        rels = self.rels(part)
+        if rels is None:
+            return
+        for rel in rels:
+            if rel.get("TargetMode") != "External":
+                yield rel, _resolve(part, rel.get("Target"))
+
+    def content_type(self, part):
+        ext = posixpath.splitext(part)[1][1:].lower()
+        return self.overrides.get(part) or self.defaults.get(ext)
+
+    def title(self):
+        """First line of text on the first slide, or None."""
+        if not self.slides:
+            return None
+        root = etree.fromstring(self.read(self.slides[0]))
+        for paragraph in root.iter(_q(A_NS, "p")):
+            text = "".join(t.text or "" for t in paragraph.iter(_q(A_NS, "t"))).strip()
+            if text:
+                return text
+        return None
+
+    def close(self):
+        self.zip.close()
+
+
+class PackageSource(ZipSource):
+    """Source view of a live python-pptx presentation.
+
+    Lets a DeckMerger copy slides straight out of a presentation that is
+    still being built (see StreamingDeck in stock_analysis_slides.py). Call
+    refresh() after adding slides; parts are serialized as they are read.
+    """
+
+    def __init__(self, prs):
+        from pptx.opc.constants import CONTENT_TYPE as CT
+
+        self.prs = prs
+        self.package = prs.part.package
+        self.presentation = prs.part.partname[1:]
+        self.defaults = {"rels": CT.OPC_RELATIONSHIPS, "xml": CT.XML}
+        self.layout_map = {}
+        self.master_keys = {}
+        self.refresh()
+
+    def refresh(self):
+        self.parts = {part.partname[1:]: part for part in self.package.iter_parts()}
+        rels = self.prs.part.rels
+        self.slides = [rels[slide_id.rId].target_part.partname[1:]
+                       for slide_id in self.prs.slides._sldIdLst]
+
+    def read(self, part):
+        return self.parts[part].blob
+
+    def has(self, part):
+        return part in self.parts
+
+    def rels(self, part):
+        rels = self.parts[part].rels if part else self.package._rels
+        return etree.fromstring(rels.xml) if len(rels) else None
+
+    def content_type(self, part):
+        return self.parts[part].content_type
+
+    def close(self):
+        pass
+
+
+def survey(path):
+    """(label, title, slide count) of a deck, reading only presentation.xml and its first slide."""
+    src = ZipSource(path)
+    try:
+        return deck_label(path), src.title(), len(src.slides)
+    finally:
+        src.close()
+
+
+# =============================================================================
+# MERGER
+# =============================================================================
+
+class DeckMerger:
+    """Streams slides from any number of decks into one .pptx zip.
+
+    The first deck added supplies the presentation-level parts (masters,
+    layouts, theme, properties, slide size). Call add_slides() for each
+    source in order, then close() to write presentation.xml, its
+    relationships and [Content_Types].xml.
+    """
+
+    def __init__(self, output):
+        if isinstance(output, str):
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        self.zip = zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED)
+        self.presentation = None
+        self.content_types = {}
+        self.defaults = {}
+        self.counters = {}
+        self.media = {}
+        self.masters = set()
+        self.layouts = {}
+        self.pres_rels = []
+        self.slides = []
+        self.sections = []
+        self.stats = {"decks": 0, "slides": 0, "parts": 0, "masters": 0,
+                      "media_reused": 0, "notes_dropped": 0}
+
+    # -- output parts ---------------------------------------------------------
+
+    def _register(self, name):
+        prefix, digits, ext = _NUMBERED.match(name).groups()
+        key = (prefix, ext)
+        self.counters[key] = max(self.counters.get(key, 0), int(digits or 0))
+
+    def _new_name(self, name):
+        """Next free name in name's numbered series (ppt/charts/chart7.xml, ...)."""
+        prefix, _, ext = _NUMBERED.match(name).groups()
+        key = (prefix, ext)
+        n = self.counters.get(key, 0) + 1
+        self.counters[key] = n
+        return f"{prefix}{n}{ext or ''}"
+
+    def _write(self, src, name, out, data, rels=None):
+        self.zip.writestr(out, data)
+        self.content_types[out] = sys.intern(src.content_type(name) or "")
+        if rels is not None:
+            self.zip.writestr(_rels_name(out), _xml(rels))
+        self.stats["parts"] += 1
+
+    def _write_part(self, src, name, out, part_map, data=None):
+        """Write src part name as out, with every relationship target mapped into the output."""
+        if data is None:
+            data = src.read(name)
+        rels = src.rels(name)
+        if rels is not None:
+            for rel in list(rels):
+                if rel.get("TargetMode") == "External":
+                    continue
+                target = self._map_target(src, _resolve(name, rel.get("Target")),
+                                          rel.get("Type"), part_map)
+                if target is None:
+                    rels.remove(rel)
+                else:
+                    rel.set("Target", _relative(out, target))
+        self._write(src, name, out, data, rels)
+
+    def _map_target(self, src, target, rel_type, part_map):
+        """Output name for a related part, copying it on first sight (None drops the relationship)."""
+        if target in part_map:
+            return part_map[target]
+        if rel_type == RT_SLIDE_LAYOUT:
+            return self._layout(src, target)
+        if rel_type == RT_NOTES_SLIDE:
+            self.stats["notes_dropped"] += 1
+            return None
+        if not src.has(target):
+            return None
+        if target.startswith("ppt/media/"):
+            data = src.read(target)
+            digest = _digest(data)
+            out = self.media.get(digest)
+            if out is not None:
+                self.stats["media_reused"] += 1
+            else:
+                out = self.media[digest] = self._new_name(target)
+                self._write(src, target, out, data)
+            part_map[target] = out
+            return out
+        out = part_map[target] = self._new_name(target)
+        self._write_part(src, target, out, part_map)
+        return out
+
+    # -- masters and layouts ---------------------------------------------------
+
+    def _master_key(self, src, master):
+        """Content hash of a master and everything it relates to, in relationship order."""
+        key = src.master_keys.get(master)
+        if key is None:
+            h = hashlib.sha256()
+            seen, queue = {master}, [master]
+            while queue:
+                part = queue.pop(0)
+                h.update(src.read(part))
+                h.update(b"\0")
+                rels = sorted(src.related(part), key=lambda r: int(re.sub(r"\D", "", r[0].get("Id")) or 0))
+                for _, target in rels:
+                    if target not in seen and src.has(target):
+                        seen.add(target)
+                        queue.append(target)
+            key = src.master_keys[master] = h.hexdigest()
+        return key
+
+    def _master_layouts(self, src, master):
+        return [target for rel, target in src.related(master) if rel.get("Type") == RT_SLIDE_LAYOUT]
+
+    def _layout(self, src, layout):
+        """Output layout for a source layout, importing its master if it is new."""
+        out = src.layout_map.get(layout)
+        if out is None:
+            master = next(target for rel, target in src.related(layout)
+                          if rel.get("Type") == RT_SLIDE_MASTER)
+            key = self._master_key(src, master)
+            if key not in self.masters:
+                self._import_master(src, master, key)
+            out = src.layout_map[layout] = self.layouts[key, _digest(src.read(layout))]
+        return out
+
+    def _import_master(self, src, master, key):
+        """Copy a master the book does not have yet, with its layouts, theme and images."""
+        layouts = self._master_layouts(src, master)
+        part_map = {master: self._new_name(master)}
+        for layout in layouts:
+            part_map[layout] = self._new_name(layout)
+
+        root = etree.fromstring(src.read(master))
+        for layout_id in root.iter(_q(P_NS, "sldLayoutId")):
+            layout_id.set("id", str(self._next_id()))
+        self._write_part(src, master, part_map[master], part_map, _xml(root))
+        for layout in layouts:
+            self._write_part(src, layout, part_map[layout], part_map)
+            self.layouts[key, _digest(src.read(layout))] = part_map[layout]
+
+        rid = self._pres_rel(RT_SLIDE_MASTER, part_map[master])
+        master_list = self.presentation.find(_q(P_NS, "sldMasterIdLst"))
+        etree.SubElement(master_list, _q(P_NS, "sldMasterId"),
+                         {"id": str(self._next_id()), _q(R_NS, "id"): rid})
+        self.masters.add(key)
+        self.stats["masters"] += 1
+
+    def _next_id(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+    def _pres_rel(self, rel_type, target):
+        rid = f"rId{self.next_rid}"
+        self.next_rid += 1
+        self.pres_rels.append((rid, rel_type, target))
+        return rid
+
+    # -- skeleton -----------------------------------------------------------
+
+    def _load_skeleton(self, src):
+        """Copy src's presentation-level parts verbatim and index its masters and layouts."""
+        self.defaults.update(src.defaults)
+        self.presentation_name = src.presentation
+        self.presentation = etree.fromstring(src.read(src.presentation))
+        slide_list = self.presentation.find(_q(P_NS, "sldIdLst"))
+        if slide_list is not None:
+            slide_list.getparent().remove(slide_list)
+
+        # Everything reachable from the package without passing through a slide
+        seen, queue = set(), [""]
+        while queue:
+            part = queue.pop()
+            for rel, target in src.related(part):
+                if part == src.presentation:
+                    if rel.get("Type") == RT_SLIDE:
+                        continue
+                    self.pres_rels.append((rel.get("Id"), rel.get("Type"), target))
+                if target not in seen and src.has(target):
+                    seen.add(target)
+                    queue.append(target)
+        seen.discard(src.presentation)
+        for part in sorted(seen):
+            rels = src.rels(part)
+            self.zip.writestr(part, src.read(part))
+            if rels is not None:
+                self.zip.writestr(_rels_name(part), _xml(rels))
+            self.content_types[part] = src.content_type(part)
+            self._register(part)
+            if part.startswith("ppt/media/"):
+                self.media.setdefault(_digest(src.read(part)), part)
+        self.zip.writestr("_rels/.rels", _xml(src.rels("")))
+        self.stats["parts"] += len(seen)
+
+        ids = [FIRST_MASTER_ID - 1]
+        for rel_id, rel_type, target in self.pres_rels:
+            if rel_type != RT_SLIDE_MASTER:
+                continue
+            key = self._master_key(src, target)
+            self.masters.add(key)
+            for layout in self._master_layouts(src, target):
+                self.layouts[key, _digest(src.read(layout))] = layout
+            ids.extend(int(e.get("id")) for e in etree.fromstring(src.read(target)).iter(_q(P_NS, "sldLayoutId")))
+        ids.extend(int(e.get("id")) for e in self.presentation.iter(_q(P_NS, "sldMasterId")))
+        self.next_id = max(ids) + 1
+        self.next_rid = max(int(re.sub(r"\D", "", rid) or 0) for rid, _, _ in self.pres_rels) + 1
+        self.stats["masters"] = len(self.masters)
+
+    # -- slides ---------------------------------------------------------------
+
+    def add_slides(self, src, slides=None, section=None, text=None):
+        """Copy slides (default: all, in deck order) from src, optionally opening a new section.
+
+        text maps placeholder strings in the slide XML to the text that
+        replaces them, so one rendered prototype can serve many slides.
+        """
+        if self.presentation is None:
+            self._load_skeleton(src)
+        for ext, content_type in src.defaults.items():
+            self.defaults.setdefault(ext, content_type)
+        slides = src.slides if slides is None else slides
+
+        # Name every slide first so links between them resolve to the copies
+        part_map = {slide: self._new_name("ppt/slides/slide.xml") for slide in slides}
+        if section is not None:
+            self.sections.append((section, []))
+        for slide in slides:
+            out = part_map[slide]
+            data = None
+            if text:
+                data = src.read(slide)
+                for placeholder, value in text.items():
+                    data = data.replace(placeholder.encode(), xml_escape(value).encode())
+            self._write_part(src, slide, out, part_map, data)
+            slide_id = FIRST_SLIDE_ID + len(self.slides)
+            self.slides.append((slide_id, self._pres_rel(RT_SLIDE, out)))
+            if self.sections:
+                self.sections[-1][1].append(slide_id)
+        self.stats["slides"] += len(slides)
+
+    def close(self):
+        """Write presentation.xml, its relationships and the content types, and close the zip."""
+        pres = self.presentation
+        slide_list = etree.Element(_q(P_NS, "sldIdLst"))
+        for slide_id, rid in self.slides:
+            etree.SubElement(slide_list, _q(P_NS, "sldId"), {"id": str(slide_id), _q(R_NS, "id"): rid})
+        pres.find(_q(P_NS, "sldMasterIdLst")).addnext(slide_list)
+        for anchor in ("notesMasterIdLst", "handoutMasterIdLst"):
+            found = pres.find(_q(P_NS, anchor))
+            if found is not None:
+                found.addnext(slide_list)
+        if self.sections:
+            self._write_sections(pres)
+        name = self.presentation_name
+        self.zip.writestr(name, _xml(pres))
+
+        rels = etree.Element(_q(PR_NS, "Relationships"), nsmap={None: PR_NS})
+        for rid, rel_type, target in self.pres_rels:
+            etree.SubElement(rels, _q(PR_NS, "Relationship"),
+                             {"Id": rid, "Type": rel_type, "Target": _relative(name, target)})
+        self.zip.writestr(_rels_name(name), _xml(rels))
+
+        types = etree.Element(_q(CT_NS, "Types"), nsmap={None: CT_NS})
+        for ext, content_type in sorted(self.defaults.items()):
+            etree.SubElement(types, _q(CT_NS, "Default"), {"Extension": ext, "ContentType": content_type})
+        self.content_types[name] = ("application/vnd.openxmlformats-officedocument."
+                                    "presentationml.presentation.main+xml")
+        for part, content_type in sorted(self.content_types.items()):
+            ext = posixpath.splitext(part)[1][1:].lower()
+            if content_type and self.defaults.get(ext) != content_type:
+                etree.SubElement(types, _q(CT_NS, "Override"),
+                                 {"PartName": "/" + part, "ContentType": content_type})
+        self.zip.writestr("[Content_Types].xml", _xml(types))
+        self.zip.close()
+
+    def _write_sections(self, pres):
+        """Replace any PowerPoint section list with one section per add_slides(section=...)."""
+        ext_list = pres.find(_q(P_NS, "extLst"))
+        if ext_list is None:
+            ext_list = etree.SubElement(pres, _q(P_NS, "extLst"))
+        for ext in ext_list.findall(_q(P_NS, "ext")):
+            if ext.get("uri") == SECTION_EXT_URI:
+                ext_list.remove(ext)
+        ext = etree.Element(_q(P_NS, "ext"), {"uri": SECTION_EXT_URI})
+        ext_list.insert(0, ext)
+        section_list = etree.SubElement(ext, _q(P14_NS, "sectionLst"), nsmap={"p14": P14_NS})
+        for i, (name, slide_ids) in enumerate(self.sections):
+            guid = uuid.uuid5(uuid.NAMESPACE_URL, f"section/{i}/{name}")
+            section = etree.SubElement(section_list, _q(P14_NS, "section"),
+                                       {"name": name, "id": "{%s}" % str(guid).upper()})
+            ids = etree.SubElement(section, _q(P14_NS, "sldIdLst"))
+            for slide_id in slide_ids:
+                etree.SubElement(ids, _q(P14_NS, "sldId"), {"id": str(slide_id)})
+
+
+# =============================================================================
+# CONTENTS AND DIVIDER SLIDES
+# =============================================================================
+
+def build_contents(prs, title, entries):
+    """Contents slide(s): one row per deck with its title, slide count and first page.
+    entries: list of (label, deck title, slide count, page) tuples
+    """
+    from pptx.util import Inches
+    from templates.stock_analysis_slides import add_background, add_paginated_table, add_title_bar
+
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    add_background(slide)
+    add_title_bar(slide, title, "Contents")
+    rows = [[label, deck_title or "", str(count), str(page)] for label, deck_title, count, page in entries]
+    add_paginated_table(prs, slide, title, Inches(0.8), Inches(1.6), Inches(11.7),
+                        Inches(0.4) * (len(rows) + 1), ["Section", "Deck", "Slides", "Page"], rows,
+                        col_widths=[Inches(1.8), Inches(7.5), Inches(1.2), Inches(1.2)])
+
+
+def build_divider(prs, label, deck_title=None):
+    """Section divider slide that opens a ticker's deck."""
+    from pptx.util import Inches
+    from pptx.dml.color import RGBColor
+    from pptx.enum.text import PP_ALIGN
+    from templates.stock_analysis_slides import (ACCENT_BLUE, DARK_BLUE, WHITE, add_background,
+                                                 add_bar, add_textbox)
+
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    add_background(slide, DARK_BLUE)
+    add_bar(slide, Inches(1.5), Inches(3.6), Inches(10.333), Inches(0.05), ACCENT_BLUE)
+    add_textbox(slide, Inches(1.5), Inches(2.2), Inches(10.333), Inches(1.2), label,
+                font_size=54, bold=True, color=WHITE, alignment=PP_ALIGN.CENTER)
+    if deck_title:
+        add_textbox(slide, Inches(1.5), Inches(3.9), Inches(10.333), Inches(0.8), deck_title,
+                    font_size=22, color=RGBColor(0xBD, 0xC3, 0xC7), alignment=PP_ALIGN.CENTER)
+    return slide
+
+
+def _front_matter(title, decks, toc, dividers):
+    """Render the contents slides and divider prototypes to an in-memory deck.
+
+    Returns (source, contents slides, divider with title, divider without).
+    Page numbers depend on how many slides the contents table needs, so it
+    is rendered until that count stops changing. Dividers are rendered once
+    with placeholder text and filled in for each deck as they are copied.
+    """
+    from templates.stock_analysis_slides import StockAnalysisDeck
+
+    toc_pages = 1 if toc else 0
+    while True:
+        prs = StockAnalysisDeck().prs
+        if toc:
+            entries, page = [], toc_pages + 1
+            for label, deck_title, count in decks:
+                entries.append((label, deck_title, count, page))
+                page += count + (1 if dividers else 0)
+            build_contents(prs, title, entries)
+        if len(prs.slides) == toc_pages:
+            break
+        toc_pages = len(prs.slides)
+    if dividers:
+        build_divider(prs, LABEL_PLACEHOLDER, TITLE_PLACEHOLDER)
+        build_divider(prs, LABEL_PLACEHOLDER)
+
+    buf = io.BytesIO()
+    prs.save(buf)
+    src = ZipSource(buf)
+    titled, untitled = src.slides[toc_pages:] or (None, None)
+    return src, src.slides[:toc_pages], titled, untitled
+
+
+# =============================================================================
+# SECTOR BOOK
+# =============================================================================
+
+def merge_decks(sources, output, title="Sector Book", labels=None, toc=True, dividers=True):
+    """Merge .pptx decks into one sector book at output (a path or writable binary stream).
+
+    sources are read twice: a quick pass over presentation.xml for slide
+    counts and titles, then one deck at a time for the copy. labels default
+    to the ticker in each file name. Returns the merge stats.
+    """
+    sources = list(sources)
+    labels = list(labels) if labels is not None else [deck_label(path) for path in sources]
+    decks = [(label,) + survey(path)[1:] for label, path in zip(labels, sources)]
+
+    merger = DeckMerger(output)
+    front = None
+    if toc or dividers:
+        front, contents, titled, untitled = _front_matter(title, decks, toc, dividers)
+    try:
+        if sources:
+            # The first deck sets the slide size, masters and properties
+            first = ZipSource(sources[0])
+            merger._load_skeleton(first)
+            first.close()
+        if toc:
+            merger.add_slides(front, contents, section="Contents")
+        for path, (label, deck_title, _) in zip(sources, decks):
+            if dividers:
+                merger.add_slides(front, [titled if deck_title else untitled], section=label,
+                                  text={LABEL_PLACEHOLDER: label, TITLE_PLACEHOLDER: deck_title or ""})
+            src = ZipSource(path)
+            try:
+                merger.add_slides(src, section=None if dividers else label)
+            finally:
+                src.close()
+            merger.stats["decks"] += 1
+    finally:
+        if front is not None:
+            front.close()
+    merger.close()
+    return merger.stats
+
+
+def main():
+    """CLI entry point — merges decks into one sector book."""
+    parser = argparse.ArgumentParser(description="Merge stock analysis decks into a sector book")
+    parser.add_argument("decks", nargs="+", help=".pptx decks in book order")
+    parser.add_argument("-o", "--output", required=True, help="Output .pptx path")
+    parser.add_argument("--title", default="Sector Book", help="Book title on the contents slide")
+    parser.add_argument("--no-toc", action="store_true", help="Leave out the contents slide")
+    parser.add_argument("--no-dividers", action="store_true", help="Leave out the per-ticker divider slides")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = merge_decks(args.decks, args.output, args.title,
+                        toc=not args.no_toc, dividers=not args.no_dividers)
+    print(f"Saved: {args.output} ({stats['decks']} decks, {stats['slides']} slides, "
+          f"{stats['masters']} master(s), {stats['media_reused']} media reused) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Deck Data Validation
+
+Checks a stock analysis deck data dict before any slide is rendered:
+required keys, value types, table row widths against their column labels
+(income_years, balance_years, peers, sensitivity_waccs) and a non-zero price
+for the upside calculation. Every problem is reported with its JSON path,
+e.g. "$.income_rows[3]: expected 6 cells (Line Item + income_years), got 5".
+
+SCHEMA is compiled once into a flat list of check functions, so validating a
+deck is a single pass with no schema interpretation.
+
+Usage:
+    python templates/deck_schema.py data/*.json
+    python templates/stock_analysis_slides.py --data data.json --validate-only
+
+Or programmatically:
+    from templates.deck_schema import validate
+    errors = validate(d)        # [] when the deck can be built
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from templates.columnar import table_source
+
+# (key, kind, options). Kinds:
+#   text        non-empty string
+#   note        string or null, may be absent
+#   number      finite int/float; "positive" also rejects <= 0
+#   text_list   list of strings; "nonempty" rejects []
+#   table       list of rows of text/number cells; "width" is a fixed cell
+#               count or (labels_key, extra) for len(d[labels_key]) + extra;
+#               "length" is a key whose list the row count must match;
+#               "source" also accepts a templates/columnar.py source spec
+#               (SOURCE_BLOCK), whose label and columns must be in the file
+#   chart       {"series": {name: [number or null]}, "lines": [names]} with one
+#               value per entry of the "labels" key
+#   block       object of "fields" {name: field kind} (FIELD_KINDS); names in
+#               "required" must be present, any other name is rejected;
+#               "same_length" pairs list fields that must be equally long
+# Options: "optional" (may be absent), "unless" (not required when that key, or
+# any key of a tuple, is present), "with" (required only when that key is present)
+_WAIVED_BY_DCF = {"unless": "dcf"}
+_WAIVED_BY_COMPS = {"unless": "comps"}
+_LABELS = {"nonempty": True}
+# Inputs of templates/dcf.py apply_dcf(), templates/monte_carlo.py simulate() and
+# templates/comps.py apply_comps()
+DCF_BLOCK = {
+    "optional": True,
+    "fields": {"fcf": "numbers", "waccs": "numbers", "shares": "positive",
+               "scenario_labels": "texts", "growth": "number", "terminal_growth": "number",
+               "net_debt": "number", "years": "count"},
+    "required": ("fcf", "waccs", "shares"),
+    "same_length": (("scenario_labels", "fcf"),),
+}
+MONTE_CARLO_BLOCK = {
+    "optional": True,
+    "fields": {"revenue": "positive", "shares": "positive", "price": "positive",
+               "growth": "distribution", "margin": "distribution", "wacc": "distribution",
+               "terminal_growth": "distribution", "net_debt": "number", "years": "count",
+               "paths": "count", "seed": "seed", "chunk": "count", "workers": "count",
+               "histogram_range": "numbers", "weight": "text"},
+    "required": ("revenue", "shares", "growth", "margin", "wacc"),
+}
+COMPS_BLOCK = {
+    "optional": True,
+    "fields": {"universe": "file", "peers": "count", "band": "ratio", "weight": "text",
+               "ticker": "text"},
+    "required": ("universe",),
+}
+SOURCE_BLOCK = {
+    "fields": {"source": "file", "label": "text", "columns": "texts", "rows": "texts",
+               "limit": "count", "format": "format"},
+    "required": ("source",),
+}
+SCHEMA = [
+    ("ticker", "text", {}),
+    ("company", "text", {}),
+    ("date", "text", {}),
+    ("rating", "text", {}),
+    ("price", "number", {"positive": True}),
+    ("target", "number", {}),
+    ("executive_summary", "text_list", {}),
+    ("valuation_metrics", "table", {"width": 3, "source": True}),
+    ("income_years", "text_list", _LABELS),
+    ("income_rows", "table", {"width": ("income_years", 1), "header": "Line Item", "source": True}),
+    ("income_note", "note", {}),
+    ("income_chart", "chart", {"labels": "income_years", "optional": True}),
+    ("balance_years", "text_list", _LABELS),
+    ("balance_rows", "table", {"width": ("balance_years", 1), "header": "Metric", "source": True}),
+    ("balance_note", "note", {}),
+    ("balance_chart", "chart", {"labels": "balance_years", "optional": True}),
+    ("peers", "text_list", _WAIVED_BY_COMPS),
+    ("peer_rows", "table", dict(_WAIVED_BY_COMPS, width=("peers", 2), header="Metric + ticker",
+                                source=True)),
+    ("valuation_rows", "table", {"width": 4, "unless": ("monte_carlo", "comps")}),
+    ("valuation_note", "note", {}),
+    ("distribution_rows", "table", {"width": 3, "optional": True}),
+    ("distribution_histogram", "table", {"width": 2, "with": "distribution_rows"}),
+    ("distribution_note", "note", {}),
+    ("sensitivity_scenarios", "text_list", _WAIVED_BY_DCF),
+    ("sensitivity_waccs", "text_list", dict(_WAIVED_BY_DCF, **_LABELS)),
+    ("sensitivity_matrix", "table", dict(_WAIVED_BY_DCF, width=("sensitivity_waccs", 0),
+                                         length="sensitivity_scenarios")),
+    ("sensitivity_note", "note", {}),
+    ("bull_case", "text_list", {}),
+    ("bear_case", "text_list", {}),
+    ("catalysts", "text_list", {}),
+    ("risk", "text", {}),
+    ("consensus", "text", {}),
+    ("rec_summary", "text", {}),
+    ("dcf", "block", DCF_BLOCK),
+    ("monte_carlo", "block", MONTE_CARLO_BLOCK),
+    ("comps", "block", COMPS_BLOCK),
+]
+
+
+def _type_name(value):
+    return "null" if value is None else type(value).__name__
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+# Parameters of each templates/monte_carlo.py distribution
+DISTRIBUTIONS = {"normal": ("mean", "sd"), "triangular": ("low", "mode", "high"),
+                 "uniform": ("low", "high")}
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _distribution_error(value):
+    """Why value is not a number or distribution spec, or None."""
+    if _is_number(value):
+        return None
+    if not isinstance(value, dict):
+        return f"expected number or distribution object, got {_type_name(value)}"
+    params = DISTRIBUTIONS.get(value.get("dist"))
+    if params is None:
+        return f"dist must be one of {', '.join(DISTRIBUTIONS)}, got {value.get('dist')!r}"
+    for name in params:
+        if not _is_number(value.get(name)):
+            return f"{value['dist']} needs number {name!r}"
+    unknown = sorted(set(value) - set(params) - {"dist", "min", "max"})
+    if unknown:
+        return f"unknown {value['dist']} keys: {', '.join(unknown)}"
+    for name in ("min", "max"):
+        if name in value and not _is_number(value[name]):
+            return f"{name} must be a number, got {_type_name(value[name])}"
+    return None
+
+
+def _pattern_error(value):
+    """Why value is not a cell kind or a str.format pattern for numbers, or None."""
+    from templates.cells import KINDS
+
+    if not isinstance(value, str) or not value:
+        return f"expected cell kind or format pattern, got {_type_name(value)}"
+    if value in KINDS:
+        return None
+    try:
+        if value.format(1.0) == value.format(2.0):
+            return f"bad format pattern {value!r}: no {{}} field"
+    except (ValueError, IndexError, KeyError) as e:
+        return f"bad format pattern {value!r}: {e}"
+    return None
+
+
+def _format_error(value):
+    """Why value is not a table source format (a pattern or {column: pattern}), or None."""
+    if not isinstance(value, dict):
+        return _pattern_error(value)
+    for column, pattern in value.items():
+        error = _pattern_error(pattern)
+        if error:
+            return f"{column}: {error}"
+    return None
+
+
+# Field kinds of a block: error message for a bad value, or None
+FIELD_KINDS = {
+    "number": lambda v: None if _is_number(v) else f"expected number, got {_type_name(v)}",
+    "positive": lambda v: (f"expected number, got {_type_name(v)}" if not _is_number(v) else
+                           None if v > 0 else f"must be greater than 0, got {v}"),
+    "ratio": lambda v: (f"expected number, got {_type_name(v)}" if not _is_number(v) else
+                        None if v > 1 else f"must be greater than 1, got {v}"),
+    "count": lambda v: None if _is_int(v) and v > 0 else f"expected positive integer, got {v!r}",
+    "seed": lambda v: None if _is_int(v) and v >= 0 else f"expected non-negative integer, got {v!r}",
+    "text": lambda v: None if isinstance(v, str) and v else f"expected non-empty string, got {_type_name(v)}",
+    "file": lambda v: (f"expected file path, got {_type_name(v)}" if not isinstance(v, str) else
+                       None if os.path.isfile(v) else f"no such file {v!r}"),
+    "numbers": lambda v: (None if isinstance(v, list) and v and all(_is_number(x) for x in v)
+                          else "expected non-empty list of numbers"),
+    "texts": lambda v: (None if isinstance(v, list) and all(isinstance(x, str) for x in v)
+                        else "expected list of strings"),
+    "distribution": _distribution_error,
+    "format": _format_error,
+}
+
+
+def _compile_block(opts):
+    """Return check(path, value, errors) for an object of the given fields."""
+    fields = {name: FIELD_KINDS[field_kind] for name, field_kind in opts["fields"].items()}
+    required = opts.get("required", ())
+    same_length = opts.get("same_length", ())
+
+    def check(path, value, errors):
+        if not isinstance(value, dict):
+            errors.append(f"{path}: expected object, got {_type_name(value)}")
+            return
+        for name in required:
+            if name not in value:
+                errors.append(f"{path}.{name}: required key missing")
+        for name, item in value.items():
+            field_check = fields.get(name)
+            if field_check is None:
+                errors.append(f"{path}.{name}: unknown key; expected one of {', '.join(fields)}")
+                continue
+            error = field_check(item)
+            if error:
+                errors.append(f"{path}.{name}: {error}")
+        for a, b in same_length:
+            if isinstance(value.get(a), list) and isinstance(value.get(b), list) \
+                    and len(value[a]) != len(value[b]):
+                errors.append(f"{path}.{a}: expected {len(value[b])} entries ({b}), "
+                              f"got {len(value[a])}")
+    return check
+
+
+_check_source = _compile_block(SOURCE_BLOCK)
+
+
+def _source_errors(path, key, spec, d, errors):
+    """Check a table source spec and that its file has the columns the slide reads."""
+    before = len(errors)
+    _check_source(path, spec, errors)
+    if len(errors) > before:
+        return
+    try:
+        missing = table_source(key, spec, d).missing_columns()
+    except (KeyError, TypeError):  # default columns come from keys checked on their own
+        return
+    except ImportError:  # pyarrow is not installed; the build reports it
+        return
+    except (OSError, ValueError) as e:
+        errors.append(f"{path}.source: {e}")
+        return
+    if missing:
+        errors.append(f"{path}: {spec['source']!r} has no column(s) {', '.join(map(repr, missing))}")
+
+
+def _compile_value_check(key, kind, opts):
+    """Return check(d, value, errors) for the value under key."""
+    path = f"$.{key}"
+
+    if kind == "text":
+        def check(d, value, errors):
+            if not isinstance(value, str) or not value:
+                errors.append(f"{path}: expected non-empty string, got {_type_name(value)}")
+        return check
+
+    if kind == "note":
+        def check(d, value, errors):
+            if value is not None and not isinstance(value, str):
+                errors.append(f"{path}: expected string or null, got {_type_name(value)}")
+        return check
+
+    if kind == "number":
+        positive = opts.get("positive", False)
+
+        def check(d, value, errors):
+            if not _is_number(value):
+                errors.append(f"{path}: expected number, got {_type_name(value)}")
+            elif positive and value <= 0:
+                errors.append(f"{path}: must be greater than 0, got {value}")
+        return check
+
+    if kind == "text_list":
+        nonempty = opts.get("nonempty", False)
+
+        def check(d, value, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected list, got {_type_name(value)}")
+                return
+            if nonempty and not value:
+                errors.append(f"{path}: must not be empty")
+            for i, item in enumerate(value):
+                if not isinstance(item, str):
+                    errors.append(f"{path}[{i}]: expected string, got {_type_name(item)}")
+        return check
+
+    if kind == "table":
+        width = opts.get("width")
+        length_key = opts.get("length")
+        source = opts.get("source", False)
+        if isinstance(width, tuple):
+            labels_key, extra = width
+            header = opts.get("header")
+            described = f"{header} + {labels_key}" if header else labels_key
+
+            def expected_width(d):
+                labels = d.get(labels_key)
+                return len(labels) + extra if isinstance(labels, list) else None
+        else:
+            described = None
+
+            def expected_width(d):
+                return width
+
+        def check(d, value, errors):
+            if source and isinstance(value, dict):
+                _source_errors(path, key, value, d, errors)
+                return
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected list of rows, got {_type_name(value)}")
+                return
+            n = expected_width(d)
+            if length_key and isinstance(d.get(length_key), list) and len(value) != len(d[length_key]):
+                errors.append(f"{path}: expected {len(d[length_key])} rows ({length_key}), got {len(value)}")
+            for i, row in enumerate(value):
+                if not isinstance(row, list):
+                    errors.append(f"{path}[{i}]: expected list, got {_type_name(row)}")
+                    continue
+                if n is not None and len(row) != n:
+                    errors.append(f"{path}[{i}]: expected {n} cells"
+                                  f"{f' ({described})' if described else ''}, got {len(row)}")
+                for j, cell in enumerate(row):
+                    if not (isinstance(cell, str) or _is_number(cell)):
+                        errors.append(f"{path}[{i}][{j}]: expected string or number, "
+                                      f"got {_type_name(cell)}")
+        return check
+
+    if kind == "chart":
+        labels_key = opts["labels"]
+
+        def check(d, value, errors):
+            series = value.get("series") if isinstance(value, dict) else None
+            if not isinstance(series, dict) or not series:
+                errors.append(f"{path}.series: expected non-empty object of name: values")
+                return
+            n = len(d[labels_key]) if isinstance(d.get(labels_key), list) else None
+            for name, values in series.items():
+                if not isinstance(values, list):
+                    errors.append(f"{path}.series.{name}: expected list, got {_type_name(values)}")
+                    continue
+                if n is not None and len(values) != n:
+                    errors.append(f"{path}.series.{name}: expected {n} values ({labels_key}), got {len(values)}")
+                for i, v in enumerate(values):
+                    if v is not None and not _is_number(v):
+                        errors.append(f"{path}.series.{name}[{i}]: expected number or null, got {_type_name(v)}")
+            for name in value.get("lines", []):
+                if name not in series:
+                    errors.append(f"{path}.lines: {name!r} is not a series")
+        return check
+
+    if kind == "block":
+        check_block = _compile_block(opts)
+
+        def check(d, value, errors):
+            check_block(path, value, errors)
+        return check
+
+    raise ValueError(f"unknown schema kind {kind!r} for {key}")
+
+
+def compile_schema(schema):
+    """Compile a SCHEMA list into validate(d) -> list of error strings."""
+    checks = []
+    for key, kind, opts in schema:
+        optional = kind == "note" or opts.get("optional", False) or "with" in opts
+        unless = opts.get("unless", ())
+        checks.append((key, optional, (unless,) if isinstance(unless, str) else unless,
+                       opts.get("with"), _compile_value_check(key, kind, opts)))
+
+    def validate(d):
+        if not isinstance(d, dict):
+            return [f"$: expected object, got {_type_name(d)}"]
+        errors = []
+        for key, optional, unless, with_, check in checks:
+            if key in d:
+                check(d, d[key], errors)
+            elif (with_ in d) if with_ else not (optional or any(k in d for k in unless)):
+                errors.append(f"$.{key}: required key missing")
+        return errors
+
+    return validate
+
+
+validate = compile_schema(SCHEMA)
+
+
+def validate_file(path):
+    """Load and validate a deck data file; returns (data or None, errors)."""
+    try:
+        with open(path) as f:
+            d = json.load(f)
+    except (OSError, ValueError) as e:
+        return None, [f"$: {e}"]
+    return d, validate(d)
+
+
+def main():
+    """CLI entry point — validates deck data files and reports every error."""
+    parser = argparse.ArgumentParser(description="Validate stock analysis deck data files")
+    parser.add_argument("files", nargs="+", help="Deck data JSON files")
+    args = parser.parse_args()
+
+    failed = 0
+    for path in args.files:
+        _, errors = validate_file(path)
+        if errors:
+            failed += 1
+            for error in errors:
+                print(f"{path}: {error}", file=sys.stderr)
+    print(f"Validated {len(args.files)} files: {len(args.files) - failed} ok, {failed} invalid")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Declarative Deck Specs
+
+A deck spec is a JSON file that lists slides, the components on each slide
+and where their text comes from, instead of a script that places every shape
+by hand. compile_spec() turns a spec into a BuildPlan once: geometry is
+converted to EMU, font sizes, colours and alignments are resolved, table
+column widths are precomputed, and data bindings become lookups. The plan
+then builds a deck from any number of data payloads, with the template's
+prototype cache on so each distinct styled shape is rendered only once.
+
+Spec format:
+
+    {"slides": [
+      {"background": "DARK_BLUE",
+       "components": [
+         {"type": "text", "box": [1.5, 1.5, 10.333, 1.2], "text": "Investment Analysis: {company} ({ticker})",
+          "size": 40, "bold": true, "color": "WHITE", "align": "center"}]},
+      {"title": "Income Statement ({income_years[0]})", "when": "$income_rows",
+       "components": [
+         {"type": "table", "box": [0.8, 1.8, 11.7, 3.5], "headers": ["Line Item", "*$income_years"],
+          "rows": "$income_rows", "col_widths": [3.5, 2.7, 2.7, 2.8], "paginate": true},
+         {"type": "text", "box": [0.8, 5.6, 11.7, 0.5], "text": "$income_note", "when": "$income_note",
+          "size": 13, "color": "MEDIUM_GRAY"}]}]}
+
+Slides take an optional title/subtitle (title bar), background (default
+WHITE) and when (skip the slide if the binding is missing or empty).
+Components: text, bullets (items), bar, box (fill, border), table (headers,
+rows, col_widths, paginate) and chart (categories, series, lines,
+number_format). Boxes are [left, top, width, height] in inches and sizes are
+points. Colours are the template's constant names or "#RRGGBB"; align is
+left, center or right.
+
+Bindings: "$key" (or "$a.b.0") is a value from the payload, a string with
+{key} placeholders is formatted from it, and "*$key" inside a list splices
+a list in. Anything else is a literal. A missing key or placeholder field
+resolves to None, so a "when" on it skips the slide or component.
+
+Usage:
+    python templates/deck_spec.py templates/specs/analysis-deck.json data.json -o deck.pptx
+    python templates/deck_spec.py spec.json data/*.json --output-dir output/stock
+
+Or programmatically:
+    from templates.deck_spec import load_plan
+    plan = load_plan("templates/specs/analysis-deck.json")
+    for d in payloads:
+        plan.build(d).save(...)
+
+load_plan() keeps compiled plans in memory and pickled under
+output/.plan-cache/, keyed by the spec's content and this module's source.
+"""
+
+import argparse
+import copyreg
+import hashlib
+import json
+import os
+import pickle
+import re
+import string
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from templates import stock_analysis_slides as t
+
+DEFAULT_PLAN_DIR = os.path.join(PROJECT_ROOT, "output", ".plan-cache")
+
+ALIGNMENTS = {"left": t.PP_ALIGN.LEFT, "center": t.PP_ALIGN.CENTER, "right": t.PP_ALIGN.RIGHT}
+SHAPES = {"rectangle": t.MSO_SHAPE.RECTANGLE, "rounded": t.MSO_SHAPE.ROUNDED_RECTANGLE}
+_HEX = re.compile(r"^#[0-9A-Fa-f]{6}$")
+_FORMATTER = string.Formatter()
+
+_plans = {}
+
+# RGBColor is a tuple subclass whose __new__ takes r, g, b separately, which
+# the default tuple pickling cannot call; plans store colours, so pickle them
+# by hex value.
+copyreg.pickle(t.RGBColor, lambda color: (t.RGBColor.from_string, (str(color),)))
+
+
+# =============================================================================
+# BINDINGS
+# =============================================================================
+# Compiled bindings are plain tuples so plans pickle:
+#   ("const", value)  ("path", keys)  ("format", template)  ("list", items)
+# where list items are bindings or ("splat", binding).
+
+def compile_binding(value):
+    """Compile a literal, "$path", "{key}" template or list of them into a binding."""
+    if isinstance(value, str):
+        if value.startswith("$"):
+            return ("path", tuple(int(k) if k.isdigit() else k for k in value[1:].split(".")))
+        if any(field is not None for _, field, _, _ in _FORMATTER.parse(value)):
+            return ("format", value)
+        return ("const", value)
+    if isinstance(value, list):
+        items = []
+        for item in value:
+            if isinstance(item, str) and item.startswith("*$"):
+                items.append(("splat", compile_binding(item[1:])))
+            else:
+                items.append(compile_binding(item))
+        if all(b[0] == "const" for b in items):
+            return ("const", [b[1] for b in items])
+        return ("list", tuple(items))
+    return ("const", value)
+
+
+def resolve(binding, d):
+    """Evaluate a compiled binding against a data payload; missing paths and fields give None."""
+    kind, arg = binding
+    if kind == "const":
+        return arg
+    if kind == "path":
+        value = d
+        for key in arg:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return value
+    if kind == "format":
+        try:
+            return arg.format_map(d)
+        except (KeyError, IndexError, AttributeError, TypeError):
+            return None
+    out = []
+    for item in arg:
+        if item[0] == "splat":
+            out.extend(resolve(item[1], d) or [])
+        else:
+            out.append(resolve(item, d))
+    return out
+
+
+# =============================================================================
+# COMPILER
+# =============================================================================
+
+def _emu(inches):
+    # Emu, not Inches: Length subclasses pickle by value, and Inches(value) would rescale it
+    return t.Emu(t.Inches(inches))
+
+
+def _color(value, path, errors):
+    if isinstance(value, str) and _HEX.match(value):
+        return t.RGBColor.from_string(value[1:])
+    color = getattr(t, value, None) if isinstance(value, str) else None
+    if not isinstance(color, t.RGBColor):
+        errors.append(f"{path}: unknown colour {value!r}")
+        return t.BLACK
+    return color
+
+
+def _choice(table, value, path, errors):
+    if value not in table:
+        errors.append(f"{path}: expected one of {', '.join(table)}, got {value!r}")
+        return next(iter(table.values()))
+    return table[value]
+
+
+def _box(c, path, errors):
+    box = c.get("box")
+    if not (isinstance(box, list) and len(box) == 4 and all(isinstance(v, (int, float)) for v in box)):
+        errors.append(f"{path}.box: expected [left, top, width, height] in inches")
+        return (0, 0, 0, 0)
+    return tuple(_emu(v) for v in box)
+
+
+def _compile_component(c, path, errors):
+    """Return (op, static args, bindings) for one component."""
+    kind = c.get("type")
+    box = _box(c, path, errors)
+    if kind == "text":
+        static = box + (c.get("size", 18), c.get("bold", False), _color(c.get("color", "BLACK"), f"{path}.color", errors),
+                        _choice(ALIGNMENTS, c.get("align", "left"), f"{path}.align", errors), c.get("font", "Calibri"))
+        return "text", static, (compile_binding(c.get("text", "")),)
+    if kind == "bullets":
+        static = box + (c.get("size", 16), _color(c.get("color", "BLACK"), f"{path}.color", errors))
+        return "bullets", static, (compile_binding(c.get("items", [])),)
+    if kind == "bar":
+        static = box + (_color(c.get("color", "DARK_BLUE"), f"{path}.color", errors),
+                        _choice(SHAPES, c.get("shape", "rectangle"), f"{path}.shape", errors))
+        return "bar", static, ()
+    if kind == "box":
+        static = box + (_color(c.get("fill", "WHITE"), f"{path}.fill", errors),
+                        _color(c.get("border", "DARK_BLUE"), f"{path}.border", errors))
+        return "box", static, ()
+    if kind == "table":
+        widths = c.get("col_widths")
+        col_widths = tuple(_emu(w) for w in widths) if widths else None
+        bottom = _emu(c.get("bottom", 7.0))
+        static = box + (col_widths, bool(c.get("paginate", False)), bottom)
+        return "table", static, (compile_binding(c.get("headers", [])), compile_binding(c.get("rows", [])))
+    if kind == "chart":
+        static = box + (c.get("number_format", "#,##0.0"),)
+        return "chart", static, (compile_binding(c.get("categories", [])), compile_binding(c.get("series", {})),
+                                 compile_binding(c.get("lines", [])))
+    errors.append(f"{path}.type: unknown component type {kind!r}")
+    return None
+
+
+class BuildPlan:
+    """A compiled deck spec: per slide, resolved styles and geometry plus data bindings."""
+
+    def __init__(self, slides):
+        # [(when, background, title, subtitle, [(when, op, static, bindings)])]
+        self.slides = slides
+
+    def build(self, d):
+        """Build a deck from one data payload; returns a StockAnalysisDeck."""
+        previous = t._prototypes
+        if previous is None:
+            t.use_prototypes()
+        try:
+            deck = t.StockAnalysisDeck()
+            for when, background, title, subtitle, components in self.slides:
+                if when is not None and not resolve(when, d):
+                    continue
+                self._build_slide(deck.prs, d, background, title, subtitle, components)
+        finally:
+            if previous is None:
+                t.use_prototypes(False)
+        return deck
+
+    def _build_slide(self, prs, d, background, title, subtitle, components):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        t.add_background(slide, background)
+        title_text = resolve(title, d) if title is not None else None
+        if title_text is not None:
+            t.add_title_bar(slide, title_text, resolve(subtitle, d) if subtitle is not None else None)
+
+        for when, op, static, bindings in components:
+            if when is not None and not resolve(when, d):
+                continue
+            values = [resolve(b, d) for b in bindings]
+            if op == "text":
+                t.add_textbox(slide, *static[:4], "" if values[0] is None else values[0], *static[4:])
+            elif op == "bullets":
+                t.add_bullet_textbox(slide, *static[:4], values[0], *static[4:])
+            elif op == "bar":
+                t.add_bar(slide, *static)
+            elif op == "box":
+                t.add_rounded_box(slide, *static)
+            elif op == "table":
+                left, top, width, height, col_widths, paginate, bottom = static
+                headers, rows = values
+                if paginate:
+                    # Components after a paginated table land on its last page
+                    slide = t.add_paginated_table(prs, slide, title_text or "", left, top, width, height,
+                                                  headers, rows, col_widths, bottom)
+                else:
+                    t.add_table(slide, left, top, width, height, headers, rows, col_widths)
+            elif op == "chart":
+                t.add_chart(slide, *static[:4], values[0], values[1], values[2] or (), static[4])
+
+
+def compile_spec(spec):
+    """Compile a spec dict into a BuildPlan; raises ValueError listing every problem."""
+    errors = []
+    slides = []
+    for i, s in enumerate(spec.get("slides", [])):
+        path = f"slides[{i}]"
+        components = []
+        for j, c in enumerate(s.get("components", [])):
+            compiled = _compile_component(c, f"{path}.components[{j}]", errors)
+            if compiled is not None:
+                when = compile_binding(c["when"]) if "when" in c else None
+                components.append((when,) + compiled)
+        slides.append((
+            compile_binding(s["when"]) if "when" in s else None,
+            _color(s.get("background", "WHITE"), f"{path}.background", errors),
+            compile_binding(s["title"]) if "title" in s else None,
+            compile_binding(s["subtitle"]) if "subtitle" in s else None,
+            components,
+        ))
+    if not slides:
+        errors.append("slides: expected at least one slide")
+    if errors:
+        raise ValueError("invalid deck spec:\n  " + "\n  ".join(errors))
+    return BuildPlan(slides)
+
+
+def _fingerprint():
+    """Hash of the compiler and template sources, so code changes invalidate cached plans."""
+    h = hashlib.sha256()
+    for module in (sys.modules[__name__], t):
+        with open(module.__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def load_plan(spec_path, cache_dir=DEFAULT_PLAN_DIR):
+    """Compiled plan for a spec file, from memory, the on-disk plan cache, or a fresh compile."""
+    with open(spec_path, "rb") as f:
+        source = f.read()
+    key = hashlib.sha256(source + _fingerprint().encode()).hexdigest()
+    if key in _plans:
+        return _plans[key]
+    cached = os.path.join(cache_dir, key + ".pickle") if cache_dir else None
+    if cached and os.path.exists(cached):
+        try:
+            with open(cached, "rb") as f:
+                plan = pickle.load(f)
+        except Exception:  # truncated or corrupt: recompiled and overwritten below
+            plan = None
+        if isinstance(plan, BuildPlan):
+            _plans[key] = plan
+            return plan
+
+    plan = _plans[key] = compile_spec(json.loads(source))
+    if cached:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = cached + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(plan, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cached)
+    return plan
+
+
+def main():
+    """CLI entry point — builds one deck per data file from a spec."""
+    parser = argparse.ArgumentParser(description="Build decks from a declarative deck spec")
+    parser.add_argument("spec", help="Deck spec JSON")
+    parser.add_argument("data", nargs="+", help="Data payload JSON file(s)")
+    parser.add_argument("-o", "--output", help="Output .pptx (one data file)")
+    parser.add_argument("--output-dir", help="Write <data name>.pptx per data file here")
+    parser.add_argument("--no-plan-cache", action="store_true", help="Always recompile the spec")
+    args = parser.parse_args()
+    if bool(args.output) == bool(args.output_dir) or (args.output and len(args.data) > 1):
+        parser.error("give --output for one data file or --output-dir for several")
+
+    try:
+        plan = load_plan(args.spec, None if args.no_plan_cache else DEFAULT_PLAN_DIR)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    for path in args.data:
+        with open(path) as f:
+            d = json.load(f)
+        output = args.output or os.path.join(
+            args.output_dir, os.path.splitext(os.path.basename(path))[0] + ".pptx")
+        plan.build(d).save(output)
+
+
+if __name__ == "__main__":
+    main()
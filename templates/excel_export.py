@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Excel Export of Stock Analysis Deck Data
+
+Writes the deck data model (the same --data JSON read by
+stock_analysis_slides.py) to an .xlsx workbook for one ticker or a whole
+coverage batch. Every sheet is in long format with a Ticker column, so a
+batch is one table per topic rather than one sheet per ticker:
+
+    Summary            Ticker, Company, Date, Rating, Price, Target, Upside, Risk, Consensus
+    Valuation Metrics  Ticker, Metric, Value, Note
+    Income             Ticker, Line Item, Year, Value, YoY
+    Balance Sheet      Ticker, Line Item, Year, Value, YoY
+    Peers              Ticker, Metric, Company, Value, vs Ticker
+    Valuation          Ticker, Method, Fair Value, Upside, Weight
+    Sensitivity        Ticker, Scenario, WACC, Fair Value, vs Price
+
+Display strings such as "$391.0B", "28.5x" or "+12%" become numeric cells
+with a number format that renders the same text ($391.0B is stored as
+391000000000 with a ,,,"B" scaling format). Tables given as CellTables
+(templates/cells.py) are written from their numbers directly. Upside, YoY
+and relative columns are Excel formulas over those cells.
+
+The workbook is written with XlsxWriter's constant_memory mode: each row is
+flushed to disk as soon as the next one starts, and decks are read one at a
+time, so memory stays flat for full peer universes or quarterly histories
+given as table sources (templates/columnar.py). A sheet that reaches Excel's
+row limit continues on "<name> (2)".
+
+Usage:
+    python templates/excel_export.py data/aapl.json -o output/stock/aapl.xlsx
+    python templates/excel_export.py data/ coverage.jsonl -o output/stock/coverage.xlsx
+
+Or programmatically:
+    from templates.excel_export import export_workbook
+    export_workbook([d1, d2], "coverage.xlsx")
+"""
+
+import argparse
+import datetime
+import os
+import re
+import sys
+from functools import lru_cache
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import xlsxwriter
+from xlsxwriter.utility import xl_rowcol_to_cell
+
+from templates.cells import CellTable
+from templates.stock_analysis_slides import expand_deck_data
+
+# Excel's hard limit, header row included
+MAX_ROWS = 1_048_576
+
+SHEETS = [
+    ("Summary", ["Ticker", "Company", "Date", "Rating", "Price", "Target", "Upside", "Risk", "Consensus"]),
+    ("Valuation Metrics", ["Ticker", "Metric", "Value", "Note"]),
+    ("Income", ["Ticker", "Line Item", "Year", "Value", "YoY"]),
+    ("Balance Sheet", ["Ticker", "Line Item", "Year", "Value", "YoY"]),
+    ("Peers", ["Ticker", "Metric", "Company", "Value", "vs Ticker"]),
+    ("Valuation", ["Ticker", "Method", "Fair Value", "Upside", "Weight"]),
+    ("Sensitivity", ["Ticker", "Scenario", "WACC", "Fair Value", "vs Price"]),
+]
+COLUMN_WIDTHS = {"Ticker": 9, "Company": 28, "Note": 48, "Line Item": 26, "Metric": 22,
+                 "Method": 16, "Scenario": 18, "WACC": 14, "Consensus": 24}
+
+PERCENT = "+0.0%;-0.0%;+0.0%"
+PRICE = '"$"#,##0.00;("$"#,##0.00)'
+DATE = "yyyy-mm-dd"
+
+# Thousands-separator commas after the digits scale the displayed value
+_SCALES = {"K": (1e3, ","), "M": (1e6, ",,"), "B": (1e9, ",,,"), "T": (1e12, ",,,,")}
+_NUMBER = re.compile(r"^(?P<paren>\()?(?P<sign>[+-])?(?P<cur>\$)?(?P<num>\d[\d,]*(?:\.(?P<dec>\d+))?)"
+                     r"(?P<unit>[KMBT%x])?(?(paren)\))$")
+_BLANK = {"", "—", "-", "–", "N/A", "n/a"}
+
+
+# =============================================================================
+# CELL PARSING
+# =============================================================================
+
+@lru_cache(maxsize=8192)
+def parse_cell(text):
+    """Return (value, number_format) for a display string.
+
+    Numbers come back as floats with a format that renders the original text;
+    anything else is returned unchanged with no format, and placeholders
+    ("—", "N/A") as None.
+    """
+    text = text.strip()
+    if text in _BLANK:
+        return None, None
+    m = _NUMBER.match(text)
+    if m is None or m["paren"] and m["sign"]:
+        return text, None
+    value = float(m["num"].replace(",", ""))
+    if m["sign"] == "-" or m["paren"]:  # accounting negatives: ($1.2B)
+        value = -value
+    digits = "0." + "0" * len(m["dec"]) if m["dec"] else "0"
+    unit = m["unit"]
+    if unit == "%":
+        value /= 100
+        fmt = digits + "%"
+    else:
+        fmt = "#,##" + digits
+        if unit in _SCALES:
+            scale, commas = _SCALES[unit]
+            value *= scale
+            fmt += f'{commas}"{unit}"'
+        elif unit == "x":
+            fmt += '"x"'
+    if m["cur"]:
+        fmt = '"$"' + fmt
+    if m["sign"] == "+":
+        fmt = f"+{fmt};-{fmt};+{fmt}"
+    elif m["paren"] or m["cur"] and not m["sign"]:
+        fmt = f"{fmt};({fmt})"
+    return value, fmt
+
+
+def _cell(v):
+    if isinstance(v, tuple):  # (value, number_format) from CellTable.typed_rows()
+        return v
+    if isinstance(v, bool) or v is None:
+        return v, None
+    if isinstance(v, (int, float)):
+        return float(v), None
+    return parse_cell(str(v))
+
+
+def _ratio(a, b):
+    """a / b - 1 for the cached value of a relative-change formula, or "" if undefined."""
+    if isinstance(a, float) and isinstance(b, float) and b != 0:
+        return a / b - 1
+    return ""
+
+
+# =============================================================================
+# STREAMING SHEETS
+# =============================================================================
+
+class _Sheet:
+    """Append-only long-format sheet that rolls over to a new worksheet at the row limit."""
+
+    def __init__(self, book, name, headers):
+        self.book = book
+        self.name = name
+        self.headers = headers
+        self.part = 0
+        self.rows = 0
+        self._new_worksheet()
+
+    def _new_worksheet(self):
+        self.part += 1
+        self.title = self.name if self.part == 1 else f"{self.name} ({self.part})"
+        self.ws = self.book.workbook.add_worksheet(self.title)
+        for col, header in enumerate(self.headers):
+            self.ws.set_column(col, col, COLUMN_WIDTHS.get(header, 13))
+        self.ws.write_row(0, 0, self.headers, self.book.header_format)
+        self.ws.freeze_panes(1, 0)
+        self.row = 1
+
+    def ref(self, row, col, absolute=False):
+        """Cross-sheet A1 reference to a cell written earlier."""
+        cell = xl_rowcol_to_cell(row, col, absolute, absolute)
+        return f"'{self.title}'!{cell}"
+
+    def reserve(self, n):
+        """Start a new worksheet unless n more rows fit; returns the 0-based row they start at.
+
+        Call before building rows whose formulas refer to each other.
+        """
+        if self.row + n > MAX_ROWS:
+            self._new_worksheet()
+        return self.row
+
+    def write_group(self, group):
+        """Write rows that must share a worksheet.
+
+        A row is a list of cells: raw values (display strings are parsed
+        into numbers), (value, number_format) pairs, or
+        (formula, cached_value, number_format) triples.
+        """
+        self.reserve(len(group))
+        ws, fmt = self.ws, self.book.format
+        for cells in group:
+            for col, cell in enumerate(cells):
+                if isinstance(cell, tuple) and len(cell) == 3:
+                    formula, cached, num_format = cell
+                    ws.write_formula(self.row, col, formula, fmt(num_format), cached)
+                    continue
+                value, num_format = cell if isinstance(cell, tuple) else _cell(cell)
+                if value is None:
+                    continue
+                if isinstance(value, float):
+                    ws.write_number(self.row, col, value, fmt(num_format))
+                elif isinstance(value, datetime.date):
+                    ws.write_datetime(self.row, col, value, fmt(DATE))
+                else:
+                    ws.write_string(self.row, col, value)
+            self.row += 1
+        self.rows += len(group)
+
+
+class _Book:
+    def __init__(self, path):
+        self.workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        self.header_format = self.workbook.add_format({"bold": True, "bottom": 1, "bg_color": "#D9E1F2"})
+        self._formats = {None: None}
+        self.sheets = {name: _Sheet(self, name, headers) for name, headers in SHEETS}
+
+    def format(self, num_format):
+        if num_format not in self._formats:
+            self._formats[num_format] = self.workbook.add_format({"num_format": num_format})
+        return self._formats[num_format]
+
+
+# =============================================================================
+# DECK DATA -> ROWS
+# =============================================================================
+
+def _rows(rows):
+    """Table rows as written: CellTables give (value, number_format) cells, others pass through."""
+    return rows.typed_rows() if isinstance(rows, CellTable) else rows
+
+
+def _date(text):
+    try:
+        return datetime.date.fromisoformat(text), DATE
+    except (TypeError, ValueError):
+        return text, None
+
+
+def _write_statement(sheet, ticker, years, rows):
+    """Income / balance rows in long format; YoY compares each year with the next (older) one."""
+    for row in rows:
+        values = [_cell(v)[0] for v in row[1:len(years) + 1]]
+        first = sheet.reserve(len(values))
+        group = []
+        for i, (year, raw) in enumerate(zip(years, row[1:])):
+            r = first + i + 1
+            yoy = None
+            if i + 1 < len(values) and isinstance(values[i], float) and isinstance(values[i + 1], float):
+                yoy = (f"=IFERROR(D{r}/D{r + 1}-1,\"\")", _ratio(values[i], values[i + 1]), PERCENT)
+            group.append([ticker, row[0], year, raw, yoy])
+        sheet.write_group(group)
+
+
+def write_deck(book, d):
+    """Append one deck's data to every sheet of an open export workbook."""
+    d = expand_deck_data(d)
+    sheets = book.sheets
+    ticker = d["ticker"]
+    price, target = float(d["price"]), float(d["target"])
+
+    summary = sheets["Summary"]
+    r = summary.reserve(1)
+    upside = (f"=F{r + 1}/E{r + 1}-1", target / price - 1, PERCENT)
+    summary.write_group([[ticker, d.get("company"), _date(d.get("date")), d.get("rating"),
+                          (price, PRICE), (target, PRICE), upside, d.get("risk"), d.get("consensus")]])
+    price_ref = summary.ref(r, 4, absolute=True)
+
+    sheets["Valuation Metrics"].write_group(
+        [[ticker, row[0], row[1] if len(row) > 1 else None, row[2] if len(row) > 2 else None]
+         for row in _rows(d.get("valuation_metrics", []))])
+    _write_statement(sheets["Income"], ticker, d.get("income_years", []),
+                     _rows(d.get("income_rows", [])))
+    _write_statement(sheets["Balance Sheet"], ticker, d.get("balance_years", []),
+                     _rows(d.get("balance_rows", [])))
+
+    peers = sheets["Peers"]
+    companies = [ticker] + list(d.get("peers", []))
+    for row in _rows(d.get("peer_rows", [])):
+        r = peers.reserve(len(companies)) + 1
+        base = _cell(row[1])[0] if len(row) > 1 else None
+        group = []
+        for i, (company, raw) in enumerate(zip(companies, row[1:])):
+            value = _cell(raw)[0]
+            rel = None
+            if i and isinstance(value, float) and isinstance(base, float):
+                rel = (f"=IFERROR(D{r + i}/D{r}-1,\"\")", _ratio(value, base), PERCENT)
+            group.append([ticker, row[0], company, raw, rel])
+        peers.write_group(group)
+
+    valuation = sheets["Valuation"]
+    rows = _rows(d.get("valuation_rows", []))
+    r = valuation.reserve(len(rows)) + 1
+    group = []
+    for i, row in enumerate(rows):
+        fair = _cell(row[1])[0] if len(row) > 1 else None
+        upside = None
+        if isinstance(fair, float):
+            upside = (f"=C{r + i}/{price_ref}-1", fair / price - 1, PERCENT)
+        group.append([ticker, row[0], row[1] if len(row) > 1 else None, upside,
+                      row[3] if len(row) > 3 else None])
+    valuation.write_group(group)
+
+    sensitivity = sheets["Sensitivity"]
+    scenarios, waccs = d.get("sensitivity_scenarios", []), d.get("sensitivity_waccs", [])
+    r = sensitivity.reserve(len(scenarios) * len(waccs)) + 1
+    group = []
+    matrix = d.get("sensitivity_matrix", [])
+    if isinstance(matrix, CellTable):
+        matrix = [row[1:] for row in matrix.typed_rows()]
+    for scenario, values in zip(scenarios, matrix):
+        for wacc, raw in zip(waccs, values):
+            fair = _cell(raw)[0]
+            rel = None
+            if isinstance(fair, float):
+                rel = (f"=D{r + len(group)}/{price_ref}-1", fair / price - 1, PERCENT)
+            group.append([ticker, scenario, wacc, raw, rel])
+    sensitivity.write_group(group)
+
+
+def export_workbook(decks, path):
+    """Write deck data dicts (any iterable, consumed one at a time) to one .xlsx.
+
+    Returns {sheet name: data rows written}.
+    """
+    book = _Book(path)
+    try:
+        for d in decks:
+            write_deck(book, d)
+    finally:
+        book.workbook.close()
+    return {name: sheet.rows for name, sheet in book.sheets.items()}
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def iter_valid_decks(jobs, errors):
+    """Yield the data of each batch job that passes the deck schema, loading one at a time.
+
+    Invalid jobs are appended to errors as (label, message) and skipped.
+    """
+    from templates.deck_schema import validate, validate_file
+
+    for label, data_path, d, _ in jobs:
+        if isinstance(d, Exception):  # malformed manifest line
+            errors.append((label, str(d)))
+            continue
+        if d is None:
+            d, problems = validate_file(data_path)
+        else:
+            problems = validate(d)
+        if problems:
+            errors.append((label, "; ".join(problems)))
+        else:
+            yield d
+
+
+def main():
+    """CLI entry point — exports deck data files to one workbook."""
+    from templates.stock_analysis_batch import collect_jobs
+
+    parser = argparse.ArgumentParser(description="Export stock analysis deck data to Excel")
+    parser.add_argument("inputs", nargs="+",
+                        help="Deck data JSON files, directories, glob patterns or JSONL manifests")
+    parser.add_argument("-o", "--output", required=True, help="Output .xlsx path")
+    args = parser.parse_args()
+
+    jobs = collect_jobs(args.inputs)
+    if not jobs:
+        print("No input files found", file=sys.stderr)
+        sys.exit(1)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+
+    errors = []
+    counts = export_workbook(iter_valid_decks(jobs, errors), args.output)
+    for label, message in errors:
+        print(f"FAILED {label}: invalid data: {message}", file=sys.stderr)
+    rows = ", ".join(f"{name} {n}" for name, n in counts.items())
+    print(f"Wrote {args.output} ({len(jobs) - len(errors)} ticker(s); rows: {rows})")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
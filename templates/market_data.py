@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Cached Market Data Access
+
+Yahoo Finance and SEC EDGAR responses cached on disk, so repeat and batch
+analyses read statements and filings locally instead of re-pulling them on
+every run. Responses are keyed by endpoint, ticker, period and any other
+parameters, and expire after a TTL chosen by data class: quotes after
+minutes, statements after a week, a filing by accession number never.
+
+Usage:
+    from templates.market_data import MarketData, FixtureBackend, HttpBackend
+
+    md = MarketData(HttpBackend("http://127.0.0.1:8766"))
+    info = md.get("get_stock_info", "AAPL")
+    income = md.get("get_financial_statement", "AAPL", period="annual", statement="income")
+    peers = md.get_many("get_stock_info", ["MSFT", "GOOGL", "AMZN"])
+    print(md.report())
+
+or from the CLI:
+    python templates/market_data.py get get_stock_info AAPL --server http://127.0.0.1:8766
+    python templates/market_data.py get get_financial_statement AAPL --period annual --fixtures DIR
+    python templates/market_data.py serve --fixtures DIR --port 8766   # Local stand-in server
+    python templates/market_data.py stats                             # Entries per data class
+    python templates/market_data.py prune                             # Delete expired entries
+
+A backend is any object with fetch(endpoint, ticker, params) returning
+JSON-serializable data. FixtureBackend reads recorded responses from
+<root>/<endpoint>/<TICKER>[-<params>].json (and can record them from another
+backend); HttpBackend calls a local server that answers
+GET /<endpoint>/<TICKER>?period=... with JSON, such as `serve` above.
+
+Entries live under output/.market-cache/ and are evicted least recently used
+first once the directory exceeds max_bytes. Concurrent identical requests,
+from threads or from other processes sharing the cache directory, are
+coalesced into one backend call. When the backend fails, an expired entry is
+served rather than nothing.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import parse_qsl, quote, urlencode, urlparse
+from urllib.request import urlopen
+
+try:
+    import fcntl
+except ImportError:  # Windows: requests are coalesced within a process only
+    fcntl = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", ".market-cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 256
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Data class of each endpoint (Yahoo Finance MCP tool names, then SEC EDGAR)
+DATA_CLASSES = {
+    "get_stock_info": "quote",
+    "get_historical_stock_prices": "prices",
+    "get_financial_statement": "statements",
+    "get_stock_actions": "prices",
+    "get_holder_info": "ownership",
+    "get_recommendations": "estimates",
+    "get_yahoo_finance_news": "news",
+    "get_option_expiration_dates": "quote",
+    "get_option_chain": "quote",
+    "edgar_company": "reference",
+    "edgar_filings": "filings",
+    "edgar_filing": "filing",
+    "edgar_company_facts": "statements",
+    "edgar_insider_transactions": "ownership",
+}
+
+# Seconds a response of each data class stays fresh; None never expires
+DEFAULT_TTLS = {
+    "quote": 15 * MINUTE,
+    "news": HOUR,
+    "prices": DAY,
+    "estimates": DAY,
+    "ownership": DAY,
+    "filings": DAY,
+    "statements": 7 * DAY,   # statements change quarterly
+    "reference": 30 * DAY,
+    "filing": None,          # a filing by accession number never changes
+    "default": HOUR,
+}
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+def _fixture_name(ticker, params):
+    suffix = "".join(f"-{params[k]}" for k in sorted(params))
+    return f"{ticker}{suffix}.json"
+
+
+class FixtureBackend:
+    """Recorded responses under root/<endpoint>/. With record_from, missing ones are fetched and saved."""
+
+    def __init__(self, root, record_from=None):
+        self.root = root
+        self.record_from = record_from
+
+    def fetch(self, endpoint, ticker, params):
+        path = os.path.join(self.root, endpoint, _fixture_name(ticker, params))
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            if self.record_from is None:
+                raise LookupError(f"No fixture for {endpoint} {ticker} {params}: {path}") from None
+        data = self.record_from.fetch(endpoint, ticker, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        return data
+
+
+class HttpBackend:
+    """A local server answering GET /<endpoint>/<TICKER>?<params> with JSON."""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def fetch(self, endpoint, ticker, params):
+        url = f"{self.base_url}/{quote(endpoint)}/{quote(ticker)}"
+        if params:
+            url += "?" + urlencode(sorted(params.items()))
+        try:
+            with urlopen(url, timeout=self.timeout) as response:
+                return json.load(response)
+        except HTTPError as e:
+            if e.code == 404:
+                raise LookupError(f"No data for {endpoint} {ticker} {params}") from None
+            raise
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class _Call:
+    """A backend call in flight; identical requests wait on it instead of calling again."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.text = None
+        self.error = None
+
+
+class MarketData:
+    """Backend responses cached on disk with per-data-class TTLs and LRU eviction."""
+
+    def __init__(self, backend, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 ttls=None, memory_entries=DEFAULT_MEMORY_ENTRIES, clock=time.time):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.memory_entries = memory_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._memory = OrderedDict()
+        os.makedirs(os.path.join(cache_dir, "locks"), exist_ok=True)
+        self._size = sum(e.stat().st_size for e in os.scandir(cache_dir) if e.is_file())
+
+    def key(self, endpoint, ticker, period=None, **params):
+        """Cache key of a request: (endpoint, TICKER, params including period)."""
+        if period is not None:
+            params["period"] = period
+        ticker = str(ticker).strip().upper()
+        if not ticker:
+            raise ValueError("ticker must not be empty")
+        return endpoint, ticker, {k: str(v) for k, v in sorted(params.items())}
+
+    def ttl(self, endpoint):
+        return self.ttls[DATA_CLASSES.get(endpoint, "default")]
+
+    def get(self, endpoint, ticker, period=None, refresh=False, **params):
+        """Response for a request, from the cache while it is fresh.
+
+        refresh=True skips the cache and re-fetches. Each call returns a new
+        object, so callers may modify it.
+        """
+        endpoint, ticker, params = self.key(endpoint, ticker, period, **params)
+        name = self._name(endpoint, ticker, params)
+        if not refresh:
+            text = self._lookup(name, endpoint)
+            if text is not None:
+                with self._lock:
+                    self.hits += 1
+                return json.loads(text)["data"]
+
+        with self._lock:
+            call = self._inflight.get(name)
+            leader = call is None
+            if leader:
+                call = self._inflight[name] = _Call()
+            else:
+                self.coalesced += 1
+        if leader:
+            try:
+                call.text = self._fetch(name, endpoint, ticker, params, refresh)
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._inflight[name]
+                call.done.set()
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return json.loads(call.text)["data"]
+
+    def get_many(self, endpoint, tickers, period=None, workers=8, **params):
+        """{TICKER: response} for several tickers, fetched concurrently."""
+        def one(ticker):
+            return self.get(endpoint, ticker, period, **params)
+
+        tickers = [str(t).strip().upper() for t in tickers]
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tickers)))) as pool:
+            return dict(zip(tickers, pool.map(one, tickers)))
+
+    # -------------------------------------------------------------------------
+    # Entries
+    # -------------------------------------------------------------------------
+
+    def _name(self, endpoint, ticker, params):
+        payload = json.dumps([endpoint, ticker, params], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name + ".json")
+
+    def _lock_path(self, name):
+        return os.path.join(self.cache_dir, "locks", name)
+
+    def _fresh(self, fetched_at, endpoint):
+        ttl = self.ttl(endpoint)
+        return ttl is None or self.clock() - fetched_at < ttl
+
+    def _lookup(self, name, endpoint):
+        """Text of a fresh entry from memory or disk, else None."""
+        with self._lock:
+            cached = self._memory.get(name)
+            if cached is not None:
+                self._memory.move_to_end(name)
+        if cached is None:
+            path = self._path(name)
+            try:
+                with open(path) as f:
+                    text = f.read()
+                os.utime(path)  # mark as recently used
+            except FileNotFoundError:  # never written, or evicted meanwhile
+                return None
+            cached = json.loads(text)["fetched_at"], text
+            self._remember(name, *cached)
+        fetched_at, text = cached
+        return text if self._fresh(fetched_at, endpoint) else None
+
+    def _remember(self, name, fetched_at, text):
+        with self._lock:
+            self._memory[name] = fetched_at, text
+            self._memory.move_to_end(name)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _fetch(self, name, endpoint, ticker, params, refresh):
+        """Call the backend once per request across processes sharing the cache."""
+        lock = open(self._lock_path(name), "a")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            if not refresh:
+                # Another process may have fetched it while we waited for the lock
+                with self._lock:
+                    self._memory.pop(name, None)
+                text = self._lookup(name, endpoint)
+                if text is not None:
+                    with self._lock:
+                        self.coalesced += 1
+                    return text
+            with self._lock:
+                self.misses += 1
+            try:
+                data = self.backend.fetch(endpoint, ticker, dict(params))
+            except Exception:
+                text = self._stale(name)
+                if text is None:
+                    raise
+                with self._lock:
+                    self.stale += 1
+                return text
+            fetched_at = self.clock()
+            text = json.dumps({"endpoint": endpoint, "ticker": ticker, "params": params,
+                               "fetched_at": fetched_at, "data": data}, sort_keys=True)
+            self._store(name, fetched_at, text)
+            return text
+        finally:
+            lock.close()
+
+    def _stale(self, name):
+        try:
+            with open(self._path(name)) as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _store(self, name, fetched_at, text):
+        path = self._path(name)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data = text.encode()
+        with open(tmp, "wb") as f:
+            f.write(data)
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp, path)
+        self._remember(name, fetched_at, text)
+        with self._lock:
+            self._size += len(data) - replaced
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def _remove(self, name):
+        """Delete an entry and its lock file; False if the entry was already gone."""
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            return False
+        try:
+            os.remove(self._lock_path(name))
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._memory.pop(name, None)
+        return True
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.name[:-5], entry.path))
+        entries.sort()
+        size = sum(e[1] for e in entries)
+        for _, entry_size, name, path in entries:
+            if size <= self.max_bytes:
+                break
+            if not self._remove(name):
+                continue
+            size -= entry_size
+            with self._lock:
+                self.evictions += 1
+        with self._lock:
+            self._size = size
+
+    def entries(self):
+        """Yield (data class, fresh, bytes) for every entry on disk."""
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                size = entry.stat().st_size
+                with open(entry.path) as f:
+                    data = json.load(f)
+                endpoint = data["endpoint"]
+                yield (DATA_CLASSES.get(endpoint, "default"), self._fresh(data["fetched_at"], endpoint), size)
+
+    def prune(self):
+        """Delete expired entries. Returns the number deleted."""
+        removed = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                size = entry.stat().st_size
+                with open(entry.path) as f:
+                    data = json.load(f)
+                if not self._fresh(data["fetched_at"], data["endpoint"]) and self._remove(entry.name[:-5]):
+                    removed += 1
+                    with self._lock:
+                        self._size -= size
+        return removed
+
+    def clear(self):
+        """Delete every entry and lock file. Returns the number of entries deleted."""
+        evictions, max_bytes = self.evictions, self.max_bytes
+        self.max_bytes = 0
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = max_bytes
+        for entry in os.scandir(os.path.join(self.cache_dir, "locks")):
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        return self.evictions - evictions
+
+    # -------------------------------------------------------------------------
+    # Stats
+    # -------------------------------------------------------------------------
+
+    def stats(self):
+        requests = self.hits + self.misses + self.coalesced + self.stale
+        return {
+            "requests": requests,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / requests if requests else 0.0,
+            "bytes": self._size,
+        }
+
+    def report(self):
+        """One-line hit/miss summary."""
+        s = self.stats()
+        return (f"Market data cache: {s['hits']} hits, {s['misses']} misses, "
+                f"{s['coalesced']} coalesced, {s['stale']} stale ({s['hit_rate']:.0%} hit rate)")
+
+
+# =============================================================================
+# STAND-IN SERVER
+# =============================================================================
+
+class _BackendHandler(BaseHTTPRequestHandler):
+    backend = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 2:
+            return self._send_json(404, {"error": "expected /<endpoint>/<ticker>"})
+        try:
+            data = self.backend.fetch(parts[0], parts[1], dict(parse_qsl(url.query)))
+        except LookupError as e:
+            return self._send_json(404, {"error": str(e)})
+        self._send_json(200, data)
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(backend, host="127.0.0.1", port=8766):
+    """HTTP server answering GET /<endpoint>/<TICKER>?<params> from backend, for HttpBackend."""
+    handler = type("BackendHandler", (_BackendHandler,), {"backend": backend})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def _backend(args):
+    if args.server:
+        return HttpBackend(args.server)
+    if args.fixtures:
+        return FixtureBackend(args.fixtures)
+    raise SystemExit("error: pass --server URL or --fixtures DIR")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cached Yahoo Finance / SEC EDGAR data")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Cache directory")
+    parser.add_argument("--server", help="Base URL of a market data server")
+    parser.add_argument("--fixtures", help="Directory of recorded responses")
+    sub = parser.add_subparsers(dest="command", required=True)
+    get = sub.add_parser("get", help="Print one response as JSON")
+    get.add_argument("endpoint")
+    get.add_argument("tickers", nargs="+")
+    get.add_argument("--period", help="annual, quarterly, 1y, ...")
+    get.add_argument("--param", action="append", default=[], metavar="K=V", help="Extra parameter")
+    get.add_argument("--refresh", action="store_true", help="Ignore cached entries")
+    serve = sub.add_parser("serve", help="Serve --fixtures (or --server) over HTTP")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8766)
+    sub.add_parser("stats", help="Entries and bytes per data class")
+    sub.add_parser("prune", help="Delete expired entries")
+    sub.add_parser("clear", help="Delete every entry")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = make_server(_backend(args), args.host, args.port)
+        print(f"Serving market data on http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.command == "get":
+        md = MarketData(_backend(args), args.cache_dir)
+        params = dict(p.split("=", 1) for p in args.param)
+        for ticker in args.tickers:
+            data = md.get(args.endpoint, ticker, args.period, refresh=args.refresh, **params)
+            print(json.dumps(data, indent=1))
+        print(md.report(), file=sys.stderr)
+        return
+
+    md = MarketData(None, args.cache_dir)
+    if args.command == "prune":
+        print(f"Removed {md.prune()} expired entries")
+    elif args.command == "clear":
+        print(f"Removed {md.clear()} entries")
+    else:
+        summary = {}
+        for data_class, fresh, size in md.entries():
+            row = summary.setdefault(data_class, [0, 0, 0])
+            row[0 if fresh else 1] += 1
+            row[2] += size
+        print(f"{'Data class':<12} {'Fresh':>6} {'Expired':>8} {'KB':>8}")
+        for data_class, (fresh, expired, size) in sorted(summary.items()):
+            print(f"{data_class:<12} {fresh:>6} {expired:>8} {size / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
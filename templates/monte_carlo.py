@@ -0,0 +1,206 @@
+"""
+Monte Carlo Valuation Engine
+
+Draws revenue growth, FCF margin, WACC and terminal growth from distributions
+and values every path with the vectorized DCF in templates/dcf.py. Paths are
+simulated in fixed-size chunks, each with its own child seed, so results are
+reproducible for a given seed whatever the chunk-to-core split, and memory
+stays bounded: each chunk is folded into a fixed-bin histogram and running
+totals before the next one is drawn.
+
+Usage:
+    from templates.monte_carlo import simulate, valuation_rows
+
+    result = simulate(
+        revenue=5.3e9, price=150.0, shares=170e6, net_debt=1.0e9,
+        growth={"dist": "normal", "mean": 0.08, "sd": 0.03},
+        margin={"dist": "triangular", "low": 0.12, "mode": 0.18, "high": 0.24},
+        wacc={"dist": "uniform", "low": 0.08, "high": 0.11},
+        terminal_growth=0.025,
+        paths=500_000, seed=42, workers=4,
+    )
+    result["percentiles"][50], result["prob_upside"]
+
+A distribution is a number (constant) or a dict with "dist" set to
+"normal" (mean, sd), "triangular" (low, mode, high) or "uniform" (low, high),
+plus optional "min"/"max" clipping. A "monte_carlo" block with the same keys
+in deck data is expanded by build_deck() through apply_monte_carlo().
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from templates.cells import number_format
+from templates.dcf import dcf_fair_values
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+DEFAULT_CHUNK = 50_000
+# Histogram from -2x to 5x the current price, so levered or loss-making
+# models keep their negative fair values; 800 bins per 1x price
+HISTOGRAM_RANGE = (-2.0, 5.0)
+HISTOGRAM_BINS = 5600
+
+
+def _sample(rng, spec, n):
+    """Draw n values from a distribution spec (number or dict)."""
+    if not isinstance(spec, dict):
+        return np.full(n, float(spec))
+    dist = spec["dist"]
+    if dist == "normal":
+        values = rng.normal(spec["mean"], spec["sd"], n)
+    elif dist == "triangular":
+        values = rng.triangular(spec["low"], spec["mode"], spec["high"], n)
+    elif dist == "uniform":
+        values = rng.uniform(spec["low"], spec["high"], n)
+    else:
+        raise ValueError(f"unknown distribution {dist!r}")
+    if "min" in spec or "max" in spec:
+        values = np.clip(values, spec.get("min", -np.inf), spec.get("max", np.inf))
+    return values
+
+
+def _simulate_chunk(seed_seq, n, model, edges):
+    """Simulate n paths; return running totals and histogram counts for the chunk."""
+    rng = np.random.default_rng(seed_seq)
+    fcf = model["revenue"] * _sample(rng, model["margin"], n)
+    values = dcf_fair_values(fcf, _sample(rng, model["wacc"], n), _sample(rng, model["growth"], n),
+                             _sample(rng, model["terminal_growth"], n),
+                             model["net_debt"], model["shares"], model["years"])
+    values = values[np.isfinite(values)]
+    counts = np.histogram(values, bins=edges)[0]
+    return {
+        "valid": values.size,
+        "sum": float(values.sum()),
+        "sum_sq": float(np.square(values).sum()),
+        "upside": int((values > model["price"]).sum()),
+        "below": int((values < edges[0]).sum()),
+        "above": int((values >= edges[-1]).sum()),
+        "min": float(values.min()) if values.size else np.inf,
+        "max": float(values.max()) if values.size else -np.inf,
+        "counts": counts,
+    }
+
+
+def _percentile_from_histogram(edges, counts, below, total, pct):
+    """Linear interpolation of a percentile inside the fixed-bin histogram."""
+    target = pct / 100 * total - below
+    if target <= 0:
+        return float(edges[0])
+    cum = np.cumsum(counts)
+    i = int(np.searchsorted(cum, target))
+    if i >= len(counts):
+        return float(edges[-1])
+    prev = cum[i - 1] if i else 0
+    frac = (target - prev) / counts[i] if counts[i] else 0.0
+    return float(edges[i] + frac * (edges[i + 1] - edges[i]))
+
+
+def simulate(revenue, price, shares, growth, margin, wacc, terminal_growth=0.025,
+             net_debt=0.0, years=5, paths=200_000, seed=0, chunk=DEFAULT_CHUNK, workers=1,
+             histogram_range=HISTOGRAM_RANGE):
+    """Run a chunked Monte Carlo DCF and return summary statistics.
+
+    Returns a dict with paths, valid (paths with WACC > terminal growth),
+    mean, std, percentiles {pct: value}, prob_upside, and the histogram as
+    (edges, counts). The histogram spans histogram_range (low, high) times
+    the price in HISTOGRAM_BINS bins; percentiles are resolved to one bin
+    and clamp to that range, so widen it for models whose fair values reach
+    further.
+    """
+    model = {"revenue": revenue, "price": price, "shares": shares, "net_debt": net_debt,
+             "years": years, "growth": growth, "margin": margin, "wacc": wacc,
+             "terminal_growth": terminal_growth}
+    low, high = histogram_range
+    if not low < high:
+        raise ValueError(f"histogram_range low must be below high, got {histogram_range}")
+    edges = np.linspace(price * low, price * high, HISTOGRAM_BINS + 1)
+    sizes = [chunk] * (paths // chunk) + ([paths % chunk] if paths % chunk else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(_simulate_chunk, seeds, sizes, [model] * len(sizes), [edges] * len(sizes))
+            parts = list(parts)
+    else:
+        parts = [_simulate_chunk(s, n, model, edges) for s, n in zip(seeds, sizes)]
+
+    valid = sum(p["valid"] for p in parts)
+    if not valid:
+        raise ValueError("no valid paths: WACC never exceeds terminal growth")
+    counts = np.sum([p["counts"] for p in parts], axis=0)
+    below = sum(p["below"] for p in parts)
+    mean = sum(p["sum"] for p in parts) / valid
+    variance = max(sum(p["sum_sq"] for p in parts) / valid - mean ** 2, 0.0)
+    return {
+        "paths": paths,
+        "valid": valid,
+        "mean": mean,
+        "std": variance ** 0.5,
+        "min": min(p["min"] for p in parts),
+        "max": max(p["max"] for p in parts),
+        "percentiles": {pct: _percentile_from_histogram(edges, counts, below, valid, pct)
+                        for pct in PERCENTILES},
+        "prob_upside": sum(p["upside"] for p in parts) / valid,
+        "histogram": (edges, counts),
+    }
+
+
+# =============================================================================
+# DECK OUTPUT
+# =============================================================================
+
+def valuation_rows(result, price, weight="—"):
+    """Rows for build_valuation_summary: P10, median and P90 fair values."""
+    labels = {10: "Monte Carlo P10", 50: "Monte Carlo Median", 90: "Monte Carlo P90"}
+    values = np.array([result["percentiles"][pct] for pct in labels])
+    fair = number_format("per_share").format_array(values)
+    upside = number_format("delta").format_array(values / price - 1)
+    return [[label, f, u, weight if pct == 50 else "—"]
+            for (pct, label), f, u in zip(labels.items(), fair, upside)]
+
+
+def distribution_inputs(result, price, bars=20):
+    """Deck data keys for build_valuation_distribution.
+
+    The fine histogram is regrouped into `bars` equal-width bars from 20%
+    below P5 to 20% above P95 (by magnitude, so negative values widen the
+    range too, and a zero-width range is padded by $1 each side); each bar
+    is the share of valid paths falling in it.
+    """
+    edges, counts = result["histogram"]
+    lo = result["percentiles"][5] - abs(result["percentiles"][5]) * 0.2
+    hi = result["percentiles"][95] + abs(result["percentiles"][95]) * 0.2
+    if hi - lo < 1e-6:  # P5 == P95 == 0: no width to scale
+        lo, hi = lo - 1.0, hi + 1.0
+    bar_edges = np.linspace(lo, hi, bars + 1)
+    centers = (edges[:-1] + edges[1:]) / 2
+    grouped = np.histogram(centers, bins=bar_edges, weights=counts)[0]
+    share = grouped / result["valid"]
+    values = np.array(list(result["percentiles"].values()))
+    fair = number_format("per_share").format_array(values)
+    upside = number_format("delta").format_array(values / price - 1)
+    return {
+        "distribution_rows": [
+            [f"P{pct}", f, u] for pct, f, u in zip(result["percentiles"], fair, upside)
+        ],
+        "distribution_histogram": [
+            [label, round(float(share[i]), 4)]
+            for i, label in enumerate(number_format("per_share", 0).format_array(bar_edges[:bars]))
+        ],
+        "distribution_note": (f"{result['valid']:,} simulated paths  |  "
+                              f"Probability of upside: {result['prob_upside'] * 100:.0f}%  |  "
+                              f"Mean ${result['mean']:,.2f}"),
+    }
+
+
+def apply_monte_carlo(d):
+    """Return a copy of deck data with Monte Carlo rows and distribution slide keys."""
+    spec = dict(d["monte_carlo"])
+    weight = spec.pop("weight", "—")
+    spec.setdefault("price", d["price"])
+    result = simulate(**spec)
+    out = dict(d)
+    out["valuation_rows"] = list(d.get("valuation_rows", [])) + valuation_rows(result, d["price"], weight)
+    out.update(distribution_inputs(result, d["price"]))
+    return out
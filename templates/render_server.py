@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Stock Analysis Render Daemon
+
+Long-running local server that keeps StockAnalysisDeck and python-pptx warm in
+a pool of worker processes, so interactive /slides and /analyze-stock runs do
+not pay interpreter and import startup for every deck.
+
+Usage:
+    python templates/render_server.py                       # http://127.0.0.1:8765
+    python templates/render_server.py --port 9000 --workers 4 --max-queue 32
+    python templates/render_server.py --socket /tmp/stock-render.sock
+
+Endpoints:
+    POST /render            Body: the same JSON as --data. Returns the .pptx bytes.
+    POST /render?output=P   Writes the deck to P under output/ and returns {"output": path, ...}.
+    GET  /health            {"status": "ok", ...}
+    GET  /stats             Queue depth, in-flight renders and latency percentiles.
+
+    curl --data @data.json http://127.0.0.1:8765/render -o deck.pptx
+    curl --unix-socket /tmp/stock-render.sock http://localhost/stats
+
+Deck data failing templates/deck_schema.py is rejected with 400 and the list
+of errors before it reaches a worker, as is an output path outside output/.
+At most --workers decks render at once; up to --max-queue more wait for a
+slot. Beyond that the server answers 503 with Retry-After so callers back off.
+If a worker process dies, the pool is replaced. Every request in flight on the
+broken pool is retried once in a worker process of its own, so only a request
+that kills its worker again fails.
+"""
+
+import argparse
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from templates.deck_schema import validate
+from templates.stock_analysis_slides import build_deck, use_prototypes
+
+OUTPUT_ROOT = os.path.join(PROJECT_ROOT, "output")
+PPTX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def render(d, output_path=None):
+    """Render one deck in a worker. Returns (pptx bytes or None, slide count, seconds)."""
+    start = time.perf_counter()
+    deck = build_deck(d)
+    if output_path:
+        deck.save(output_path)
+        blob = None
+    else:
+        buf = io.BytesIO()
+        deck.save(buf)
+        blob = buf.getvalue()
+    return blob, len(deck.prs.slides), time.perf_counter() - start
+
+
+# =============================================================================
+# RENDER QUEUE
+# =============================================================================
+
+class QueueFull(Exception):
+    """Raised when the render queue is at capacity."""
+
+
+class RenderQueue:
+    """Bounded render queue in front of a warm process pool."""
+
+    def __init__(self, workers=2, max_queue=16, prototypes=False, history=1000):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._initializer = use_prototypes if prototypes else None
+        self._pool = self._new_pool()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._restarts = 0
+        self._retried = 0
+        self._latencies = deque(maxlen=history)
+        self._render_times = deque(maxlen=history)
+        self._started = time.time()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=self._initializer)
+
+    def _replace_pool(self, broken):
+        """Swap in a fresh pool for a broken one (once, however many requests saw it break)."""
+        with self._lock:
+            if self._pool is broken:
+                self._pool = self._new_pool()
+                self._restarts += 1
+        broken.shutdown(wait=False)
+
+    def _run(self, d, output_path):
+        pool = self._pool
+        try:
+            future = pool.submit(render, d, output_path)
+        except BrokenProcessPool:
+            # Broken by an earlier request; this one has not started, so run it on a new pool
+            self._replace_pool(pool)
+            pool = self._pool
+            future = pool.submit(render, d, output_path)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._replace_pool(pool)
+        # Any request in flight sees the pool break, not only the one whose
+        # worker died; retry alone so a deck that kills its worker again
+        # fails by itself
+        with self._lock:
+            self._retried += 1
+        with ProcessPoolExecutor(max_workers=1, initializer=self._initializer) as solo:
+            return solo.submit(render, d, output_path).result()
+
+    def submit(self, d, output_path=None):
+        """Render a deck, blocking until a worker slot is free.
+
+        Raises QueueFull if max_queue requests are already waiting.
+        """
+        start = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    self._rejected += 1
+                    raise QueueFull()
+                self._waiting += 1
+            self._slots.acquire()
+            with self._lock:
+                self._waiting -= 1
+        with self._lock:
+            self._in_flight += 1
+        try:
+            blob, slides, render_seconds = self._run(d, output_path)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+        with self._lock:
+            self._completed += 1
+            self._latencies.append(time.perf_counter() - start)
+            self._render_times.append(render_seconds)
+        return blob, slides
+
+    def stats(self):
+        """Return a JSON-serializable snapshot of queue depth and latency."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            render_times = sorted(self._render_times)
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._waiting,
+                "in_flight": self._in_flight,
+                "saturated": self._in_flight >= self.workers and self._waiting > 0,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "pool_restarts": self._restarts,
+                "retried": self._retried,
+                "uptime_seconds": round(time.time() - self._started, 1),
+                "latency_ms": _summary_ms(latencies),
+                "render_ms": _summary_ms(render_times),
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def resolve_output(path, root=OUTPUT_ROOT):
+    """Absolute path for an ?output= value, which must stay under root.
+
+    Relative paths are taken from root. Raises ValueError for anything that
+    resolves outside it (absolute paths elsewhere, "..", symlinks out).
+    """
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root or resolved == root:
+        raise ValueError(f"output path must be a file under {root}")
+    return resolved
+
+
+def _summary_ms(sorted_values):
+    """p50/p95/max in milliseconds of an already sorted list of seconds."""
+    if not sorted_values:
+        return {"p50": None, "p95": None, "max": None}
+
+    def pct(p):
+        return round(sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))] * 1000, 1)
+
+    return {"p50": pct(50), "p95": pct(95), "max": round(sorted_values[-1] * 1000, 1)}
+
+
+# =============================================================================
+# HTTP SERVER
+# =============================================================================
+
+class RenderHandler(BaseHTTPRequestHandler):
+    """HTTP front end for a RenderQueue (set as server.render_queue)."""
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok", "workers": self.server.render_queue.workers})
+        elif path == "/stats":
+            self._send_json(200, self.server.render_queue.stats())
+        else:
+            self._send_json(404, {"error": f"unknown endpoint {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/render":
+            self._send_json(404, {"error": f"unknown endpoint {url.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            d = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            self._send_json(400, {"error": f"invalid JSON body: {e}"})
+            return
+        errors = validate(d)
+        if errors:
+            self._send_json(400, {"error": "invalid deck data", "errors": errors})
+            return
+        output_path = parse_qs(url.query).get("output", [None])[0]
+        if output_path:
+            try:
+                output_path = resolve_output(output_path, self.server.output_root)
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        try:
+            blob, slides = self.server.render_queue.submit(d, output_path)
+        except QueueFull:
+            self._send_json(503, {"error": "render queue full"}, {"Retry-After": "1"})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        if output_path:
+            self._send_json(200, {"output": output_path, "slides": slides})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", PPTX_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(blob)))
+        self.end_headers()
+        self.wfile.write(blob)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(queue, host="127.0.0.1", port=8765, socket_path=None, quiet=False,
+                output_root=OUTPUT_ROOT):
+    """Create (but do not start) an HTTP server bound to TCP or a Unix socket.
+
+    ?output= paths are confined to output_root.
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, RenderHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RenderHandler)
+    server.render_queue = queue
+    server.quiet = quiet
+    server.output_root = output_root
+    return server
+
+
+def main():
+    """CLI entry point — serves deck renders until interrupted."""
+    parser = argparse.ArgumentParser(description="Run the stock analysis render daemon")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument("--socket", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("-w", "--workers", type=int, default=2,
+                        help="Decks rendered concurrently (default: 2)")
+    parser.add_argument("--max-queue", type=int, default=16,
+                        help="Requests allowed to wait for a worker before 503 (default: 16)")
+    parser.add_argument("--prototypes", action="store_true",
+                        help="Clone pre-rendered shape prototypes in each worker")
+    parser.add_argument("--quiet", action="store_true", help="Do not log each request")
+    args = parser.parse_args()
+
+    queue = RenderQueue(args.workers, args.max_queue, args.prototypes)
+    server = make_server(queue, args.host, args.port, args.socket, args.quiet)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"Render daemon listening on {where} ({args.workers} workers, queue {args.max_queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        queue.shutdown()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
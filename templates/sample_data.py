@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Synthetic Stock Analysis Deck Data
+
+Generates deck data dicts in the same shape as the --data JSON read by
+stock_analysis_slides.py, at fixed sizes for benchmarks and tests. Values are
+plausible but random; the same seed always gives the same data.
+
+Usage:
+    python templates/sample_data.py --size typical > data.json
+    python templates/sample_data.py --size extreme --count 100 --out-dir /tmp/decks
+    python templates/sample_data.py --universe 5000 > universe.csv
+
+Or programmatically:
+    from templates.sample_data import generate_deck_data
+    d = generate_deck_data("small", ticker="SYN", seed=1)
+    universe = generate_universe(5000, seed=1)   # columns for templates/comps.py
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import string
+import sys
+
+# Bullet, table-row, peer and year counts per size
+SIZES = {
+    "small": {"bullets": 3, "metrics": 3, "rows": 3, "years": 3, "peers": 2,
+              "scenarios": 3, "waccs": 3, "thesis": 3, "catalysts": 2},
+    "typical": {"bullets": 6, "metrics": 8, "rows": 10, "years": 5, "peers": 4,
+                "scenarios": 5, "waccs": 5, "thesis": 5, "catalysts": 6},
+    "extreme": {"bullets": 25, "metrics": 40, "rows": 60, "years": 10, "peers": 25,
+                "scenarios": 15, "waccs": 12, "thesis": 20, "catalysts": 30},
+}
+
+LINE_ITEMS = ["Revenue", "Gross Profit", "Operating Income", "Net Income", "EPS (Diluted)",
+              "EBITDA", "R&D Expense", "SG&A", "Interest Expense", "Tax Expense"]
+BALANCE_ITEMS = ["Cash & Equivalents", "Total Debt", "Total Assets", "Shareholders' Equity",
+                 "Operating Cash Flow", "CapEx", "Free Cash Flow", "Share Buybacks"]
+METRICS = ["Forward P/E", "Trailing P/E", "PEG Ratio", "EV/EBITDA", "Price/Sales",
+           "Price/Book", "FCF Yield", "Dividend Yield"]
+# Universe sectors: (name, typical EBITDA margin)
+SECTORS = [("Technology", 0.30), ("Health Care", 0.22), ("Financials", 0.35),
+           ("Consumer Discretionary", 0.14), ("Consumer Staples", 0.16), ("Industrials", 0.17),
+           ("Energy", 0.25), ("Materials", 0.20), ("Utilities", 0.38),
+           ("Real Estate", 0.50), ("Communication Services", 0.28)]
+UNIVERSE_FIELDS = ("price", "market_cap", "eps", "ebitda", "net_debt", "book_value",
+                   "revenue", "revenue_growth")
+WORDS = ("growth margin revenue pipeline launch guidance demand pricing share "
+         "competition regulation expansion buyback leverage cycle platform").split()
+
+
+def _sentence(rng, words=10):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _money(rng, lo, hi):
+    return f"${rng.uniform(lo, hi):.1f}B"
+
+
+def _label(items, i):
+    """Cycle through real line-item names, numbering repeats."""
+    name = items[i % len(items)]
+    return name if i < len(items) else f"{name} ({i // len(items) + 1})"
+
+
+def generate_deck_data(size="typical", ticker="SYN", seed=0):
+    """Return a complete deck data dict of the given size."""
+    n = SIZES[size]
+    rng = random.Random(f"{size}:{ticker}:{seed}")
+    price = round(rng.uniform(20, 500), 2)
+    target = round(price * rng.uniform(0.7, 1.6), 2)
+    years = [f"FY{2025 - i}" for i in range(n["years"])]
+    peers = ["".join(rng.choice(string.ascii_uppercase) for _ in range(4)) for _ in range(n["peers"])]
+    waccs = [f"WACC {7 + i * 0.5:.1f}%" for i in range(n["waccs"])]
+    return {
+        "ticker": ticker,
+        "company": f"{ticker.title()} Holdings Inc.",
+        "date": "2026-02-17",
+        "rating": rng.choice(["Strong Buy", "Buy", "Hold", "Sell"]),
+        "price": price,
+        "target": target,
+        "executive_summary": [_sentence(rng, 14) for _ in range(n["bullets"])],
+        "valuation_metrics": [[_label(METRICS, i), f"{rng.uniform(5, 40):.1f}x", _sentence(rng, 4)]
+                              for i in range(n["metrics"])],
+        "income_years": years,
+        "income_rows": [[_label(LINE_ITEMS, i)] + [_money(rng, 0.5, 50) for _ in years]
+                        for i in range(n["rows"])],
+        "income_note": _sentence(rng, 12),
+        "balance_years": years,
+        "balance_rows": [[_label(BALANCE_ITEMS, i)] + [_money(rng, 0.5, 50) for _ in years]
+                         for i in range(n["rows"])],
+        "balance_note": _sentence(rng, 12),
+        "peers": peers,
+        "peer_rows": [[_label(METRICS, i)] + [f"{rng.uniform(5, 40):.1f}x" for _ in range(len(peers) + 1)]
+                      for i in range(n["metrics"])],
+        "valuation_rows": [
+            ["DCF", f"${target * 0.95:.2f}", f"{(target * 0.95 / price - 1) * 100:+.0f}%", "50%"],
+            ["Comps", f"${target * 1.05:.2f}", f"{(target * 1.05 / price - 1) * 100:+.0f}%", "50%"],
+            ["Weighted Avg", f"${target:.2f}", f"{(target / price - 1) * 100:+.0f}%", "—"],
+        ],
+        "valuation_note": _sentence(rng, 10),
+        "sensitivity_scenarios": [f"${1 + i * 0.5:.1f}B FCF" for i in range(n["scenarios"])],
+        "sensitivity_waccs": waccs,
+        "sensitivity_matrix": [[f"${price * rng.uniform(0.5, 2):.0f}" for _ in waccs]
+                               for _ in range(n["scenarios"])],
+        "sensitivity_note": _sentence(rng, 10),
+        "bull_case": [_sentence(rng, 8) for _ in range(n["thesis"])],
+        "bear_case": [_sentence(rng, 8) for _ in range(n["thesis"])],
+        "catalysts": [f"[Q{i % 4 + 1} {2026 + i // 4}] {_sentence(rng, 6)}" for i in range(n["catalysts"])],
+        "risk": rng.choice(["Low", "Medium", "High"]),
+        "consensus": f"Buy (${target * 1.02:.0f} median)",
+        "rec_summary": _sentence(rng, 16),
+    }
+
+
+def generate_universe(n=5000, seed=0):
+    """Return {"ticker", "sector", field: array} columns of n companies for templates/comps.py.
+
+    Market caps are log-normal ($50M .. $1T+); about one company in ten
+    loses money, so its P/E is undefined.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    sector = rng.integers(len(SECTORS), size=n)
+    base_margin = np.array([m for _, m in SECTORS])[sector]
+    market_cap = np.exp(rng.normal(np.log(5e9), 1.6, n))
+    price = np.exp(rng.normal(np.log(60), 0.8, n))
+    revenue = market_cap / np.exp(rng.normal(np.log(2.5), 0.6, n))
+    margin = base_margin + rng.normal(0, 0.08, n)
+    ebitda = revenue * margin
+    net_income = ebitda * 0.55 - revenue * rng.normal(0.03, 0.04, n)
+    shares = market_cap / price
+    return {
+        "ticker": [f"C{i:05d}" for i in range(n)],
+        "sector": [SECTORS[s][0] for s in sector.tolist()],
+        "price": price.round(2),
+        "market_cap": market_cap,
+        "eps": (net_income / shares).round(2),
+        "ebitda": ebitda,
+        "net_debt": ebitda * rng.uniform(-1.0, 3.0, n),
+        "book_value": market_cap / np.exp(rng.normal(np.log(3.0), 0.5, n)),
+        "revenue": revenue,
+        "revenue_growth": rng.normal(0.07, 0.08, n).round(4),
+    }
+
+
+def write_universe(columns, f):
+    """Write generate_universe() columns as CSV."""
+    writer = csv.writer(f)
+    writer.writerow(("ticker", "sector") + UNIVERSE_FIELDS)
+    values = zip(*(columns[name].tolist() for name in UNIVERSE_FIELDS))
+    for ticker, sector, row in zip(columns["ticker"], columns["sector"], values):
+        writer.writerow([ticker, sector] + [f"{v:.6g}" for v in row])
+
+
+def main():
+    """CLI entry point — writes synthetic deck data JSON."""
+    parser = argparse.ArgumentParser(description="Generate synthetic stock analysis deck data")
+    parser.add_argument("--size", choices=sorted(SIZES), default="typical")
+    parser.add_argument("--count", type=int, default=1, help="Number of tickers to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", help="Write one <TICKER>.json per deck here instead of stdout")
+    parser.add_argument("--universe", type=int, metavar="N",
+                        help="Write a comps universe CSV of N companies instead of deck data")
+    args = parser.parse_args()
+
+    if args.universe:
+        write_universe(generate_universe(args.universe, args.seed), sys.stdout)
+        return
+
+    for i in range(args.count):
+        ticker = f"SYN{i}" if args.count > 1 else "SYN"
+        d = generate_deck_data(args.size, ticker, args.seed)
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            with open(os.path.join(args.out_dir, f"{ticker}.json"), "w") as f:
+                json.dump(d, f, indent=2)
+        else:
+            print(json.dumps(d, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Per-Slide Content-Addressed Cache
+
+Caches the finished XML of each slide keyed by a hash of the builder, its
+input slice of the deck data and the source of the builder's module and
+every project module it imports, directly or not (table layout, charts,
+cells, ...). Rebuilding a deck after
+an edit to, say, "catalysts" re-renders only the catalysts slide and copies
+every other slide from the cache.
+
+Usage:
+    from templates.slide_cache import SlideCache
+    from templates.stock_analysis_slides import build_deck
+
+    deck = build_deck(data, cache=SlideCache())
+
+or from the CLI:
+    python templates/stock_analysis_slides.py --data data.json --output deck.pptx --cache
+
+Entries live as flat files under output/.slide-cache/ and are evicted least
+recently used first once the directory exceeds max_bytes.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sys
+
+from lxml import etree
+from pptx.oxml import parse_xml
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, "output", ".slide-cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+_fingerprints = {}
+
+
+def _project_imports(source):
+    """Names of the project modules a module's source imports, including imports inside functions."""
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return {name for name in names if os.path.isfile(_module_path(name))}
+
+
+def _module_path(module_name):
+    return os.path.join(PROJECT_ROOT, *module_name.split(".")) + ".py"
+
+
+def _module_fingerprint(module_name):
+    """Hash of a builder module's source and every project module it imports.
+
+    Any template change that can alter a slide (table layout, charts, cell
+    formats, layout constants) therefore invalidates the cache.
+    """
+    if module_name not in _fingerprints:
+        root = sys.modules[module_name].__file__
+        sources, pending = {}, [root]
+        while pending:
+            path = pending.pop()
+            if path in sources:
+                continue
+            with open(path, "rb") as f:
+                sources[path] = f.read()
+            pending.extend(_module_path(name) for name in _project_imports(sources[path]))
+        h = hashlib.sha256()
+        for path in sorted(sources, key=lambda p: os.path.relpath(p, PROJECT_ROOT)):
+            h.update(os.path.relpath(path, PROJECT_ROOT).encode() + b"\0" + sources[path])
+        _fingerprints[module_name] = h.hexdigest()
+    return _fingerprints[module_name]
+
+
+class SlideCache:
+    """On-disk LRU cache of rendered slide XML."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(e.stat().st_size for e in os.scandir(cache_dir) if e.is_file())
+
+    def key(self, builder, args):
+        """Content hash of a builder call."""
+        payload = json.dumps([_module_fingerprint(builder.__module__), builder.__name__, args],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def build_slide(self, prs, builder, args):
+        """Add the slide for builder(prs, *args), from the cache when possible."""
+        path = os.path.join(self.cache_dir, self.key(builder, args) + ".xml")
+        try:
+            with open(path, "rb") as f:
+                xml = f.read()
+        except FileNotFoundError:
+            xml = None
+
+        if xml is not None:
+            self.hits += 1
+            os.utime(path)  # mark as recently used
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            sld = slide._element
+            sld.replace(sld.cSld, parse_xml(xml))
+            return slide
+
+        self.misses += 1
+        count = len(prs.slides)
+        slide = builder(prs, *args)
+        # Slides with their own parts (charts, images) reference them by rId, and
+        # tables split onto continuation slides span several slides; not cacheable
+        if len(slide.part.rels) == 1 and len(prs.slides) == count + 1:
+            self._store(path, etree.tostring(slide._element.cSld))
+        return slide
+
+    def _store(self, path, xml):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(xml)
+        os.replace(tmp, path)
+        self._size += len(xml)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+
+    def report(self):
+        """One-line hit/miss summary."""
+        return f"Slide cache: {self.hits} hits, {self.misses} misses"
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Batch Stock Analysis Deck Generation
+
+Builds one stock analysis deck per data file, fanning the work out across a
+pool of worker processes. Each worker imports python-pptx and the slide
+template once and then renders decks until the batch is done.
+
+Usage:
+    python templates/stock_analysis_batch.py data/                 # every *.json in a directory
+    python templates/stock_analysis_batch.py "data/*.json"         # glob pattern
+    python templates/stock_analysis_batch.py coverage.jsonl        # JSONL manifest
+    python templates/stock_analysis_batch.py data/ --workers 8 --output-dir output/stock
+
+Manifest lines are either a data file path (as a JSON string), an object with
+a "data" path and optional "output" path, or an inline deck data object. A
+malformed line is reported as a failure for its path:line and the rest of the
+manifest still runs.
+
+Each deck is written to <output-dir>/YYYY-MM-DD-<ticker>/YYYY-MM-DD-<ticker>-analysis.pptx
+using the "date" and "ticker" fields of its data. Every data file is checked
+against templates/deck_schema.py before any deck is rendered; invalid files,
+and jobs that would write the same output path as an earlier job, are
+reported as failures and never reach a worker.
+
+If a worker process dies (out of memory, a crash in a native library), the
+jobs it took down with the pool are re-run one at a time in a fresh worker:
+the job that kills it again is reported as failed and the rest are rendered.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from templates.deck_schema import validate, validate_file
+from templates.stock_analysis_slides import build_deck, use_prototypes
+
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output", "stock")
+
+
+# =============================================================================
+# INPUT DISCOVERY
+# =============================================================================
+
+def _manifest_job(label, base, entry):
+    """The job for one parsed manifest entry; raises ValueError for a malformed one."""
+    if isinstance(entry, str):
+        return label, os.path.join(base, entry), None, None
+    if not isinstance(entry, dict):
+        raise ValueError(f"expected a data path string or an object, got {type(entry).__name__}")
+    output = entry.get("output")
+    if output is not None and not isinstance(output, str):
+        raise ValueError(f"\"output\" must be a path string, got {type(output).__name__}")
+    if "data" in entry:
+        if not isinstance(entry["data"], str):
+            raise ValueError(f"\"data\" must be a path string, got {type(entry['data']).__name__}")
+        return label, os.path.join(base, entry["data"]), None, output
+    return label, None, entry, output
+
+
+def _read_manifest(path):
+    """Yield (label, data_path, inline_data, output_path) jobs from a JSONL manifest.
+
+    A malformed line yields a job whose inline data is the ValueError
+    describing it, reported as a failure by validate_jobs() and render_job().
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            label = f"{path}:{lineno}"
+            try:
+                yield _manifest_job(label, base, json.loads(line))
+            except ValueError as e:
+                yield label, None, ValueError(f"bad manifest line: {e}"), None
+
+
+def collect_jobs(inputs):
+    """Expand directories, glob patterns and JSONL manifests into render jobs."""
+    jobs = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths = sorted(glob.glob(os.path.join(item, "*.json")))
+        elif item.endswith(".jsonl"):
+            jobs.extend(_read_manifest(item))
+            continue
+        elif glob.has_magic(item):
+            paths = sorted(glob.glob(item))
+        else:
+            paths = [item]
+        jobs.extend((p, p, None, None) for p in paths)
+    return jobs
+
+
+def default_output_path(d, output_dir=DEFAULT_OUTPUT_DIR):
+    """Return the conventional output/stock/YYYY-MM-DD-<ticker>/ deck path for a data dict."""
+    slug = f"{d['date']}-{d['ticker'].lower()}"
+    return os.path.join(output_dir, slug, f"{slug}-analysis.pptx")
+
+
+def validate_jobs(jobs, output_dir=DEFAULT_OUTPUT_DIR):
+    """Load and validate every job's data and output path up front.
+
+    Returns (valid_jobs, failures): valid jobs carry their parsed data and
+    resolved output path so workers do not re-read them, failures are
+    render_job-style results. A job writing the same output path as an
+    earlier one fails instead of racing it for the file.
+    """
+    valid, failures = [], []
+    written = {}
+    for label, data_path, d, output_path in jobs:
+        if isinstance(d, Exception):
+            failures.append((label, output_path, 0.0, str(d)))
+            continue
+        if d is None:
+            d, errors = validate_file(data_path)
+        else:
+            errors = validate(d)
+        if errors:
+            failures.append((label, output_path, 0.0, "invalid data: " + "; ".join(errors)))
+            continue
+        output_path = output_path or default_output_path(d, output_dir)
+        key = os.path.normcase(os.path.abspath(output_path))
+        if key in written:
+            failures.append((label, output_path, 0.0,
+                             f"duplicate output path (also written by {written[key]})"))
+            continue
+        written[key] = label
+        valid.append((label, data_path, d, output_path))
+    return valid, failures
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def render_job(job, output_dir=DEFAULT_OUTPUT_DIR):
+    """Render one deck. Returns (label, output_path, seconds, error)."""
+    label, data_path, d, output_path = job
+    start = time.perf_counter()
+    try:
+        if isinstance(d, Exception):
+            raise d
+        if d is None:
+            with open(data_path) as f:
+                d = json.load(f)
+        output_path = output_path or default_output_path(d, output_dir)
+        build_deck(d).save(output_path)
+        return label, output_path, time.perf_counter() - start, None
+    except Exception as e:
+        return label, output_path, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def print_summary(results, elapsed, out=sys.stdout):
+    """Print throughput and per-deck latency for a finished batch."""
+    ok = sorted(r[2] for r in results if r[3] is None)
+    failed = [r for r in results if r[3] is not None]
+    print("", file=out)
+    print(f"Built {len(ok)} decks ({len(failed)} failed) in {elapsed:.2f}s"
+          f" — {len(results) / elapsed if elapsed else 0:.1f} decks/s", file=out)
+    if ok:
+        print(f"Per-deck latency: mean {sum(ok) / len(ok) * 1000:.0f} ms"
+              f"  p50 {_percentile(ok, 50) * 1000:.0f} ms"
+              f"  p95 {_percentile(ok, 95) * 1000:.0f} ms"
+              f"  max {ok[-1] * 1000:.0f} ms", file=out)
+    for label, _, _, error in failed:
+        print(f"FAILED: {label}: {error}", file=out)
+
+
+def _report(result, results):
+    if result[3] is not None:
+        print(f"FAILED: {result[0]}: {result[3]}", file=sys.stderr)
+    results.append(result)
+
+
+def _run_isolated(jobs, output_dir, initializer, results):
+    """Render jobs one at a time in a single worker, replacing it whenever a job kills it."""
+    pool = None
+    try:
+        for job in jobs:
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=1, initializer=initializer)
+            try:
+                result = pool.submit(render_job, job, output_dir).result()
+            except BrokenProcessPool:
+                pool.shutdown(wait=False)
+                pool = None
+                result = job[0], job[3], 0.0, "worker process died while rendering"
+            _report(result, results)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def run_batch(jobs, workers=None, output_dir=DEFAULT_OUTPUT_DIR, prototypes=False):
+    """Render all jobs across a process pool and return the per-job results."""
+    results = []
+    broken = []
+    initializer = use_prototypes if prototypes else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+        futures = {}
+        for i, job in enumerate(jobs):
+            try:
+                futures[pool.submit(render_job, job, output_dir)] = job
+            except BrokenProcessPool:
+                broken += jobs[i:]
+                break
+        for future in as_completed(futures):
+            try:
+                _report(future.result(), results)
+            except BrokenProcessPool:
+                broken.append(futures[future])
+    if broken:
+        print(f"Worker process died; re-running {len(broken)} unfinished jobs one at a time",
+              file=sys.stderr)
+        _run_isolated(broken, output_dir, initializer, results)
+    return results
+
+
+def main():
+    """CLI entry point — builds one deck per data file in parallel."""
+    parser = argparse.ArgumentParser(description="Generate stock analysis slides in batch")
+    parser.add_argument("inputs", nargs="+",
+                        help="Data directories, glob patterns, JSON files or JSONL manifests")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help="Root directory for YYYY-MM-DD-<ticker>/ deck folders")
+    parser.add_argument("--prototypes", action="store_true",
+                        help="Clone pre-rendered shape prototypes in each worker")
+    args = parser.parse_args()
+
+    jobs = collect_jobs(args.inputs)
+    if not jobs:
+        parser.error("no data files found")
+
+    start = time.perf_counter()
+    jobs, results = validate_jobs(jobs, args.output_dir)
+    for label, _, _, error in results:
+        print(f"FAILED: {label}: {error}", file=sys.stderr)
+    if jobs:
+        results += run_batch(jobs, args.workers, args.output_dir, args.prototypes)
+    print_summary(results, time.perf_counter() - start)
+    sys.exit(1 if any(r[3] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
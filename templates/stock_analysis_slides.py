@@ -16,17 +16,35 @@ Usage:
         --output output/stock/2026-02-17-aapl/2026-02-17-aapl-analysis.pptx \
         --data data.json
 
+    # Stream the deck to stdout instead of a file
+    python templates/stock_analysis_slides.py --data data.json --output - > deck.pptx
+
+    # Check the data file without rendering anything
+    python templates/stock_analysis_slides.py --data data.json --validate-only
+
+    # Write each slide as soon as it is built (flat memory for very large decks)
+    python templates/stock_analysis_slides.py --data data.json --output deck.pptx --stream
+
 Or import and use programmatically:
     from templates.stock_analysis_slides import StockAnalysisDeck
     deck = StockAnalysisDeck(ticker="AAPL", company="Apple Inc.", ...)
     deck.build()
     deck.save("output.pptx")
+
+    # A 1,000-slide coverage deck in constant memory
+    from templates.stock_analysis_slides import StreamingDeck, build_deck
+    deck = StreamingDeck("coverage.pptx")
+    for d in decks:
+        build_deck(d, deck=deck)
+    deck.save()
 """
 
 import argparse
 import json
 import os
 import sys
+from copy import deepcopy
+from xml.sax.saxutils import escape as xml_escape
 
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
@@ -52,12 +70,138 @@ SLIDE_WIDTH = Inches(13.333)
 SLIDE_HEIGHT = Inches(7.5)
 
 
+# =============================================================================
+# BASE PRESENTATION SNAPSHOT
+# =============================================================================
+# Presentation() unpacks and parses python-pptx's bundled template on every
+# call. The resized 16:9 base is parsed once per process and each deck gets a
+# deep copy of it that shares the read-only parts (masters, layouts, theme,
+# media) with the base, so only presentation.xml and a few small parts are
+# actually copied. Set STOCK_DECK_BASE_SNAPSHOT to a .pptx written by
+# save_base_snapshot() to start from a pre-serialized base instead.
+
+_SHARED_PART_PREFIXES = (
+    "/ppt/slideMasters/", "/ppt/slideLayouts/", "/ppt/theme/", "/ppt/media/",
+    "/ppt/printerSettings/", "/docProps/thumbnail",
+)
+_base = None
+
+
+def base_presentation():
+    """Return the cached 16:9 base presentation, parsing it on first use.
+
+    Returns (presentation, shared_parts) where shared_parts are the parts
+    new_presentation() hands to every deck without copying.
+    """
+    global _base
+    if _base is None:
+        snapshot = os.environ.get("STOCK_DECK_BASE_SNAPSHOT")
+        if snapshot and os.path.exists(snapshot):
+            prs = Presentation(snapshot)
+        else:
+            prs = Presentation()
+            prs.slide_width = SLIDE_WIDTH
+            prs.slide_height = SLIDE_HEIGHT
+        shared = [part for part in prs.part.package.iter_parts()
+                  if str(part.partname).startswith(_SHARED_PART_PREFIXES)]
+        _base = (prs, shared)
+    return _base
+
+
+def new_presentation():
+    """Return a fresh 16:9 presentation cloned from the cached base."""
+    prs, shared = base_presentation()
+    return deepcopy(prs, {id(part): part for part in shared})
+
+
+def save_base_snapshot(path):
+    """Write the 16:9 base presentation to path for STOCK_DECK_BASE_SNAPSHOT."""
+    prs, _ = base_presentation()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    prs.save(path)
+
+
+# =============================================================================
+# PROTOTYPE CACHE
+# =============================================================================
+# With prototypes enabled, each distinct shape (background, title band, accent
+# line, rounded box, styled textbox) is rendered once through python-pptx on a
+# scratch slide. Later slides deep-copy that XML and only fill in the text, so
+# the output is identical to the per-property path at a fraction of the cost.
+
+_prototypes = None
+_prototype_slide = None
+
+
+def use_prototypes(enabled=True):
+    """Turn prototype cloning on or off for all helpers and builders."""
+    global _prototypes, _prototype_slide
+    _prototypes = {} if enabled else None
+    _prototype_slide = None
+
+
+def _is_plain_text(text):
+    """True if python-pptx would write text as a single unescaped run."""
+    return isinstance(text, str) and text != "" and text.isprintable()
+
+
+def _stamp(slide, key, render):
+    """Clone the prototype for key onto slide, rendering it on first use.
+
+    Returns the cloned shape elements, with shape ids and names renumbered
+    exactly as python-pptx would have assigned them on this slide.
+    """
+    global _prototypes, _prototype_slide
+    cache = _prototypes
+    proto = cache.get(key)
+    if proto is None:
+        if _prototype_slide is None:
+            scratch = new_presentation()
+            _prototype_slide = scratch.slides.add_slide(scratch.slide_layouts[6])
+        _prototypes = None
+        try:
+            # Fresh proxy each time: python-pptx caches background/shape proxies per slide
+            render(type(_prototype_slide)(_prototype_slide._element, _prototype_slide.part))
+        finally:
+            _prototypes = cache
+        cSld = _prototype_slide._element.cSld
+        bg = cSld.bg
+        if bg is not None:
+            cSld.remove(bg)
+        spTree = cSld.spTree
+        elements = list(spTree.iter_shape_elms())
+        for el in elements:
+            spTree.remove(el)
+        proto = cache[key] = (bg, elements)
+
+    bg, elements = proto
+    if bg is not None:
+        cSld = slide._element.cSld
+        cSld._remove_bg()
+        cSld.insert(0, deepcopy(bg))
+
+    shapes = slide.shapes
+    clones = []
+    for el in elements:
+        clone = deepcopy(el)
+        id_ = shapes._next_shape_id
+        cNvPr = clone[0][0]
+        cNvPr.set("id", str(id_))
+        cNvPr.set("name", "%s %d" % (cNvPr.get("name").rpartition(" ")[0], id_ - 1))
+        shapes._spTree.insert_element_before(clone, "p:extLst")
+        clones.append(clone)
+    return clones
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
 def add_background(slide, color=WHITE):
     """Set slide background color."""
+    if _prototypes is not None:
+        _stamp(slide, ("background", color), lambda s: add_background(s, color))
+        return
     fill = slide.background.fill
     fill.solid()
     fill.fore_color.rgb = color
@@ -67,6 +211,13 @@ def add_textbox(slide, left, top, width, height, text, font_size=18,
                 bold=False, color=BLACK, alignment=PP_ALIGN.LEFT,
                 font_name="Calibri"):
     """Add a textbox with formatted text."""
+    if _prototypes is not None and _is_plain_text(text):
+        key = ("textbox", left, top, width, height, font_size, bold, color, alignment, font_name)
+        txBox, = _stamp(slide, key, lambda s: add_textbox(
+            s, left, top, width, height, "x", font_size, bold, color, alignment, font_name))
+        txBox.xpath(".//a:t")[0].text = text
+        return slide.shapes._shape_factory(txBox)
+
     txBox = slide.shapes.add_textbox(left, top, width, height)
     tf = txBox.text_frame
     tf.word_wrap = True
@@ -85,6 +236,20 @@ def add_bullet_textbox(slide, left, top, width, height, bullets, font_size=16,
     """Add a textbox with bullet points."""
     from pptx.oxml.ns import qn
 
+    if _prototypes is not None and bullets and all(_is_plain_text(b) for b in bullets):
+        key = ("bullets", left, top, width, height, font_size, color)
+        txBox, = _stamp(slide, key, lambda s: add_bullet_textbox(
+            s, left, top, width, height, ["x", "x"], font_size, color))
+        txBody = txBox.txBody
+        first, rest = txBody.p_lst
+        txBody.remove(rest)
+        first.xpath("./a:r/a:t")[0].text = bullets[0]
+        for bullet_text in bullets[1:]:
+            p = deepcopy(rest)
+            p.xpath("./a:r/a:t")[0].text = bullet_text
+            txBody.append(p)
+        return slide.shapes._shape_factory(txBox)
+
     txBox = slide.shapes.add_textbox(left, top, width, height)
     tf = txBox.text_frame
     tf.word_wrap = True
@@ -109,14 +274,24 @@ def add_bullet_textbox(slide, left, top, width, height, bullets, font_size=16,
     return txBox
 
 
-def add_title_bar(slide, title_text, subtitle_text=None):
-    """Add a colored title bar at the top of a slide."""
-    shape = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE, Inches(0), Inches(0), SLIDE_WIDTH, Inches(1.2)
-    )
+def add_bar(slide, left, top, width, height, color, shape_type=MSO_SHAPE.RECTANGLE):
+    """Add a solid-filled shape with no outline (title bands, accent lines, badges)."""
+    if _prototypes is not None:
+        key = ("bar", left, top, width, height, color, shape_type)
+        shape, = _stamp(slide, key, lambda s: add_bar(
+            s, left, top, width, height, color, shape_type))
+        return slide.shapes._shape_factory(shape)
+
+    shape = slide.shapes.add_shape(shape_type, left, top, width, height)
     shape.fill.solid()
-    shape.fill.fore_color.rgb = DARK_BLUE
+    shape.fill.fore_color.rgb = color
     shape.line.fill.background()
+    return shape
+
+
+def add_title_bar(slide, title_text, subtitle_text=None):
+    """Add a colored title bar at the top of a slide."""
+    add_bar(slide, Inches(0), Inches(0), SLIDE_WIDTH, Inches(1.2), DARK_BLUE)
 
     add_textbox(slide, Inches(0.6), Inches(0.15), Inches(12), Inches(0.7),
                 title_text, font_size=32, bold=True, color=WHITE)
@@ -126,8 +301,154 @@ def add_title_bar(slide, title_text, subtitle_text=None):
                     subtitle_text, font_size=14, color=RGBColor(0xBD, 0xC3, 0xC7))
 
 
-def add_table(slide, left, top, width, height, headers, rows, col_widths=None):
-    """Add a formatted table with header styling and alternating row colors."""
+def _table_cell_xml(font_size, bold, color, alignment, fill):
+    """Precompute the (prefix, suffix) XML around the text of a styled table cell."""
+    b = ' b="1"' if bold else ""
+    prefix = (
+        '<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p>'
+        f'<a:pPr algn="{alignment.xml_value}"><a:defRPr sz="{font_size * 100}"{b}>'
+        f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+        '<a:latin typeface="Calibri"/></a:defRPr></a:pPr><a:r><a:t>'
+    )
+    suffix = (
+        '</a:t></a:r></a:p></a:txBody>'
+        f'<a:tcPr anchor="{MSO_ANCHOR.MIDDLE.xml_value}">'
+        f'<a:solidFill><a:srgbClr val="{fill}"/></a:solidFill></a:tcPr></a:tc>'
+    )
+    return prefix, suffix
+
+
+# Header, then [even, odd] data rows x [first column, other columns]
+_HEADER_CELL = _table_cell_xml(14, True, WHITE, PP_ALIGN.CENTER, DARK_BLUE)
+_BODY_CELLS = [
+    [_table_cell_xml(13, False, BLACK, align, fill) for align in (PP_ALIGN.LEFT, PP_ALIGN.CENTER)]
+    for fill in (LIGHT_GRAY, WHITE)
+]
+_EMPTY_CELL = '<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p/></a:txBody><a:tcPr/></a:tc>'
+_TABLE_STYLE_ID = "{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"
+
+
+def _column_widths(width, num_cols, col_widths=None):
+    """Column widths add_table uses: width split evenly, overridden by col_widths."""
+    widths = [width // num_cols] * num_cols
+    widths[-1] = width - (num_cols - 1) * widths[0]
+    for i, w in enumerate(col_widths or ()):
+        widths[i] = w
+    return widths
+
+
+def add_table(slide, left, top, width, height, headers, rows, col_widths=None, row_heights=None):
+    """Add a formatted table with header styling and alternating row colors.
+
+    rows may be a CellTable (templates/cells.py), formatted as it is iterated.
+    The whole a:tbl element is written as one XML string from precomputed cell
+    fragments and parsed once. Cells whose text python-pptx would split or
+    escape are styled afterwards through the regular cell API. Rows share
+    height evenly unless row_heights (header first) is given. Rows shorter
+    than headers are padded with empty cells; longer rows raise ValueError.
+    """
+    from pptx.oxml import parse_xml
+    from pptx.oxml.ns import nsdecls
+    from pptx.oxml.shapes.graphfrm import CT_GraphicalObjectFrame
+
+    num_cols = len(headers)
+    deferred = []
+
+    def cell(i, j, text, fragments):
+        if _is_plain_text(text):
+            prefix, suffix = fragments
+            return prefix + xml_escape(text) + suffix
+        deferred.append((i, j, text))
+        return _EMPTY_CELL
+
+    tr_xml = ["".join(cell(0, j, header, _HEADER_CELL) for j, header in enumerate(headers))]
+    for i, row in enumerate(rows):
+        if len(row) > num_cols:
+            raise ValueError(f"table row {i + 1} has {len(row)} cells for {num_cols} columns")
+        body = _BODY_CELLS[i % 2]
+        # Short rows end in empty cells, as python-pptx leaves cells it was not given
+        tr_xml.append("".join(cell(i + 1, j, str(val), body[j > 0]) for j, val in enumerate(row))
+                      + _EMPTY_CELL * (num_cols - len(row)))
+
+    num_rows = len(tr_xml)
+    widths = _column_widths(width, num_cols, col_widths)
+    if row_heights is None:
+        row_height = height // num_rows
+        row_heights = [row_height] * (num_rows - 1) + [height - (num_rows - 1) * row_height]
+
+    xml = [
+        f'<a:tbl {nsdecls("a")}><a:tblPr firstRow="1" bandRow="1">'
+        f'<a:tableStyleId>{_TABLE_STYLE_ID}</a:tableStyleId></a:tblPr><a:tblGrid>',
+        "".join(f'<a:gridCol w="{w}"/>' for w in widths),
+        "</a:tblGrid>",
+    ]
+    for tr, h in zip(tr_xml, row_heights):
+        xml.append(f'<a:tr h="{h}">{tr}</a:tr>')
+    xml.append("</a:tbl>")
+
+    shapes = slide.shapes
+    id_ = shapes._next_shape_id
+    frame_width = sum(widths) if col_widths else width
+    graphicFrame = CT_GraphicalObjectFrame.new_graphicFrame(
+        id_, "Table %d" % (id_ - 1), left, top, frame_width, height)
+    graphicFrame.graphic.graphicData.uri = "http://schemas.openxmlformats.org/drawingml/2006/table"
+    graphicFrame.graphic.graphicData.append(parse_xml("".join(xml)))
+    shapes._spTree.insert_element_before(graphicFrame, "p:extLst")
+    table_shape = shapes._shape_factory(graphicFrame)
+
+    for i, j, text in deferred:
+        c = table_shape.table.cell(i, j)
+        c.text = text
+        c.fill.solid()
+        if i == 0:
+            c.fill.fore_color.rgb = DARK_BLUE
+        else:
+            c.fill.fore_color.rgb = LIGHT_GRAY if i % 2 == 1 else WHITE
+        for paragraph in c.text_frame.paragraphs:
+            paragraph.font.size = Pt(14 if i == 0 else 13)
+            if i == 0:
+                paragraph.font.bold = True
+            paragraph.font.color.rgb = WHITE if i == 0 else BLACK
+            paragraph.font.name = "Calibri"
+            paragraph.alignment = PP_ALIGN.CENTER if i == 0 or j > 0 else PP_ALIGN.LEFT
+        c.vertical_anchor = MSO_ANCHOR.MIDDLE
+
+    return table_shape
+
+
+def add_paginated_table(prs, slide, title, left, top, width, height, headers, rows,
+                        col_widths=None, bottom=Inches(7.0)):
+    """Add a table to slide, continuing it on "(cont.)" slides if it would run past bottom.
+
+    Row heights are estimated by templates/table_layout.py. A table that fits
+    is added exactly as add_table would; otherwise each page repeats the
+    header and gets rows sized to their text. Returns the last slide used.
+    """
+    from templates.table_layout import paginate, row_heights
+
+    rows = list(rows)
+    widths = _column_widths(width, len(headers), col_widths)
+    heights = row_heights(headers, rows, widths)
+    if len(paginate(heights, bottom - top, height // (len(rows) + 1))) == 1:
+        add_table(slide, left, top, width, height, headers, rows, col_widths)
+        return slide
+
+    for page, (start, stop) in enumerate(paginate(heights, bottom - top)):
+        if page:
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            add_background(slide)
+            add_title_bar(slide, f"{title} (cont.)")
+        page_heights = heights[:1] + heights[start + 1:stop + 1]
+        add_table(slide, left, top, width, sum(page_heights), headers, rows[start:stop],
+                  col_widths, page_heights)
+    return slide
+
+
+def _add_table_by_cell(slide, left, top, width, height, headers, rows, col_widths=None):
+    """Reference add_table that styles every cell through python-pptx setters.
+
+    Kept for equivalence tests and benchmarks of the direct-XML engine.
+    """
     num_rows = len(rows) + 1
     num_cols = len(headers)
 
@@ -171,6 +492,12 @@ def add_table(slide, left, top, width, height, headers, rows, col_widths=None):
 
 def add_rounded_box(slide, left, top, width, height, fill_color, border_color):
     """Add a rounded rectangle with fill and border."""
+    if _prototypes is not None:
+        key = ("rounded_box", left, top, width, height, fill_color, border_color)
+        shape, = _stamp(slide, key, lambda s: add_rounded_box(
+            s, left, top, width, height, fill_color, border_color))
+        return slide.shapes._shape_factory(shape)
+
     shape = slide.shapes.add_shape(
         MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height
     )
@@ -181,6 +508,48 @@ def add_rounded_box(slide, left, top, width, height, fill_color, border_color):
     return shape
 
 
+CHART_COLORS = [DARK_BLUE, ACCENT_BLUE, ACCENT_GREEN, ACCENT_RED, MEDIUM_GRAY]
+
+
+def add_chart(slide, left, top, width, height, categories, series, line_series=(),
+              number_format="#,##0.0"):
+    """Add a native column, line or column + line combo chart.
+
+    series: {name: [values]} aligned with categories (None leaves a gap)
+    line_series: names drawn as lines; with column series present they go
+    on a secondary axis (combo), otherwise the chart is a line chart.
+    """
+    from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+    from templates.charts import TrendChartData, add_chart as add_chart_frame
+
+    chart_data = TrendChartData(number_format, line_series)
+    chart_data.categories = categories
+    for name, values in series.items():
+        chart_data.add_series(name, values)
+    lines_only = set(series) <= set(line_series)
+    chart_type = XL_CHART_TYPE.LINE_MARKERS if lines_only else XL_CHART_TYPE.COLUMN_CLUSTERED
+    chart = add_chart_frame(slide.shapes, chart_type, left, top, width, height, chart_data).chart
+
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+    chart.legend.include_in_layout = False
+    chart.font.size = Pt(12)
+    chart.font.name = "Calibri"
+    chart.font.color.rgb = BLACK
+    i = 0
+    for plot in chart.plots:
+        for s in plot.series:
+            color = CHART_COLORS[i % len(CHART_COLORS)]
+            if s.name in line_series:
+                s.format.line.color.rgb = color
+                s.format.line.width = Pt(2.5)
+            else:
+                s.format.fill.solid()
+                s.format.fill.fore_color.rgb = color
+            i += 1
+    return chart
+
+
 # =============================================================================
 # SLIDE BUILDERS
 # =============================================================================
@@ -191,12 +560,7 @@ def build_title_slide(prs, ticker, company, date, rating, price, target):
     add_background(slide, DARK_BLUE)
 
     # Accent line
-    shape = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE, Inches(1.5), Inches(2.8), Inches(10.333), Inches(0.05)
-    )
-    shape.fill.solid()
-    shape.fill.fore_color.rgb = ACCENT_BLUE
-    shape.line.fill.background()
+    add_bar(slide, Inches(1.5), Inches(2.8), Inches(10.333), Inches(0.05), ACCENT_BLUE)
 
     upside = ((target - price) / price) * 100
     add_textbox(slide, Inches(1.5), Inches(1.5), Inches(10.333), Inches(1.2),
@@ -231,10 +595,10 @@ def build_valuation_snapshot(prs, metrics):
     slide = prs.slides.add_slide(prs.slide_layouts[6])
     add_background(slide)
     add_title_bar(slide, "Valuation Snapshot")
-    add_table(slide, Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.5),
-              ["Metric", "Value", "Interpretation"], metrics,
-              col_widths=[Inches(3.0), Inches(2.5), Inches(6.2)])
-    return slide
+    return add_paginated_table(prs, slide, "Valuation Snapshot",
+                               Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.5),
+                               ["Metric", "Value", "Interpretation"], metrics,
+                               col_widths=[Inches(3.0), Inches(2.5), Inches(6.2)])
 
 
 def build_income_statement(prs, years, rows, note=None):
@@ -244,24 +608,54 @@ def build_income_statement(prs, years, rows, note=None):
     """
     slide = prs.slides.add_slide(prs.slide_layouts[6])
     add_background(slide)
-    add_title_bar(slide, f"Income Statement ({years[-1]}–{years[0]})")
-    add_table(slide, Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.5),
-              ["Line Item"] + years, rows,
-              col_widths=[Inches(3.5)] + [Inches(8.2 / len(years))] * len(years))
+    title = f"Income Statement ({years[-1]}–{years[0]})"
+    add_title_bar(slide, title)
+    slide = add_paginated_table(prs, slide, title, Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.5),
+                                ["Line Item"] + years, rows,
+                                col_widths=[Inches(3.5)] + [Inches(8.2 / len(years))] * len(years),
+                                bottom=Inches(5.5) if note else Inches(7.0))
     if note:
         add_textbox(slide, Inches(0.8), Inches(5.6), Inches(11.7), Inches(0.5),
                     f"Note: {note}", font_size=13, color=MEDIUM_GRAY)
     return slide
 
 
+def _build_trend_chart(prs, title, years, series, lines, number_format):
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    add_background(slide)
+    add_title_bar(slide, title)
+    # Tables list the newest year first; charts read left to right in time
+    add_chart(slide, Inches(0.8), Inches(1.6), Inches(11.7), Inches(5.3), years[::-1],
+              {name: values[::-1] for name, values in series.items()}, lines, number_format)
+    return slide
+
+
+def build_income_chart(prs, years, series, lines=(), number_format="#,##0.0"):
+    """Optional slide after 4: Income trend chart.
+    years: year labels as in build_income_statement, newest first
+    series: {name: [values]} aligned with years, e.g. {"Revenue ($B)": [10.0, 9.0, 8.0]}
+    lines: series names drawn as lines on a secondary axis, e.g. ["Net Margin (%)"]
+    """
+    return _build_trend_chart(prs, f"Income Trends ({years[-1]}–{years[0]})",
+                              years, series, lines, number_format)
+
+
+def build_balance_chart(prs, years, series, lines=(), number_format="#,##0.0"):
+    """Optional slide after 5: Cash, debt and cash flow trend chart (same shape as build_income_chart)."""
+    return _build_trend_chart(prs, f"Balance Sheet Trends ({years[-1]}–{years[0]})",
+                              years, series, lines, number_format)
+
+
 def build_balance_sheet_cashflow(prs, years, rows, note=None):
     """Slide 5: Balance sheet & cash flow table."""
     slide = prs.slides.add_slide(prs.slide_layouts[6])
     add_background(slide)
     add_title_bar(slide, "Balance Sheet & Cash Flow")
-    add_table(slide, Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.0),
-              ["Metric"] + years, rows,
-              col_widths=[Inches(3.5)] + [Inches(8.2 / len(years))] * len(years))
+    slide = add_paginated_table(prs, slide, "Balance Sheet & Cash Flow",
+                                Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.0),
+                                ["Metric"] + years, rows,
+                                col_widths=[Inches(3.5)] + [Inches(8.2 / len(years))] * len(years),
+                                bottom=Inches(5.1) if note else Inches(7.0))
     if note:
         add_textbox(slide, Inches(0.8), Inches(5.2), Inches(11.7), Inches(0.6),
                     f"Note: {note}", font_size=13, color=MEDIUM_GRAY)
@@ -278,10 +672,10 @@ def build_peer_comparison(prs, ticker, peers, rows):
     add_title_bar(slide, "Competitive Position")
     headers = ["Metric", ticker] + peers
     n = len(headers)
-    add_table(slide, Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.5),
-              headers, rows,
-              col_widths=[Inches(2.8)] + [Inches(8.9 / (n - 1))] * (n - 1))
-    return slide
+    return add_paginated_table(prs, slide, "Competitive Position",
+                               Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.5),
+                               headers, rows,
+                               col_widths=[Inches(2.8)] + [Inches(8.9 / (n - 1))] * (n - 1))
 
 
 def build_valuation_summary(prs, rows, note=None):
@@ -291,29 +685,70 @@ def build_valuation_summary(prs, rows, note=None):
     slide = prs.slides.add_slide(prs.slide_layouts[6])
     add_background(slide)
     add_title_bar(slide, "Valuation Summary")
-    add_table(slide, Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.0),
-              ["Method", "Fair Value", "vs Current", "Weight"], rows,
-              col_widths=[Inches(3.0), Inches(2.9), Inches(2.9), Inches(2.9)])
+    slide = add_paginated_table(prs, slide, "Valuation Summary",
+                                Inches(0.8), Inches(1.8), Inches(11.7), Inches(3.0),
+                                ["Method", "Fair Value", "vs Current", "Weight"], rows,
+                                col_widths=[Inches(3.0), Inches(2.9), Inches(2.9), Inches(2.9)],
+                                bottom=Inches(5.1) if note else Inches(7.0))
     if note:
         add_textbox(slide, Inches(0.8), Inches(5.2), Inches(11.7), Inches(0.6),
                     note, font_size=13, color=MEDIUM_GRAY)
     return slide
 
 
+def build_valuation_distribution(prs, rows, histogram, note=None):
+    """Optional slide after 7: Monte Carlo fair-value distribution.
+    rows: list of [Percentile, Fair Value, vs Current]
+    histogram: list of [bar label, share of paths], drawn left to right
+    """
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    add_background(slide)
+    add_title_bar(slide, "Valuation Distribution (Monte Carlo)")
+    add_table(slide, Inches(0.6), Inches(1.6), Inches(4.4), Inches(4.2),
+              ["Percentile", "Fair Value", "vs Current"], rows,
+              col_widths=[Inches(1.4), Inches(1.6), Inches(1.4)])
+
+    # Histogram: bars scaled to the tallest, labels under every fourth bar
+    left, bottom, width, height = Inches(5.5), Inches(5.6), Inches(7.2), Inches(3.8)
+    tallest = max((share for _, share in histogram), default=0) or 1
+    step = width // max(len(histogram), 1)
+    for i, (label, share) in enumerate(histogram):
+        bar_height = int(height * share / tallest)
+        if bar_height:
+            add_bar(slide, left + i * step, bottom - bar_height, step - Emu(12700), bar_height,
+                    ACCENT_BLUE)
+        if i % 4 == 0:
+            add_textbox(slide, left + i * step - Inches(0.3), bottom + Inches(0.05),
+                        Inches(0.9), Inches(0.3), label, font_size=10, color=MEDIUM_GRAY)
+    add_bar(slide, left, bottom, width, Emu(12700), DARK_BLUE)
+
+    if note:
+        add_textbox(slide, Inches(0.6), Inches(6.3), Inches(12.1), Inches(0.5),
+                    note, font_size=13, color=MEDIUM_GRAY, alignment=PP_ALIGN.CENTER)
+    return slide
+
+
 def build_sensitivity_analysis(prs, scenario_labels, wacc_labels, matrix, note=None):
     """Slide 8: DCF sensitivity matrix.
     scenario_labels: list of row labels, e.g. ["$2.0B Bear", "$2.5B Base", "$3.0B Bull"]
     wacc_labels: list of column labels, e.g. ["WACC 8%", "WACC 10%", "WACC 12%"]
-    matrix: list of lists matching scenario_labels x wacc_labels
+    matrix: list of lists matching scenario_labels x wacc_labels, or a CellTable
+            (templates/cells.py) whose own labels are replaced by scenario_labels
     """
     slide = prs.slides.add_slide(prs.slide_layouts[6])
     add_background(slide)
     add_title_bar(slide, "DCF Sensitivity Analysis")
     headers = ["FCF Scenario"] + wacc_labels
-    rows = [[scenario_labels[i]] + matrix[i] for i in range(len(scenario_labels))]
-    add_table(slide, Inches(1.5), Inches(2.0), Inches(10.3), Inches(2.5),
-              headers, rows,
-              col_widths=[Inches(3.0)] + [Inches(7.3 / len(wacc_labels))] * len(wacc_labels))
+    if not isinstance(matrix, list):
+        from templates.cells import CellTable
+        if isinstance(matrix, CellTable):
+            matrix = [row[1:] for row in matrix]
+    rows = [[scenario_labels[i]] + list(matrix[i]) for i in range(len(scenario_labels))]
+    slide = add_paginated_table(prs, slide, "DCF Sensitivity Analysis",
+                                Inches(1.5), Inches(2.0), Inches(10.3), Inches(2.5),
+                                headers, rows,
+                                col_widths=[Inches(3.0)] + [Inches(7.3 / len(wacc_labels))] * len(wacc_labels),
+                                bottom=Inches(4.9) if note else Inches(7.0))
     if note:
         add_textbox(slide, Inches(1.5), Inches(5.0), Inches(10.3), Inches(0.5),
                     note, font_size=13, color=MEDIUM_GRAY, alignment=PP_ALIGN.CENTER)
@@ -364,12 +799,8 @@ def build_recommendation(prs, rating, price, target, risk, consensus_target, sum
 
     # Rating badge
     badge_color = ACCENT_GREEN if rating.upper() in ("BUY", "STRONG BUY") else ACCENT_RED
-    buy_shape = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE, Inches(4.667), Inches(0.5), Inches(4.0), Inches(1.2)
-    )
-    buy_shape.fill.solid()
-    buy_shape.fill.fore_color.rgb = badge_color
-    buy_shape.line.fill.background()
+    add_bar(slide, Inches(4.667), Inches(0.5), Inches(4.0), Inches(1.2), badge_color,
+            MSO_SHAPE.ROUNDED_RECTANGLE)
 
     add_textbox(slide, Inches(4.667), Inches(0.6), Inches(4.0), Inches(1.0),
                 f"RECOMMENDATION: {rating.upper()}", font_size=30, bold=True, color=WHITE,
@@ -401,50 +832,215 @@ class StockAnalysisDeck:
     """Builds a complete stock analysis PowerPoint deck."""
 
     def __init__(self):
-        self.prs = Presentation()
-        self.prs.slide_width = SLIDE_WIDTH
-        self.prs.slide_height = SLIDE_HEIGHT
+        self.prs = new_presentation()
+
+    def save(self, output):
+        """Save to a .pptx path, "-" for stdout, or any writable binary stream.
+
+        Streams (HTTP responses, object-storage uploads, pipes) receive the zip
+        container part by part as it is produced; nothing is staged on disk
+        and the whole file is never held in memory. Unseekable streams are
+        fine: zipfile falls back to data descriptors.
+        """
+        if output == "-":
+            output = sys.stdout.buffer
+        if hasattr(output, "write"):
+            self.prs.save(output)
+            output.flush()
+            return
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        self.prs.save(output)
+        print(f"Saved: {output} ({len(self.prs.slides)} slides)")
+
+    def flush(self):
+        """Called after each slide builder; a no-op unless the deck streams (StreamingDeck)."""
+
+
+class StreamingDeck(StockAnalysisDeck):
+    """A deck that writes finished slides to its output as it is built.
+
+    Each flush() serializes the slides added since the last one straight
+    into the output zip (via templates/deck_merge.py) and drops them from
+    self.prs, so peak memory stays about the same for 10 slides or 1,000.
+    presentation.xml, its relationships and the content types are written
+    by save(). Flushed slides can no longer be edited, and
+    len(self.prs.slides) only counts slides not flushed yet.
+    """
+
+    def __init__(self, output):
+        from templates.deck_merge import DeckMerger, PackageSource
+
+        super().__init__()
+        self.output = output
+        self.slide_count = 0
+        self._merger = DeckMerger(sys.stdout.buffer if output == "-" else output)
+        self._source = PackageSource(self.prs)
+
+    def flush(self):
+        """Write the slides built since the last flush and release their parts."""
+        source = self._source
+        source.refresh()
+        if source.slides:
+            self._merger.add_slides(source)
+            slide_list = self.prs.slides._sldIdLst
+            for slide_id in list(slide_list):
+                slide_list.remove(slide_id)
+                self.prs.part.drop_rel(slide_id.rId)
+            self.slide_count += len(source.slides)
+        source.slides, source.parts = [], {}
+
+    def save(self, output=None):
+        """Flush the last slides and finish the file; output, if given, must match the constructor's."""
+        if output is not None and output != self.output:
+            raise ValueError(f"StreamingDeck writes to {self.output!r}, not {output!r}")
+        self.flush()
+        self._merger.close()
+        if self.output == "-":
+            sys.stdout.buffer.flush()
+        elif isinstance(self.output, str):
+            print(f"Saved: {self.output} ({self.slide_count} slides)")
+
+
+def _chart_args(d, key, years_key):
+    """Builder args for an optional trend chart block, or None when absent."""
+    if key not in d:
+        return None
+    chart = d[key]
+    return (d[years_key], chart["series"], chart.get("lines", []),
+            chart.get("number_format", "#,##0.0"))
+
+
+# Slide builders in deck order, each with the slice of deck data it renders
+# (None skips an optional slide)
+DECK_SLIDES = [
+    (build_title_slide, lambda d: (d["ticker"], d["company"], d["date"],
+                                   d["rating"], d["price"], d["target"])),
+    (build_executive_summary, lambda d: (d["executive_summary"],)),
+    (build_valuation_snapshot, lambda d: (d["valuation_metrics"],)),
+    (build_income_statement, lambda d: (d["income_years"], d["income_rows"],
+                                        d.get("income_note"))),
+    (build_income_chart, lambda d: _chart_args(d, "income_chart", "income_years")),
+    (build_balance_sheet_cashflow, lambda d: (d["balance_years"], d["balance_rows"],
+                                              d.get("balance_note"))),
+    (build_balance_chart, lambda d: _chart_args(d, "balance_chart", "balance_years")),
+    (build_peer_comparison, lambda d: (d["ticker"], d["peers"], d["peer_rows"])),
+    (build_valuation_summary, lambda d: (d["valuation_rows"], d.get("valuation_note"))),
+    (build_valuation_distribution, lambda d: (d["distribution_rows"], d["distribution_histogram"],
+                                              d.get("distribution_note"))
+                                   if "distribution_rows" in d else None),
+    (build_sensitivity_analysis, lambda d: (d["sensitivity_scenarios"], d["sensitivity_waccs"],
+                                            d["sensitivity_matrix"], d.get("sensitivity_note"))),
+    (build_bull_bear, lambda d: (d["bull_case"], d["bear_case"])),
+    (build_catalysts, lambda d: (d["catalysts"],)),
+    (build_recommendation, lambda d: (d["rating"], d["price"], d["target"],
+                                      d["risk"], d["consensus"], d["rec_summary"])),
+]
+
+
+def expand_deck_data(d):
+    """Return deck data with its dcf, comps, monte_carlo and table source blocks expanded."""
+    if "dcf" in d and "sensitivity_matrix" not in d:
+        from templates.dcf import apply_dcf
+        d = apply_dcf(d)
+    if "comps" in d and "peer_rows" not in d:
+        from templates.comps import apply_comps
+        d = apply_comps(d)
+    if "monte_carlo" in d and "distribution_rows" not in d:
+        from templates.monte_carlo import apply_monte_carlo
+        d = apply_monte_carlo(d)
+    if any(isinstance(d.get(key), dict) for key in ("valuation_metrics", "income_rows",
+                                                    "balance_rows", "peer_rows")):
+        from templates.columnar import resolve_sources
+        d = resolve_sources(d)
+    return d
+
+
+def build_deck(d, cache=None, deck=None):
+    """Build the deck's slides from a deck data dict and return the deck.
+
+    Slides are appended to deck when one is given (a StreamingDeck, or a
+    StockAnalysisDeck holding several tickers), with deck.flush() called
+    after each builder.
+
+    With a SlideCache (templates/slide_cache.py), slides whose inputs are
+    unchanged since a previous build are copied from the cache. A "dcf"
+    block without a sensitivity_matrix is expanded by templates/dcf.py, a
+    "comps" block without peer_rows by templates/comps.py, a "monte_carlo"
+    block without distribution_rows by templates/monte_carlo.py, and table
+    source specs ({"source": "peers.csv", ...}) are read lazily by
+    templates/columnar.py.
+    """
+    d = expand_deck_data(d)
+    if deck is None:
+        deck = StockAnalysisDeck()
+    prs = deck.prs
+
+    for builder, slide_args in DECK_SLIDES:
+        args = slide_args(d)
+        if args is None:
+            continue
+        if cache is None:
+            builder(prs, *args)
+        else:
+            cache.build_slide(prs, builder, args)
+        deck.flush()
 
-    def save(self, output_path):
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        self.prs.save(output_path)
-        print(f"Saved: {output_path} ({len(self.prs.slides)} slides)")
+    if cache is not None:
+        print(cache.report(), file=sys.stderr)
+    return deck
 
 
 def main():
     """CLI entry point — builds deck from a JSON data file."""
     parser = argparse.ArgumentParser(description="Generate stock analysis slides")
     parser.add_argument("--data", required=True, help="Path to JSON data file")
-    parser.add_argument("--output", required=True, help="Output .pptx path")
+    parser.add_argument("--output", help="Output .pptx path, or - for stdout")
+    parser.add_argument("--validate-only", action="store_true",
+                        help="Check the data file against the deck schema and exit")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write each slide to --output as soon as it is built (flat memory for huge decks)")
+    parser.add_argument("--prototypes", action="store_true",
+                        help="Clone pre-rendered shape prototypes instead of setting every property")
+    parser.add_argument("--cache", nargs="?", const="", metavar="DIR",
+                        help="Reuse unchanged slides from the per-slide cache (default: output/.slide-cache)")
+    parser.add_argument("--cache-max-mb", type=int, default=256,
+                        help="Evict least recently used cached slides beyond this size")
+    parser.add_argument("--trace", metavar="PATH", default=os.environ.get("STOCK_DECK_TRACE"),
+                        help="Record per-builder spans to PATH (.jsonl, or .json for Chrome trace format)")
     args = parser.parse_args()
-
+    if not args.output and not args.validate_only:
+        parser.error("--output is required unless --validate-only is given")
+
+    if args.prototypes:
+        use_prototypes()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    cache = None
+    if args.cache is not None:
+        from templates.slide_cache import DEFAULT_CACHE_DIR, SlideCache
+        cache = SlideCache(args.cache or DEFAULT_CACHE_DIR, args.cache_max_mb * 1024 * 1024)
+    if args.trace:
+        from templates import tracing
+        tracing.enable(sys.modules[__name__])
+
+    from templates.deck_schema import validate
     with open(args.data) as f:
         d = json.load(f)
-
-    deck = StockAnalysisDeck()
-    prs = deck.prs
-
-    # Build all slides from JSON data
-    build_title_slide(prs, d["ticker"], d["company"], d["date"],
-                      d["rating"], d["price"], d["target"])
-    build_executive_summary(prs, d["executive_summary"])
-    build_valuation_snapshot(prs, d["valuation_metrics"])
-    build_income_statement(prs, d["income_years"], d["income_rows"],
-                          d.get("income_note"))
-    build_balance_sheet_cashflow(prs, d["balance_years"], d["balance_rows"],
-                                 d.get("balance_note"))
-    build_peer_comparison(prs, d["ticker"], d["peers"], d["peer_rows"])
-    build_valuation_summary(prs, d["valuation_rows"], d.get("valuation_note"))
-    build_sensitivity_analysis(prs, d["sensitivity_scenarios"],
-                                d["sensitivity_waccs"], d["sensitivity_matrix"],
-                                d.get("sensitivity_note"))
-    build_bull_bear(prs, d["bull_case"], d["bear_case"])
-    build_catalysts(prs, d["catalysts"])
-    build_recommendation(prs, d["rating"], d["price"], d["target"],
-                         d["risk"], d["consensus"], d["rec_summary"])
-
+    errors = validate(d)
+    for error in errors:
+        print(f"{args.data}: {error}", file=sys.stderr)
+    if errors:
+        sys.exit(1)
+    if args.validate_only:
+        print(f"Valid: {args.data}")
+        return
+
+    deck = build_deck(d, cache, StreamingDeck(args.output) if args.stream else None)
     deck.save(args.output)
 
+    if args.trace:
+        tracing.finish(sys.modules[__name__], args.trace)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,117 @@
+"""
+Table Text Measurement and Pagination
+
+Estimates how tall each table row will render in PowerPoint from Calibri
+advance widths, without a rendering engine, so tables that would run off the
+slide can be split across continuation slides. Widths and wrapped line counts
+are memoized by (text, font size, bold, column width), so laying out repeated
+labels and values costs a dict lookup.
+
+Usage:
+    from templates.table_layout import row_heights, paginate
+
+    heights = row_heights(headers, rows, widths)        # EMU, header first
+    pages = paginate(heights, max_height=Inches(3.7))   # [(start, stop), ...] body row slices
+
+All lengths are EMU. Font sizes and cell margins match add_table in
+stock_analysis_slides.py (14pt bold header, 13pt body, python-pptx's default
+0.1in/0.05in cell insets).
+"""
+
+from functools import lru_cache
+
+EMU_PER_PT = 12700
+CELL_MARGIN_X = 2 * 91440  # left + right inset
+CELL_MARGIN_Y = 2 * 45720  # top + bottom inset
+LINE_SPACING = 1.22        # Calibri (ascender + descender + line gap) / em
+HEADER_FONT = (14, True)
+BODY_FONT = (13, False)
+BOLD_FACTOR = 1.04         # Calibri Bold is ~4% wider on average; digits are not
+DEFAULT_WIDTH = 500
+
+# Calibri advance widths in 1/1000 em
+_GLYPHS = {
+    " ": 226, "!": 326, '"': 401, "#": 498, "$": 507, "%": 715, "&": 682, "'": 221,
+    "(": 303, ")": 303, "*": 498, "+": 498, ",": 250, "-": 306, ".": 252, "/": 386,
+    ":": 268, ";": 268, "<": 498, "=": 498, ">": 498, "?": 463, "@": 894,
+    "[": 307, "\\": 386, "]": 307, "^": 498, "_": 498, "`": 291,
+    "{": 314, "|": 460, "}": 314, "~": 498, "—": 1000, "–": 500, "•": 498, "€": 507, "£": 507,
+    "A": 579, "B": 544, "C": 533, "D": 615, "E": 488, "F": 459, "G": 631, "H": 623,
+    "I": 252, "J": 319, "K": 520, "L": 420, "M": 855, "N": 646, "O": 662, "P": 517,
+    "Q": 673, "R": 543, "S": 459, "T": 487, "U": 642, "V": 567, "W": 890, "X": 519,
+    "Y": 487, "Z": 468,
+    "a": 479, "b": 525, "c": 423, "d": 525, "e": 498, "f": 305, "g": 471, "h": 525,
+    "i": 230, "j": 239, "k": 455, "l": 230, "m": 799, "n": 525, "o": 527, "p": 525,
+    "q": 525, "r": 349, "s": 391, "t": 335, "u": 525, "v": 452, "w": 715, "x": 433,
+    "y": 453, "z": 395,
+}
+_GLYPHS.update(dict.fromkeys("0123456789", 507))
+
+
+@lru_cache(maxsize=1 << 16)
+def text_width(text, font_size, bold=False):
+    """Rendered width of a single line of text in EMU."""
+    units = sum(_GLYPHS.get(ch, DEFAULT_WIDTH) for ch in text)
+    if bold:
+        digits = sum(ch.isdigit() for ch in text) * 507
+        units = digits + (units - digits) * BOLD_FACTOR
+    return int(units * font_size * EMU_PER_PT / 1000)
+
+
+@lru_cache(maxsize=1 << 16)
+def line_count(text, width, font_size, bold=False):
+    """Lines text wraps to in a cell of the given width (word wrap, hard breaks on \\n)."""
+    avail = max(width - CELL_MARGIN_X, 1)
+    space = text_width(" ", font_size, bold)
+    lines = 0
+    for paragraph in text.split("\n"):
+        lines += 1
+        used = 0
+        for word in paragraph.split(" "):
+            w = text_width(word, font_size, bold)
+            if used and used + space + w > avail:
+                lines += 1
+                used = 0
+            elif used:
+                used += space
+            # Words wider than the cell break mid-word
+            while w > avail:
+                lines += 1
+                w -= avail
+            used += w
+    return lines
+
+
+def row_height(cells, widths, font_size, bold=False):
+    """Height in EMU of a table row: its tallest cell plus the cell insets."""
+    lines = max((line_count(str(text), w, font_size, bold) for text, w in zip(cells, widths)),
+                default=1)
+    return int(lines * font_size * LINE_SPACING * EMU_PER_PT) + CELL_MARGIN_Y
+
+
+def row_heights(headers, rows, widths):
+    """Content heights of the header row and each body row, in EMU."""
+    heights = [row_height(headers, widths, *HEADER_FONT)]
+    heights.extend(row_height(row, widths, *BODY_FONT) for row in rows)
+    return heights
+
+
+def paginate(heights, max_height, min_row_height=0):
+    """Split body rows into pages whose table, header repeated, fits max_height.
+
+    heights is row_heights() output; rows render at least min_row_height
+    tall. Returns [(start, stop), ...] slices of the body rows; a single
+    page means the table fits as is. A row taller than a page gets a page
+    of its own.
+    """
+    header = max(heights[0], min_row_height)
+    pages = []
+    start, used = 0, header
+    for i, h in enumerate(heights[1:]):
+        h = max(h, min_row_height)
+        if i > start and used + h > max_height:
+            pages.append((start, i))
+            start, used = i, header
+        used += h
+    pages.append((start, len(heights) - 1))
+    return pages
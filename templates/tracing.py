@@ -0,0 +1,198 @@
+"""
+Per-Slide Tracing for Stock Analysis Decks
+
+Opt-in instrumentation that records wall time, CPU time and tracemalloc peak
+for build_deck, every build_* builder, every add_* helper and
+StockAnalysisDeck.save. Spans are written as JSON lines, or in the Chrome
+trace format (chrome://tracing, Perfetto) when the path ends in ".json", and
+a per-function summary table is printed to stderr.
+
+Usage:
+    python templates/stock_analysis_slides.py --data data.json --output deck.pptx --trace spans.jsonl
+    STOCK_DECK_TRACE=trace.json python templates/stock_analysis_slides.py --data data.json --output deck.pptx
+
+Or programmatically:
+    from templates import stock_analysis_slides, tracing
+    tracer = tracing.enable(stock_analysis_slides)
+    stock_analysis_slides.build_deck(d).save("deck.pptx")
+    tracing.disable(stock_analysis_slides)
+    tracer.write("spans.jsonl")
+
+Nothing is wrapped until enable() is called, so tracing costs nothing when off.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+
+class Tracer:
+    """Collects nested timing/memory spans."""
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.spans = []
+        self._local = threading.local()
+        self._t0 = time.perf_counter()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def wrap(self, fn, category, name=None):
+        """Return fn wrapped so each call records a span."""
+        name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def traced(*args, **kwargs):
+            self._enter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._exit(name, category)
+
+        traced.__traced__ = fn
+        return traced
+
+    def _enter(self):
+        stack = self._stack()
+        current = 0
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][3] = max(stack[-1][3], peak)
+            tracemalloc.reset_peak()
+        stack.append([time.perf_counter(), time.thread_time(), current, current])
+
+    def _exit(self, name, category):
+        end, cpu_end = time.perf_counter(), time.thread_time()
+        stack = self._stack()
+        start, cpu_start, mem_start, mem_peak = stack.pop()
+        peak_bytes = 0
+        if self.memory:
+            mem_peak = max(mem_peak, tracemalloc.get_traced_memory()[1])
+            peak_bytes = mem_peak - mem_start
+            if stack:
+                stack[-1][3] = max(stack[-1][3], mem_peak)
+        self.spans.append({
+            "name": name,
+            "cat": category,
+            "depth": len(stack),
+            "start_us": round((start - self._t0) * 1e6, 1),
+            "wall_ms": round((end - start) * 1000, 3),
+            "cpu_ms": round((cpu_end - cpu_start) * 1000, 3),
+            "peak_kb": round(peak_bytes / 1024, 1),
+            "tid": threading.get_ident(),
+        })
+
+    def write(self, path):
+        """Write spans as JSON lines, or Chrome trace format for *.json paths."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            if path.endswith(".json"):
+                events = [{
+                    "name": s["name"], "cat": s["cat"], "ph": "X",
+                    "ts": s["start_us"], "dur": round(s["wall_ms"] * 1000, 1),
+                    "pid": os.getpid(), "tid": s["tid"],
+                    "args": {"cpu_ms": s["cpu_ms"], "peak_kb": s["peak_kb"]},
+                } for s in self.spans]
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+            else:
+                for s in self.spans:
+                    f.write(json.dumps(s) + "\n")
+
+    def summary(self):
+        """Per-function totals, slowest first, as a printable table."""
+        totals = {}
+        for s in self.spans:
+            t = totals.setdefault(s["name"], [0, 0.0, 0.0, 0.0, 0.0])
+            t[0] += 1
+            t[1] += s["wall_ms"]
+            t[2] = max(t[2], s["wall_ms"])
+            t[3] += s["cpu_ms"]
+            t[4] = max(t[4], s["peak_kb"])
+        lines = [f"{'Span':<32}{'calls':>6}{'total ms':>10}{'max ms':>9}{'cpu ms':>9}{'peak KB':>9}"]
+        for name, (calls, wall, worst, cpu, peak) in sorted(totals.items(), key=lambda kv: -kv[1][1]):
+            lines.append(f"{name:<32}{calls:>6}{wall:>10.2f}{worst:>9.2f}{cpu:>9.2f}{peak:>9.0f}")
+        return "\n".join(lines)
+
+
+# =============================================================================
+# MODULE INSTRUMENTATION
+# =============================================================================
+
+def _category(name):
+    if name.startswith("build_deck"):
+        return "deck"
+    return "builder" if name.startswith("build_") else "helper"
+
+
+def _deck_methods(module):
+    """(class, name) of every deck save/flush to trace, including subclasses such as StreamingDeck.
+
+    The base flush() is a no-op called after each builder and is left out.
+    """
+    base = module.StockAnalysisDeck
+    classes, pending = [], [base]
+    while pending:
+        cls = pending.pop()
+        classes.append(cls)
+        pending.extend(cls.__subclasses__())
+    return [(cls, name) for cls in classes for name in ("save", "flush")
+            if name in vars(cls) and not (cls is base and name == "flush")]
+
+
+def enable(module, memory=True):
+    """Wrap a slide module's build_*/add_* functions and deck save/flush; return the Tracer.
+
+    module is the stock_analysis_slides module (or __main__ when run as a script).
+    """
+    if getattr(module, "_tracer", None) is not None:
+        return module._tracer
+    tracer = Tracer(memory)
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    wrapped = {}
+    for name, fn in list(vars(module).items()):
+        if (callable(fn) and getattr(fn, "__module__", None) == module.__name__
+                and name.startswith(("build_", "add_"))):
+            wrapped[fn] = tracer.wrap(fn, _category(name))
+            setattr(module, name, wrapped[fn])
+    # The deck table holds direct references to the builders
+    module.DECK_SLIDES[:] = [(wrapped.get(b, b), args) for b, args in module.DECK_SLIDES]
+    for cls, name in _deck_methods(module):
+        setattr(cls, name, tracer.wrap(vars(cls)[name], name))
+
+    module._tracer = tracer
+    return tracer
+
+
+def disable(module):
+    """Restore the original functions and stop tracemalloc."""
+    if getattr(module, "_tracer", None) is None:
+        return
+    for name, fn in list(vars(module).items()):
+        if hasattr(fn, "__traced__"):
+            setattr(module, name, fn.__traced__)
+    module.DECK_SLIDES[:] = [(getattr(b, "__traced__", b), args) for b, args in module.DECK_SLIDES]
+    for cls, name in _deck_methods(module):
+        setattr(cls, name, getattr(vars(cls)[name], "__traced__", vars(cls)[name]))
+    if module._tracer.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    module._tracer = None
+
+
+def finish(module, path):
+    """Disable tracing, write the spans to path and print the summary to stderr."""
+    tracer = module._tracer
+    disable(module)
+    tracer.write(path)
+    print(tracer.summary(), file=sys.stderr)
+    print(f"Trace: {path} ({len(tracer.spans)} spans)", file=sys.stderr)
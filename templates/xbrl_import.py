@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+SEC XBRL Companyfacts Import
+
+Turns SEC companyfacts documents (data.sec.gov/api/xbrl/companyfacts/
+CIK##########.json, or the nightly companyfacts.zip bulk archive) into the
+income_years / income_rows / balance_years / balance_rows keys of deck data,
+for any number of companies.
+
+Usage:
+    python templates/xbrl_import.py companyfacts.zip -o output/stock/xbrl.jsonl
+    python templates/xbrl_import.py CIK0000320193.json --years 5
+    python templates/xbrl_import.py facts/ -o xbrl.jsonl --tickers company_tickers.json --workers 8
+
+Or programmatically:
+    from templates.xbrl_import import import_file
+    d.update(import_file("CIK0000320193.json"))
+
+Each output line is one company: cik, ticker (from SEC's company_tickers.json
+when --tickers is given), company, and the four deck keys, with the newest
+fiscal year first. Line items follow skills/financial-statements.md; each is
+mapped from the first us-gaap concept a company reports for that year (see
+INCOME_ITEMS and BALANCE_ITEMS), and values are formatted by
+templates/cells.py ("$391.0B", "$6.08").
+
+Documents are streamed: the reader walks the JSON object member by member
+and decodes only the concepts it maps, one at a time, so memory stays at a
+few concepts per worker however large the document. Only annual figures
+from 10-K filings are kept, the latest filing winning for restated years.
+Files are spread across worker processes with a bounded number in flight.
+"""
+
+import argparse
+import datetime
+import glob
+import io
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from templates.cells import CellTable
+
+CHUNK_SIZE = 64 * 1024
+TAXONOMY = "us-gaap"
+ANNUAL_FORMS = ("10-K", "10-K/A", "10-KT", "10-KT/A")
+ANNUAL_DAYS = (340, 380)
+
+# (line item, cell kind, us-gaap concepts in order of preference, or a function of the facts)
+INCOME_ITEMS = [
+    ("Revenue", "currency", ("RevenueFromContractWithCustomerExcludingAssessedTax", "Revenues",
+                             "RevenueFromContractWithCustomerIncludingAssessedTax",
+                             "SalesRevenueNet", "SalesRevenueGoodsNet")),
+    ("Gross Profit", "currency", ("GrossProfit",)),
+    ("Operating Income", "currency", ("OperatingIncomeLoss",)),
+    ("Net Income", "currency", ("NetIncomeLoss", "ProfitLoss")),
+    ("EPS (Diluted)", "per_share", ("EarningsPerShareDiluted", "EarningsPerShareBasicAndDiluted")),
+]
+
+
+def _total_liabilities(value, end):
+    total = value(("Liabilities",), end)
+    if total is None:
+        both = value(("LiabilitiesAndStockholdersEquity",), end)
+        equity = value(("StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest",
+                        "StockholdersEquity"), end)
+        if both is not None and equity is not None:
+            total = both - equity
+    return total
+
+
+def _total_debt(value, end):
+    long_term = value(("LongTermDebt",), end)
+    if long_term is None:
+        parts = [value((c,), end) for c in ("LongTermDebtNoncurrent", "LongTermDebtCurrent")]
+        long_term = sum(p for p in parts if p is not None) if parts[0] is not None else None
+    short_term = [value((c,), end) for c in ("ShortTermBorrowings", "CommercialPaper")]
+    parts = [p for p in [long_term] + short_term if p is not None]
+    return sum(parts) if parts else None
+
+
+def _free_cash_flow(value, end):
+    operating = value(OPERATING_CASH_FLOW, end)
+    capex = value(CAPEX, end)
+    if operating is None or capex is None:
+        return None
+    return operating - capex
+
+
+OPERATING_CASH_FLOW = ("NetCashProvidedByUsedInOperatingActivities",
+                       "NetCashProvidedByUsedInOperatingActivitiesContinuingOperations")
+CAPEX = ("PaymentsToAcquirePropertyPlantAndEquipment", "PaymentsToAcquireProductiveAssets")
+
+BALANCE_ITEMS = [
+    ("Cash & Equivalents", "currency", ("CashAndCashEquivalentsAtCarryingValue",
+                                        "CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents",
+                                        "Cash")),
+    ("Current Assets", "currency", ("AssetsCurrent",)),
+    ("Total Assets", "currency", ("Assets",)),
+    ("Total Liabilities", "currency", _total_liabilities),
+    ("Total Debt", "currency", _total_debt),
+    ("Shareholders' Equity", "currency", ("StockholdersEquity",
+                                          "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest")),
+    ("Operating Cash Flow", "currency", OPERATING_CASH_FLOW),
+    ("Investing Cash Flow", "currency", ("NetCashProvidedByUsedInInvestingActivities",
+                                         "NetCashProvidedByUsedInInvestingActivitiesContinuingOperations")),
+    ("Financing Cash Flow", "currency", ("NetCashProvidedByUsedInFinancingActivities",
+                                         "NetCashProvidedByUsedInFinancingActivitiesContinuingOperations")),
+    ("CapEx", "currency", CAPEX),
+    ("Free Cash Flow", "currency", _free_cash_flow),
+]
+
+CONCEPTS = frozenset(
+    {c for _, _, source in INCOME_ITEMS + BALANCE_ITEMS if isinstance(source, tuple) for c in source}
+    | {"Liabilities", "LiabilitiesAndStockholdersEquity", "StockholdersEquity",
+       "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest", "LongTermDebt",
+       "LongTermDebtNoncurrent", "LongTermDebtCurrent", "ShortTermBorrowings", "CommercialPaper"}
+)
+
+
+# =============================================================================
+# STREAMING JSON
+# =============================================================================
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+_decoder = json.JSONDecoder()
+
+
+class JsonStream:
+    """Incremental reader over a text stream.
+
+    Objects are walked member by member with members(); each member's value
+    must be consumed with value() or skip() before the next key. Only the
+    value being decoded is held in memory, plus one chunk of input.
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _more(self, size):
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more(self.chunk_size):
+                raise ValueError("unexpected end of JSON document")
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} in JSON document, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next value."""
+        self._peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                end = None
+            # A value ending exactly at the end of the buffer may continue in the
+            # next chunk, and so may a number cut short at a "." or "e" ("6." + "08")
+            if end is not None and (self.eof or end < len(self.buf) and not (
+                    isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and self.buf[end] in _NUMBER_CHARS)):
+                self.pos = end
+                return value
+            if self._more(size):
+                size *= 2
+
+    def skip(self):
+        """Consume the next value without keeping it; objects are skipped member by member."""
+        if self._peek() == "{":
+            for _ in self.members():
+                self.skip()
+        else:
+            self.value()
+
+    def members(self):
+        """Yield the keys of the object starting here."""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+            separator = self._peek()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"expected ',' or '}}' in JSON document, found {separator!r}")
+
+
+# =============================================================================
+# COMPANYFACTS
+# =============================================================================
+
+def _date(text):
+    return datetime.date.fromisoformat(text)
+
+
+def _annual_facts(units):
+    """{unit: [(end, val, fy, accn, filed)]} keeping annual 10-K figures only."""
+    out = {}
+    for unit, facts in units.items():
+        kept = []
+        for fact in facts:
+            if fact.get("form") not in ANNUAL_FORMS or "val" not in fact:
+                continue
+            end = _date(fact["end"])
+            if "start" in fact and not ANNUAL_DAYS[0] <= (end - _date(fact["start"])).days <= ANNUAL_DAYS[1]:
+                continue
+            kept.append((end, fact["val"], fact.get("fy"), fact.get("accn"), fact.get("filed", "")))
+        if kept:
+            out[unit] = kept
+    return out
+
+
+def read_companyfacts(f, concepts=CONCEPTS, chunk_size=CHUNK_SIZE):
+    """(cik, entity name, {concept: {unit: annual facts}}) from a companyfacts text stream."""
+    stream = JsonStream(f, chunk_size)
+    cik, name, found = None, None, {}
+    for key in stream.members():
+        if key == "cik":
+            cik = stream.value()
+        elif key == "entityName":
+            name = stream.value()
+        elif key == "facts":
+            for taxonomy in stream.members():
+                if taxonomy != TAXONOMY:
+                    stream.skip()
+                    continue
+                for concept in stream.members():
+                    if concept in concepts:
+                        facts = _annual_facts(stream.value().get("units", {}))
+                        if facts:
+                            found[concept] = facts
+                    else:
+                        stream.skip()
+        else:
+            stream.skip()
+    return cik, name, found
+
+
+class _Facts:
+    """Latest-filed annual value of each concept per fiscal year end, plus fiscal year labels."""
+
+    def __init__(self, found):
+        self.values = {}
+        report_period = {}
+        for concept, units in found.items():
+            unit = "USD/shares" if "USD/shares" in units else "USD" if "USD" in units else None
+            if unit is None:
+                continue
+            latest = {}
+            for end, val, fy, accn, filed in units[unit]:
+                if end not in latest or filed >= latest[end][0]:
+                    latest[end] = (filed, val)
+                # The last period a filing covers is the fiscal year it reports
+                if accn and fy and (accn not in report_period or end > report_period[accn][0]):
+                    report_period[accn] = (end, fy, filed)
+            self.values[concept] = {end: val for end, (_, val) in latest.items()}
+        # Amendments filed later may carry a later fy; the first filing for a period names it
+        self.fiscal_years = {end: fy for end, fy, _ in
+                             sorted(report_period.values(), key=lambda p: p[2], reverse=True)}
+
+    def value(self, concepts, end):
+        for concept in concepts:
+            v = self.values.get(concept, {}).get(end)
+            if v is not None:
+                return v
+        return None
+
+    def label(self, end):
+        return f"FY{self.fiscal_years.get(end, end.year)}"
+
+    def table(self, items, years):
+        """(years, display rows) for items over the newest `years` fiscal year ends that have data."""
+        def value(source, end):
+            return source(self.value, end) if callable(source) else self.value(source, end)
+
+        ends = set()
+        for _, _, source in items:
+            if isinstance(source, tuple):
+                for concept in source:
+                    ends.update(self.values.get(concept, ()))
+        ends = sorted(ends, reverse=True)
+        ends = [end for end in ends if any(value(s, end) is not None for _, _, s in items)][:years]
+        rows, kinds = [], []
+        for label, kind, source in items:
+            values = [value(source, end) for end in ends]
+            if any(v is not None for v in values):
+                rows.append([label] + values)
+                kinds.append(kind)
+        labels = [self.label(end) for end in ends]
+        return labels, CellTable.from_rows(rows, kinds).rows() if rows else []
+
+
+def deck_rows(found, years=3):
+    """income_years, income_rows, balance_years and balance_rows from read_companyfacts() facts."""
+    facts = _Facts(found)
+    income_years, income_rows = facts.table(INCOME_ITEMS, years)
+    balance_years, balance_rows = facts.table(BALANCE_ITEMS, years)
+    return {"income_years": income_years, "income_rows": income_rows,
+            "balance_years": balance_years, "balance_rows": balance_rows}
+
+
+def _open_text(path, member=None):
+    if member is None:
+        return open(path, encoding="utf-8")
+    return io.TextIOWrapper(_archive(path).open(member), encoding="utf-8")
+
+
+_archives = {}
+
+
+def _archive(path):
+    """Open zip archives once per process; the bulk archive's directory has ~20,000 entries.
+
+    Keyed by pid too: a forked worker must not share the parent's file offset.
+    """
+    key = (path, os.getpid())
+    if key not in _archives:
+        _archives[key] = zipfile.ZipFile(path)
+    return _archives[key]
+
+
+def import_file(path, member=None, years=3):
+    """Company keys and deck rows from a companyfacts file (or a member of a zip archive).
+
+    Returns {} for companies without annual us-gaap figures.
+    """
+    with _open_text(path, member) as f:
+        cik, name, found = read_companyfacts(f)
+    rows = deck_rows(found, years)
+    if not rows["income_rows"] and not rows["balance_rows"]:
+        return {}
+    return {"cik": cik, "company": name, **rows}
+
+
+# =============================================================================
+# BATCH
+# =============================================================================
+
+def iter_sources(inputs):
+    """Yield (path, zip member or None) for files, directories of *.json and zip archives."""
+    for item in inputs:
+        if os.path.isdir(item):
+            for path in sorted(glob.glob(os.path.join(item, "*.json"))):
+                yield path, None
+        elif zipfile.is_zipfile(item):
+            for member in _archive(item).namelist():
+                if member.endswith(".json"):
+                    yield item, member
+        else:
+            yield item, None
+
+
+def _import_job(source, years):
+    path, member = source
+    name = member or path
+    try:
+        return name, import_file(path, member, years), None
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+
+def import_all(sources, years=3, workers=None):
+    """Yield (name, result or None, error or None) per source, as workers finish them.
+
+    At most a few sources per worker are in flight at once, so memory stays
+    bounded for archives of any size.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for source in sources:
+            yield _import_job(source, years)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for source in sources:
+            pending.add(pool.submit(_import_job, source, years))
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in wait(pending).done:
+            yield future.result()
+
+
+def load_tickers(path):
+    """{cik: ticker} from SEC's company_tickers.json."""
+    with open(path) as f:
+        return {int(row["cik_str"]): row["ticker"] for row in json.load(f).values()}
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Deck financial rows from SEC XBRL companyfacts")
+    parser.add_argument("inputs", nargs="+", help="companyfacts .json files, directories or .zip archives")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output path (default: stdout)")
+    parser.add_argument("--years", type=int, default=3, help="Fiscal years per table (default: 3)")
+    parser.add_argument("--tickers", help="SEC company_tickers.json, to add each company's ticker")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    tickers = load_tickers(args.tickers) if args.tickers else {}
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    start = time.perf_counter()
+    imported = skipped = failed = 0
+    try:
+        for name, result, error in import_all(iter_sources(args.inputs), args.years, args.workers):
+            if error:
+                failed += 1
+                print(f"FAILED: {name}: {error}", file=sys.stderr)
+            elif not result:
+                skipped += 1
+            else:
+                imported += 1
+                ticker = tickers.get(result["cik"])
+                out.write(json.dumps({"ticker": ticker, **result} if ticker else result) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    total = imported + skipped + failed
+    print(f"Imported {imported} companies ({skipped} without annual us-gaap data, {failed} failed) "
+          f"in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} files/s)", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()